@@ -6,7 +6,7 @@ It runs every 2 hours and checks for new completed matches.
 
 Schedule: Every 2 hours
 - Checks for newly completed matches
-- Scrapes shot data from Understat using Playwright
+- Scrapes shot data from Understat (plain HTTP, Playwright fallback)
 - Loads data to bronze.understat_raw
 - Triggers dbt transformations
 """
@@ -22,8 +22,11 @@ import logging
 # Add scrapers to path
 sys.path.insert(0, '/opt/airflow/scrapers')
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from tiered_fetcher import TieredUnderstatFetcher
 from db_loader import DatabaseLoader
+from fixture_cache import FixtureCache
+from write_behind import WriteBehindLoader
+from scrape_planner import build_scrape_plan
 
 logger = logging.getLogger(__name__)
 
@@ -35,84 +38,81 @@ def check_and_scrape_new_matches(**context):
     Logic:
     1. Get all Arsenal fixtures for current season
     2. Filter for played matches (is_result=True)
-    3. Check which matches are NOT in database
-    4. Scrape and load new matches
+    3. Plan from the scrape ledger: missing matches, failed ones due a
+       retry, and recent ones whose xG may still be revised
+    4. Scrape and load the planned matches
     """
-    scraper = UnderstatPlaywrightScraper()
-    loader = DatabaseLoader()
+    with TieredUnderstatFetcher() as scraper:
+        loader = DatabaseLoader()
 
-    # Get current season (e.g., "2025" for 2025-26 season)
-    current_year = datetime.now().year
-    season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
+        # Get current season (e.g., "2025" for 2025-26 season)
+        current_year = datetime.now().year
+        season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
 
-    logger.info(f"Checking for new Arsenal matches in {season}-{int(season)+1} season")
+        logger.info(f"Checking for new Arsenal matches in {season}-{int(season)+1} season")
 
-    # Get all fixtures for current season
-    fixtures = scraper.scrape_season_fixtures(season)
-    played_matches = [f for f in fixtures if f['is_result']]
+        # Get all fixtures for current season
+        fixtures = FixtureCache(loader, scraper).get_season_fixtures(season)
+        played_matches = [f for f in fixtures if f['is_result']]
 
-    logger.info(f"Found {len(played_matches)} played matches in {season}-{int(season)+1}")
+        logger.info(f"Found {len(played_matches)} played matches in {season}-{int(season)+1}")
 
-    # Get existing matches from database
-    with loader.get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT match_url
-                FROM bronze.understat_raw
-                WHERE match_url IS NOT NULL
-            """)
-            existing_urls = set(row[0] for row in cur.fetchall())
+        # Plan from the scrape ledger (missing, retry, refresh)
+        plan = build_scrape_plan(loader, played_matches)
 
-    logger.info(f"Found {len(existing_urls)} existing matches in database")
+        if not plan:
+            logger.info("No new matches to scrape")
+            return {"new_matches": 0, "scraped": 0}
 
-    # Find new matches
-    new_matches = [f for f in played_matches if f['match_url'] not in existing_urls]
+        logger.info(f"Planned {len(plan)} matches to scrape")
 
-    if not new_matches:
-        logger.info("No new matches to scrape")
-        return {"new_matches": 0, "scraped": 0}
+        # Scrape planned matches; writes are applied in the background while
+        # the next match is fetched
+        scraped = 0
+        with WriteBehindLoader(loader) as writer:
+            for task in plan:
+                fixture = task.fixture
+                run_id = f"auto_{uuid.uuid4().hex[:8]}"
+                started_at = datetime.utcnow()
+                try:
+                    home = fixture['home_team']
+                    away = fixture['away_team']
+                    date = fixture['match_date']
 
-    logger.info(f"Found {len(new_matches)} new matches to scrape")
+                    logger.info(f"Scraping {date}: {home} vs {away} ({task.reason})")
 
-    # Scrape new matches
-    scraped = 0
-    for fixture in new_matches:
-        try:
-            home = fixture['home_team']
-            away = fixture['away_team']
-            date = fixture['match_date']
+                    # Scrape match data (fixture metadata keeps the ledger match ID stable)
+                    match_data = scraper.scrape_match_shots(
+                        fixture['match_url'], home_team=home, away_team=away, match_date=date
+                    )
 
-            logger.info(f"Scraping {date}: {home} vs {away}")
+                    # Queue for the database (ledger row + payload in one transaction)
+                    match_id = match_data['match_id']
 
-            # Scrape match data
-            match_data = scraper.scrape_match_shots(fixture['match_url'])
+                    writer.record_match_scrape(
+                        run_id, match_id, 'understat', match_data, fixture['match_url'],
+                        len(match_data['shots']), context['dag_run'].run_id, started_at
+                    )
 
-            # Save to database
-            run_id = f"auto_{uuid.uuid4().hex[:8]}"
-            match_id = match_data['match_id']
+                    logger.info(f"✓ Scraped {home} vs {away}: {len(match_data['shots'])} shots")
+                    scraped += 1
 
-            loader.create_scrape_run(run_id, match_id, 'understat', context['dag_run'].run_id)
-            loader.save_understat_raw(match_id, match_data, fixture['match_url'], run_id)
-            loader.update_scrape_run(run_id, 'success', len(match_data['shots']))
+                except Exception as e:
+                    logger.error(f"Error scraping {fixture['match_url']}: {e}")
+                    loader.record_scrape_failure(
+                        run_id, task.match_id, 'understat', str(e), context['dag_run'].run_id, started_at
+                    )
+                    continue
 
-            logger.info(f"✓ Scraped {home} vs {away}: {len(match_data['shots'])} shots")
-            scraped += 1
+        scraped -= writer.summary()['failed']
 
-            # Small delay to be polite
-            import time
-            time.sleep(2)
+        logger.info(f"Scraping complete: {scraped}/{len(plan)} matches scraped")
 
-        except Exception as e:
-            logger.error(f"Error scraping {fixture['match_url']}: {e}")
-            continue
-
-    logger.info(f"Scraping complete: {scraped}/{len(new_matches)} matches scraped")
-
-    return {
-        "new_matches": len(new_matches),
-        "scraped": scraped,
-        "season": f"{season}-{int(season)+1}"
-    }
+        return {
+            "new_matches": len(plan),
+            "scraped": scraped,
+            "season": f"{season}-{int(season)+1}"
+        }
 
 
 # DAG definition
@@ -19,8 +19,10 @@ import logging
 
 sys.path.insert(0, '/opt/airflow/scrapers')
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from tiered_fetcher import TieredUnderstatFetcher
 from db_loader import DatabaseLoader
+from fixture_cache import FixtureCache
+from write_behind import WriteBehindLoader
 
 logger = logging.getLogger(__name__)
 
@@ -32,83 +34,73 @@ def scrape_latest_match(**context):
     This will scrape the latest completed match that's not in the database.
     Perfect for running 2 hours after a match finishes.
     """
-    scraper = UnderstatPlaywrightScraper()
-    loader = DatabaseLoader()
-
-    # Get current season
-    current_year = datetime.now().year
-    season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
-
-    logger.info(f"Looking for latest Arsenal match in {season}-{int(season)+1}")
-
-    # Get fixtures
-    fixtures = scraper.scrape_season_fixtures(season)
-    played_matches = [f for f in fixtures if f['is_result']]
-
-    if not played_matches:
-        logger.warning("No played matches found")
-        return {"status": "no_matches"}
-
-    # Sort by date (most recent first)
-    played_matches.sort(key=lambda x: x['match_date'], reverse=True)
-
-    # Get existing matches from database
-    with loader.get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT match_url
-                FROM bronze.understat_raw
-                WHERE match_url IS NOT NULL
-            """)
-            existing_urls = set(row[0] for row in cur.fetchall())
-
-    # Find the most recent match not in database
-    latest_new_match = None
-    for fixture in played_matches:
-        if fixture['match_url'] not in existing_urls:
-            latest_new_match = fixture
-            break
-
-    if not latest_new_match:
-        logger.info("No new matches to scrape - all matches up to date!")
-        return {"status": "up_to_date"}
-
-    # Scrape the latest match
-    try:
-        home = latest_new_match['home_team']
-        away = latest_new_match['away_team']
-        date = latest_new_match['match_date']
-
-        logger.info(f"Scraping latest match: {date} - {home} vs {away}")
-
-        # Scrape
-        match_data = scraper.scrape_match_shots(latest_new_match['match_url'])
-
-        # Save
-        run_id = f"manual_{uuid.uuid4().hex[:8]}"
-        match_id = match_data['match_id']
-
-        loader.create_scrape_run(run_id, match_id, 'understat', context['dag_run'].run_id)
-        loader.save_understat_raw(match_id, match_data, latest_new_match['match_url'], run_id)
-        loader.update_scrape_run(run_id, 'success', len(match_data['shots']))
-
-        logger.info(f"✓ Successfully scraped {home} vs {away}")
-        logger.info(f"  Score: {match_data['home_goals']}-{match_data['away_goals']}")
-        logger.info(f"  xG: {match_data['home_xg']:.2f} - {match_data['away_xg']:.2f}")
-        logger.info(f"  Shots: {len(match_data['shots'])}")
-
-        return {
-            "status": "success",
-            "match": f"{home} vs {away}",
-            "date": date,
-            "shots": len(match_data['shots']),
-            "xg_home": match_data['home_xg'],
-            "xg_away": match_data['away_xg']
-        }
-
-    except Exception as e:
-        logger.error(f"Error scraping match: {e}")
-        return {"status": "error", "error": str(e)}
+    with TieredUnderstatFetcher() as scraper:
+        loader = DatabaseLoader()
+
+        # Get current season
+        current_year = datetime.now().year
+        season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
+
+        logger.info(f"Looking for latest Arsenal match in {season}-{int(season)+1}")
+
+        # Get fixtures
+        fixtures = FixtureCache(loader, scraper).get_season_fixtures(season, force_refresh=True)
+        played_matches = [f for f in fixtures if f['is_result']]
+
+        if not played_matches:
+            logger.warning("No played matches found")
+            return {"status": "no_matches"}
+
+        # Sort by date (most recent first)
+        played_matches.sort(key=lambda x: x['match_date'], reverse=True)
+
+        # Find the most recent match not in database
+        missing_matches = loader.diff_fixtures(played_matches)
+        latest_new_match = missing_matches[0] if missing_matches else None
+
+        if not latest_new_match:
+            logger.info("No new matches to scrape - all matches up to date!")
+            return {"status": "up_to_date"}
+
+        # Scrape the latest match
+        try:
+            home = latest_new_match['home_team']
+            away = latest_new_match['away_team']
+            date = latest_new_match['match_date']
+
+            logger.info(f"Scraping latest match: {date} - {home} vs {away}")
+
+            # Scrape
+            started_at = datetime.utcnow()
+            match_data = scraper.scrape_match_shots(latest_new_match['match_url'])
+
+            # Save (ledger row + payload in one transaction)
+            run_id = f"manual_{uuid.uuid4().hex[:8]}"
+            match_id = match_data['match_id']
+
+            if not loader.record_match_scrape(
+                run_id, match_id, 'understat', match_data, latest_new_match['match_url'],
+                len(match_data['shots']), context['dag_run'].run_id, started_at
+            ):
+                return {"status": "error", "error": "database_save_failed"}
+
+            logger.info(f"✓ Successfully scraped {home} vs {away}")
+            logger.info(f"  Score: {match_data['home_goals']}-{match_data['away_goals']}")
+            logger.info(f"  xG: {match_data['home_xg']:.2f} - {match_data['away_xg']:.2f}")
+            logger.info(f"  Shots: {len(match_data['shots'])}")
+
+            return {
+                "status": "success",
+                "match": f"{home} vs {away}",
+                "date": date,
+                "shots": len(match_data['shots']),
+                "xg_home": match_data['home_xg'],
+                "xg_away": match_data['away_xg']
+            }
+
+        except Exception as e:
+            logger.error(f"Error scraping match: {e}")
+            return {"status": "error", "error": str(e)}
 
 
 def scrape_all_missing_matches(**context):
@@ -117,60 +109,55 @@ def scrape_all_missing_matches(**context):
 
     Use this if multiple matches were played and you want to catch up.
     """
-    scraper = UnderstatPlaywrightScraper()
-    loader = DatabaseLoader()
+    with TieredUnderstatFetcher() as scraper:
+        loader = DatabaseLoader()
 
-    current_year = datetime.now().year
-    season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
+        current_year = datetime.now().year
+        season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
 
-    logger.info(f"Scraping all missing matches for {season}-{int(season)+1}")
+        logger.info(f"Scraping all missing matches for {season}-{int(season)+1}")
 
-    # Get fixtures
-    fixtures = scraper.scrape_season_fixtures(season)
-    played_matches = [f for f in fixtures if f['is_result']]
+        # Get fixtures
+        fixtures = FixtureCache(loader, scraper).get_season_fixtures(season, force_refresh=True)
+        played_matches = [f for f in fixtures if f['is_result']]
 
-    # Get existing matches
-    with loader.get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT match_url
-                FROM bronze.understat_raw
-                WHERE match_url IS NOT NULL
-            """)
-            existing_urls = set(row[0] for row in cur.fetchall())
+        # Find missing matches
+        missing_matches = loader.diff_fixtures(played_matches)
 
-    # Find missing matches
-    missing_matches = [f for f in played_matches if f['match_url'] not in existing_urls]
+        if not missing_matches:
+            logger.info("All matches up to date!")
+            return {"status": "up_to_date", "missing": 0}
 
-    if not missing_matches:
-        logger.info("All matches up to date!")
-        return {"status": "up_to_date", "missing": 0}
+        logger.info(f"Found {len(missing_matches)} missing matches")
 
-    logger.info(f"Found {len(missing_matches)} missing matches")
+        # Scrape all missing; writes are applied in the background
+        scraped = 0
+        with WriteBehindLoader(loader) as writer:
+            for fixture in missing_matches:
+                try:
+                    started_at = datetime.utcnow()
+                    match_data = scraper.scrape_match_shots(fixture['match_url'])
+                    run_id = f"manual_{uuid.uuid4().hex[:8]}"
+                    match_id = match_data['match_id']
 
-    # Scrape all missing
-    scraped = 0
-    for fixture in missing_matches:
-        try:
-            match_data = scraper.scrape_match_shots(fixture['match_url'])
-            run_id = f"manual_{uuid.uuid4().hex[:8]}"
-            match_id = match_data['match_id']
+                    writer.record_match_scrape(
+                        run_id, match_id, 'understat', match_data, fixture['match_url'],
+                        len(match_data['shots']), context['dag_run'].run_id, started_at
+                    )
 
-            loader.create_scrape_run(run_id, match_id, 'understat', context['dag_run'].run_id)
-            loader.save_understat_raw(match_id, match_data, fixture['match_url'], run_id)
-            loader.update_scrape_run(run_id, 'success', len(match_data['shots']))
+                    logger.info(f"✓ {fixture['home_team']} vs {fixture['away_team']}")
+                    scraped += 1
 
-            logger.info(f"✓ {fixture['home_team']} vs {fixture['away_team']}")
-            scraped += 1
+                    import time
+                    time.sleep(2)
 
-            import time
-            time.sleep(2)
+                except Exception as e:
+                    logger.error(f"Error scraping {fixture['match_url']}: {e}")
+                    continue
 
-        except Exception as e:
-            logger.error(f"Error scraping {fixture['match_url']}: {e}")
-            continue
+        scraped -= writer.summary()['failed']
 
-    return {"status": "success", "missing": len(missing_matches), "scraped": scraped}
+        return {"status": "success", "missing": len(missing_matches), "scraped": scraped}
 
 
 # DAG definition
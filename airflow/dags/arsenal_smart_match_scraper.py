@@ -2,7 +2,7 @@
 Arsenal Smart Match Scraper DAG
 
 This DAG intelligently schedules itself based on Arsenal's actual match times:
-1. Fetches upcoming Arsenal fixtures from Understat
+1. Reads upcoming Arsenal fixtures (cached in bronze.match_reference)
 2. Finds the next unplayed match
 3. Schedules scraping for 2 hours after match kickoff time
 4. Uses Airflow sensors to wait for the right time
@@ -21,8 +21,9 @@ import logging
 
 sys.path.insert(0, '/opt/airflow/scrapers')
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from tiered_fetcher import TieredUnderstatFetcher
 from db_loader import DatabaseLoader
+from fixture_cache import FixtureCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +35,15 @@ def get_next_arsenal_match(**context):
     Returns:
         dict: Next match details (date, time, opponent, competition)
     """
-    scraper = UnderstatPlaywrightScraper()
-
     # Get current season
     current_year = datetime.now().year
     season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
 
     logger.info(f"Checking Arsenal fixtures for {season}-{int(season)+1} season")
 
-    # Get all fixtures
-    fixtures = scraper.scrape_season_fixtures(season)
+    # Get all fixtures (served from bronze.match_reference unless stale)
+    with TieredUnderstatFetcher() as scraper:
+        fixtures = FixtureCache(DatabaseLoader(), scraper).get_season_fixtures(season)
 
     # Filter for upcoming matches (not yet played)
     upcoming = [f for f in fixtures if not f['is_result']]
@@ -106,81 +106,71 @@ def scrape_latest_completed_match(**context):
     """
     Scrape the most recently completed Arsenal match
     """
-    scraper = UnderstatPlaywrightScraper()
-    loader = DatabaseLoader()
-
-    # Get current season
-    current_year = datetime.now().year
-    season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
-
-    logger.info(f"Scraping latest Arsenal match from {season} season")
-
-    # Get all fixtures
-    fixtures = scraper.scrape_season_fixtures(season)
-    played_matches = [f for f in fixtures if f['is_result']]
-
-    if not played_matches:
-        logger.warning("No played matches found")
-        return {"status": "no_matches"}
-
-    # Sort by date (most recent first)
-    played_matches.sort(key=lambda x: x['match_date'], reverse=True)
-
-    # Get existing matches from database
-    with loader.get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT match_url
-                FROM bronze.understat_raw
-                WHERE match_url IS NOT NULL
-            """)
-            existing_urls = set(row[0] for row in cur.fetchall())
-
-    # Find the most recent match not in database
-    latest_match = None
-    for fixture in played_matches:
-        if fixture['match_url'] not in existing_urls:
-            latest_match = fixture
-            break
-
-    if not latest_match:
-        logger.info("All matches are already scraped - database is up to date!")
-        return {"status": "up_to_date"}
-
-    # Scrape the latest match
-    try:
-        home = latest_match['home_team']
-        away = latest_match['away_team']
-        date = latest_match['match_date']
-
-        logger.info(f"Scraping: {date} - {home} vs {away}")
-
-        # Scrape
-        match_data = scraper.scrape_match_shots(latest_match['match_url'])
-
-        # Save
-        run_id = f"smart_{uuid.uuid4().hex[:8]}"
-        match_id = match_data['match_id']
-
-        loader.create_scrape_run(run_id, match_id, 'understat', context['dag_run'].run_id)
-        loader.save_understat_raw(match_id, match_data, latest_match['match_url'], run_id)
-        loader.update_scrape_run(run_id, 'success', len(match_data['shots']))
-
-        logger.info(f"✓ Successfully scraped {home} vs {away}")
-        logger.info(f"  Score: {match_data['home_goals']}-{match_data['away_goals']}")
-        logger.info(f"  xG: {match_data['home_xg']:.2f} - {match_data['away_xg']:.2f}")
-        logger.info(f"  Shots: {len(match_data['shots'])}")
-
-        return {
-            "status": "success",
-            "match": f"{home} vs {away}",
-            "date": date,
-            "shots": len(match_data['shots'])
-        }
-
-    except Exception as e:
-        logger.error(f"Error scraping match: {e}")
-        return {"status": "error", "error": str(e)}
+    with TieredUnderstatFetcher() as scraper:
+        loader = DatabaseLoader()
+
+        # Get current season
+        current_year = datetime.now().year
+        season = str(current_year) if datetime.now().month >= 8 else str(current_year - 1)
+
+        logger.info(f"Scraping latest Arsenal match from {season} season")
+
+        # Get all fixtures
+        fixtures = FixtureCache(loader, scraper).get_season_fixtures(season)
+        played_matches = [f for f in fixtures if f['is_result']]
+
+        if not played_matches:
+            logger.warning("No played matches found")
+            return {"status": "no_matches"}
+
+        # Sort by date (most recent first)
+        played_matches.sort(key=lambda x: x['match_date'], reverse=True)
+
+        # Find the most recent match not in database
+        missing_matches = loader.diff_fixtures(played_matches)
+        latest_match = missing_matches[0] if missing_matches else None
+
+        if not latest_match:
+            logger.info("All matches are already scraped - database is up to date!")
+            return {"status": "up_to_date"}
+
+        # Scrape the latest match
+        try:
+            home = latest_match['home_team']
+            away = latest_match['away_team']
+            date = latest_match['match_date']
+
+            logger.info(f"Scraping: {date} - {home} vs {away}")
+
+            # Scrape
+            started_at = datetime.utcnow()
+            match_data = scraper.scrape_match_shots(latest_match['match_url'])
+
+            # Save (ledger row + payload in one transaction)
+            run_id = f"smart_{uuid.uuid4().hex[:8]}"
+            match_id = match_data['match_id']
+
+            if not loader.record_match_scrape(
+                run_id, match_id, 'understat', match_data, latest_match['match_url'],
+                len(match_data['shots']), context['dag_run'].run_id, started_at
+            ):
+                return {"status": "error", "error": "database_save_failed"}
+
+            logger.info(f"✓ Successfully scraped {home} vs {away}")
+            logger.info(f"  Score: {match_data['home_goals']}-{match_data['away_goals']}")
+            logger.info(f"  xG: {match_data['home_xg']:.2f} - {match_data['away_xg']:.2f}")
+            logger.info(f"  Shots: {len(match_data['shots'])}")
+
+            return {
+                "status": "success",
+                "match": f"{home} vs {away}",
+                "date": date,
+                "shots": len(match_data['shots'])
+            }
+
+        except Exception as e:
+            logger.error(f"Error scraping match: {e}")
+            return {"status": "error", "error": str(e)}
 
 
 # DAG definition
@@ -0,0 +1,35 @@
+-- Fixture-list cache: DAG tasks read Understat fixtures from Postgres and only
+-- re-fetch upstream when the list is stale or a match is near kickoff
+
+\c arsenalfc_analytics
+
+-- ============================================================================
+-- Per-fixture cache columns on bronze.match_reference
+-- ============================================================================
+ALTER TABLE bronze.match_reference
+    ADD COLUMN IF NOT EXISTS understat_match_id VARCHAR(20),
+    ADD COLUMN IF NOT EXISTS understat_season VARCHAR(4),  -- Understat season key, e.g. '2025'
+    ADD COLUMN IF NOT EXISTS kickoff_at TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS is_result BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS fixture_hash CHAR(64),  -- sha256 of the fixture fields
+    ADD COLUMN IF NOT EXISTS fetched_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_match_reference_understat_season
+    ON bronze.match_reference(understat_season, kickoff_at);
+
+-- ============================================================================
+-- Table: fixture_lists
+-- Purpose: Freshness and change detection for each cached fixture list
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS bronze.fixture_lists (
+    source VARCHAR(20) NOT NULL,
+    season VARCHAR(4) NOT NULL,
+    list_hash CHAR(64) NOT NULL,  -- sha256 over the sorted fixture hashes
+    fixture_count INTEGER NOT NULL,
+    fetched_at TIMESTAMP NOT NULL,  -- Last time upstream was checked
+    changed_at TIMESTAMP NOT NULL,  -- Last time the list actually changed
+
+    PRIMARY KEY (source, season)
+);
+
+GRANT ALL ON ALL TABLES IN SCHEMA bronze TO analytics_user;
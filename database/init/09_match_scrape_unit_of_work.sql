@@ -0,0 +1,31 @@
+-- One-statement match recording: DatabaseLoader.record_match_scrape writes the
+-- scrape_runs ledger row and the bronze payload together
+
+\c arsenalfc_analytics
+
+-- ============================================================================
+-- One payload row per match in bronze.understat_raw
+-- ============================================================================
+-- The payload upsert targets ON CONFLICT (match_id), like save_understat_raw
+-- already did; UNIQUE(match_id, scraped_at) cannot serve as that conflict
+-- target, so add the per-match key both writers rely on. Databases created
+-- under the old key can hold several scrapes of a match; keep the latest
+-- one so the index can be built. The lock keeps writers still on the old
+-- key from adding a duplicate in between.
+BEGIN;
+
+LOCK TABLE bronze.understat_raw IN SHARE ROW EXCLUSIVE MODE;
+
+DELETE FROM bronze.understat_raw u
+USING (
+    SELECT
+        id,
+        ROW_NUMBER() OVER (PARTITION BY match_id ORDER BY scraped_at DESC, id DESC) AS version
+    FROM bronze.understat_raw
+) ranked
+WHERE u.id = ranked.id AND ranked.version > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_understat_raw_match_id
+    ON bronze.understat_raw(match_id);
+
+COMMIT;
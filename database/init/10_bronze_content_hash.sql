@@ -0,0 +1,22 @@
+-- Content-hash change detection: bronze payload upserts skip the rewrite when a
+-- re-scraped payload is identical to the stored one
+
+\c arsenalfc_analytics
+
+-- ============================================================================
+-- content_hash on each bronze payload table
+-- ============================================================================
+-- sha256 of the payload's canonical JSON (see db_loader.content_hash). Upserts
+-- only update a row WHERE content_hash IS DISTINCT FROM the new hash, so an
+-- unchanged payload leaves no dead tuple, no TOAST rewrite and keeps its
+-- updated_at. Existing rows start NULL and get their hash on the next write
+-- (jsonb's text form differs from the loader's canonical JSON, so the hash
+-- cannot be backfilled here).
+ALTER TABLE bronze.understat_raw ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+ALTER TABLE bronze.fbref_raw ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+ALTER TABLE bronze.fbref_lineups ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+-- updated_at now only moves on a real payload change, so downstream refresh
+-- jobs can pick up changed matches with a range scan
+CREATE INDEX IF NOT EXISTS idx_understat_raw_updated_at ON bronze.understat_raw(updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_fbref_raw_updated_at ON bronze.fbref_raw(updated_at DESC);
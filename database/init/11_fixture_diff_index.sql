@@ -0,0 +1,15 @@
+-- Set-based fixture diff: DatabaseLoader.diff_fixtures checks a whole fixture
+-- list against bronze in one anti-join on match_url
+
+\c arsenalfc_analytics
+
+-- ============================================================================
+-- match_url lookups on the bronze payload tables
+-- ============================================================================
+-- (match_url, scraped_at) answers both "is it there" and "was it scraped
+-- after kickoff" from the index, so the diff costs one probe per candidate
+-- fixture however many league matches bronze holds.
+CREATE INDEX IF NOT EXISTS idx_understat_raw_match_url
+    ON bronze.understat_raw(match_url, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_fbref_raw_match_url
+    ON bronze.fbref_raw(match_url, scraped_at);
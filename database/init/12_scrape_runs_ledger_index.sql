@@ -0,0 +1,15 @@
+-- Scrape planner: scrape_planner.build_scrape_plan reads each fixture's latest
+-- success and recent failures from bronze.scrape_runs in one query
+
+\c arsenalfc_analytics
+
+-- ============================================================================
+-- Ledger lookups on bronze.scrape_runs
+-- ============================================================================
+-- "latest success" (ORDER BY completed_at DESC LIMIT 1) and "failures since"
+-- are both range scans on this index; get_latest_scrape_for_match uses it too.
+CREATE INDEX IF NOT EXISTS idx_scrape_runs_ledger
+    ON bronze.scrape_runs(match_id, scrape_type, status, completed_at);
+
+-- Covered by the ledger index's leading column
+DROP INDEX IF EXISTS bronze.idx_scrape_runs_match_id;
@@ -0,0 +1,77 @@
+-- One current lineup row per match: bronze.fbref_lineups was keyed by
+-- (match_url, scraped_at), so every re-scrape added a row and silver.shot_events
+-- flattened every historical version. Superseded versions now live in
+-- bronze.fbref_lineups_history.
+
+\c arsenalfc_analytics
+
+-- ============================================================================
+-- Superseded lineup versions
+-- ============================================================================
+-- The loader copies the current row here in the same transaction that
+-- overwrites it with a changed payload (see db_loader.DatabaseLoader.
+-- save_fbref_lineups / bulk_save). Unchanged re-scrapes leave no history.
+CREATE TABLE IF NOT EXISTS bronze.fbref_lineups_history (
+    id SERIAL PRIMARY KEY,
+    source_id INTEGER,  -- bronze.fbref_lineups.id the version was stored under
+    match_id VARCHAR(50),
+    match_url TEXT NOT NULL,
+    scraped_at TIMESTAMP NOT NULL,
+    scrape_run_id VARCHAR(100),
+    raw_lineups JSONB NOT NULL,
+    content_hash CHAR(64),
+    superseded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_fbref_lineups_history_match_url
+    ON bronze.fbref_lineups_history(match_url, scraped_at DESC);
+
+-- ============================================================================
+-- Compaction
+-- ============================================================================
+-- Moves every lineup row but the latest scrape of each match into the history
+-- table and returns how many moved. Run by this migration; safe to re-run:
+--   SELECT bronze.compact_fbref_lineups();
+CREATE OR REPLACE FUNCTION bronze.compact_fbref_lineups()
+RETURNS INTEGER AS $$
+    WITH ranked AS (
+        SELECT
+            id,
+            ROW_NUMBER() OVER (PARTITION BY match_url ORDER BY scraped_at DESC, id DESC) AS version
+        FROM bronze.fbref_lineups
+    ),
+    superseded AS (
+        DELETE FROM bronze.fbref_lineups l
+        USING ranked r
+        WHERE l.id = r.id AND r.version > 1
+        RETURNING l.*
+    ),
+    archived AS (
+        INSERT INTO bronze.fbref_lineups_history
+            (source_id, match_id, match_url, scraped_at, scrape_run_id, raw_lineups, content_hash)
+        SELECT id, match_id, match_url, scraped_at, scrape_run_id, raw_lineups, content_hash
+        FROM superseded
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM archived;
+$$ LANGUAGE sql;
+
+-- ============================================================================
+-- Re-key bronze.fbref_lineups on match_url
+-- ============================================================================
+-- Compact and swap the unique key in one transaction; the lock keeps writers
+-- still on the old key from adding a duplicate in between.
+BEGIN;
+
+LOCK TABLE bronze.fbref_lineups IN SHARE ROW EXCLUSIVE MODE;
+
+SELECT bronze.compact_fbref_lineups() AS compacted_lineup_versions;
+
+ALTER TABLE bronze.fbref_lineups DROP CONSTRAINT IF EXISTS fbref_lineups_match_url_scraped_at_key;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_fbref_lineups_match_url
+    ON bronze.fbref_lineups(match_url);
+
+COMMIT;
+
+GRANT ALL ON ALL TABLES IN SCHEMA bronze TO analytics_user;
+GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA bronze TO analytics_user;
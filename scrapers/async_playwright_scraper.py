@@ -0,0 +1,416 @@
+"""
+Async Playwright scraper for Understat
+
+Scrapes many match pages concurrently over one shared browser. Concurrency is
+bounded per host and request starts to the same host are spaced by the delays
+in ScraperConfig, so throughput is limited by the politeness budget instead of
+by serial page loads.
+
+Usage:
+    async with AsyncUnderstatPlaywrightScraper() as scraper:
+        fixtures = await scraper.scrape_season_fixtures("2025")
+        results = await scraper.scrape_matches(fixtures)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Any, Union
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    Page,
+    TimeoutError as PlaywrightTimeoutError
+)
+
+from config import config
+from playwright_scraper import (
+    BrowserPoolStats,
+    PageLoadStats,
+    UNDERSTAT_FIXTURES_READY,
+    UNDERSTAT_SHOTS_READY,
+    build_understat_fixtures,
+    build_understat_match,
+    should_block_request,
+    teams_from_title,
+    date_from_text
+)
+from utils import get_host_limiter, ScraperException
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHostThrottle:
+    """
+    Per-host concurrency limit plus the shared per-host request budget
+
+    Up to max_concurrency pages may be in flight for a host, and every
+    navigation takes a token from the host's shared HostRateLimiter, so
+    request starts stay within the configured delay even when sync scrapers
+    or other processes are hitting the same host.
+    """
+
+    def __init__(self, max_concurrency: Dict[str, int], delays: Dict[str, float]):
+        """
+        Args:
+            max_concurrency: Maximum in-flight pages per host
+            delays: Minimum seconds between request starts per host
+        """
+        self.max_concurrency = max_concurrency
+        self.delays = delays
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Async context manager that holds a concurrency slot for the URL's host"""
+        host = urlparse(url).netloc
+
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrency.get(host, 1))
+
+        async with self._semaphores[host]:
+            await get_host_limiter(host, self.delays.get(host, 0.0)).acquire_async()
+            yield
+
+
+class AsyncUnderstatPlaywrightScraper:
+    """Scrape Understat concurrently using the async Playwright API"""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_concurrency: Optional[int] = None,
+        max_navigations_per_page: Optional[int] = None
+    ):
+        """
+        Args:
+            headless: Run Chromium headless
+            max_concurrency: Maximum concurrent pages on Understat
+                             (defaults to config.UNDERSTAT_MAX_CONCURRENCY)
+            max_navigations_per_page: Recycle a page after this many navigations
+        """
+        self.headless = headless
+        self.viewport = {'width': 1920, 'height': 1080}
+        self.user_agent = config.USER_AGENT
+        self.base_url = config.UNDERSTAT_BASE_URL
+        self.max_concurrency = max_concurrency or config.UNDERSTAT_MAX_CONCURRENCY
+        self.max_navigations_per_page = (
+            max_navigations_per_page or config.PLAYWRIGHT_MAX_NAVIGATIONS_PER_PAGE
+        )
+        self.stats = BrowserPoolStats()
+
+        self.throttle = AsyncHostThrottle(
+            max_concurrency={config.understat_host: self.max_concurrency},
+            delays={config.understat_host: config.UNDERSTAT_REQUEST_DELAY}
+        )
+
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        self._idle_pages: List[Page] = []
+        self._page_navigations: Dict[Page, int] = {}
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self) -> None:
+        """Launch the shared browser and context (no-op if already open)"""
+        if self._browser is not None:
+            return
+
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.stats.browser_launches += 1
+
+            self._context = await self._browser.new_context(
+                viewport=self.viewport,
+                user_agent=self.user_agent
+            )
+            await self._context.route('**/*', self._route_request)
+            self.stats.contexts_created += 1
+        except Exception:
+            try:
+                if self._context is not None:
+                    await self._context.close()
+                if self._browser is not None:
+                    await self._browser.close()
+            finally:
+                await self._playwright.stop()
+                self._playwright = None
+                self._browser = None
+                self._context = None
+            raise
+
+        logger.info(f"Async browser pool opened (max {self.max_concurrency} concurrent pages)")
+
+    async def close(self) -> None:
+        """Close all pooled pages, the context and the browser"""
+        if self._browser is None:
+            return
+
+        try:
+            for page in self._idle_pages:
+                await self._close_page(page)
+            await self._context.close()
+            await self._browser.close()
+        finally:
+            await self._playwright.stop()
+            self._playwright = None
+            self._browser = None
+            self._context = None
+            self._idle_pages = []
+
+        logger.info(f"Async browser pool closed: {self.stats.as_dict()}")
+
+    @asynccontextmanager
+    async def get_page(self):
+        """
+        Async context manager yielding a pooled page
+
+        Idle pages are reused; a page is recycled after max_navigations_per_page
+        navigations or when the caller raised an error.
+        """
+        await self.open()
+
+        if self._idle_pages:
+            page = self._idle_pages.pop()
+            self.stats.page_reuses += 1
+        else:
+            page = await self._context.new_page()
+            self._page_navigations[page] = 0
+            self.stats.pages_created += 1
+
+        failed = False
+        try:
+            yield page
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._page_navigations[page] += 1
+            self.stats.navigations += 1
+
+            if failed or self._page_navigations[page] >= self.max_navigations_per_page:
+                await self._close_page(page)
+                self.stats.pages_recycled += 1
+            else:
+                self._idle_pages.append(page)
+
+    async def load_page(
+        self,
+        page: Page,
+        url: str,
+        ready_expression: str,
+        timeout: int = 60000
+    ) -> PageLoadStats:
+        """
+        Navigate to a URL and wait until the page's data is available
+
+        Args:
+            page: Page to navigate
+            url: URL to load
+            ready_expression: JavaScript function returning truthy when ready
+            timeout: Navigation timeout in milliseconds
+
+        Returns:
+            PageLoadStats for this load
+        """
+        transferred = {'bytes': 0, 'requests': 0}
+
+        async def on_request_finished(request):
+            try:
+                sizes = await request.sizes()
+                transferred['bytes'] += sizes['responseBodySize'] + sizes['responseHeadersSize']
+            except Exception:
+                pass
+            transferred['requests'] += 1
+
+        page.on('requestfinished', on_request_finished)
+        started = time.monotonic()
+        ready = True
+        try:
+            await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+            try:
+                await page.wait_for_function(
+                    ready_expression, timeout=config.PLAYWRIGHT_READY_TIMEOUT_MS
+                )
+            except PlaywrightTimeoutError:
+                ready = False
+                logger.warning(f"Readiness probe timed out for {url}")
+        finally:
+            page.remove_listener('requestfinished', on_request_finished)
+
+        load = PageLoadStats(
+            url=url,
+            load_seconds=time.monotonic() - started,
+            bytes_transferred=transferred['bytes'],
+            requests=transferred['requests'],
+            ready=ready
+        )
+        self.stats.record_load(load)
+        logger.info(f"Loaded {load}")
+        return load
+
+    async def _route_request(self, route) -> None:
+        """Abort requests for resources that are not needed for scraping"""
+        request = route.request
+        if should_block_request(request.resource_type, request.url):
+            self.stats.requests_blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _close_page(self, page: Page) -> None:
+        """Close a pooled page"""
+        self._page_navigations.pop(page, None)
+        try:
+            await page.close()
+        except Exception as e:
+            logger.debug(f"Error closing page: {e}")
+
+    async def scrape_season_fixtures(self, season: str = "2024") -> List[Dict[str, Any]]:
+        """
+        Scrape all Arsenal fixtures from Understat for a season
+
+        Args:
+            season: Season year (e.g., "2024" for 2024-2025)
+
+        Returns:
+            List of fixture dictionaries with match URLs
+        """
+        arsenal_url = f"{self.base_url}/team/Arsenal/{season}"
+
+        logger.info(f"Scraping Understat fixtures: {arsenal_url}")
+
+        async with self.throttle.slot(arsenal_url):
+            async with self.get_page() as page:
+                try:
+                    load = await self.load_page(page, arsenal_url, UNDERSTAT_FIXTURES_READY)
+                    if not load.ready:
+                        # A timed-out page must not pass for one without data
+                        raise ScraperException(f"Fixture data did not load for {arsenal_url} (readiness probe timed out)")
+
+                    matches_data = await page.evaluate('() => window.datesData || []')
+
+                    if not matches_data:
+                        logger.warning("No match data found on page")
+                        return []
+
+                    fixtures = build_understat_fixtures(matches_data, self.base_url)
+
+                    logger.info(f"Scraped {len(fixtures)} fixtures from Understat")
+                    return fixtures
+
+                except ScraperException:
+                    raise
+                except PlaywrightTimeoutError as e:
+                    raise ScraperException(f"Timeout loading {arsenal_url}: {e}")
+                except Exception as e:
+                    raise ScraperException(f"Error scraping Understat fixtures: {e}")
+
+    async def scrape_match_shots(
+        self,
+        match_url: str,
+        home_team: str = None,
+        away_team: str = None,
+        match_date: str = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape shot-level data for a specific match
+
+        Args:
+            match_url: Full URL to the match page
+            home_team: Optional home team name (from fixture list)
+            away_team: Optional away team name (from fixture list)
+            match_date: Optional match date (from fixture list)
+
+        Returns:
+            Dictionary containing match info and shot data
+        """
+        logger.info(f"Scraping match shots: {match_url}")
+
+        async with self.throttle.slot(match_url):
+            async with self.get_page() as page:
+                try:
+                    load = await self.load_page(page, match_url, UNDERSTAT_SHOTS_READY)
+                    if not load.ready:
+                        # A timed-out page must not pass for one without data
+                        raise ScraperException(f"Shot data did not load for {match_url} (readiness probe timed out)")
+
+                    shots_data = await page.evaluate('() => window.shotsData || {}')
+
+                    if not home_team or not away_team:
+                        title_home, title_away = teams_from_title(await page.title())
+                        home_team = home_team or title_home
+                        away_team = away_team or title_away
+
+                    if not match_date:
+                        try:
+                            date_element = await page.query_selector('.breadcrumb')
+                            if date_element:
+                                match_date = date_from_text(await date_element.text_content())
+                        except Exception:
+                            pass
+
+                    match_data = build_understat_match(
+                        shots_data, match_url, home_team, away_team, match_date
+                    )
+
+                    logger.info(f"Scraped {len(match_data['shots'])} shots for {home_team} vs {away_team}")
+                    return match_data
+
+                except ScraperException:
+                    raise
+                except PlaywrightTimeoutError as e:
+                    raise ScraperException(f"Timeout loading {match_url}: {e}")
+                except Exception as e:
+                    raise ScraperException(f"Error scraping match shots: {e}")
+
+    async def scrape_matches(
+        self,
+        fixtures: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], ScraperException]]:
+        """
+        Scrape shot data for many fixtures concurrently
+
+        Args:
+            fixtures: Fixture dictionaries (as returned by scrape_season_fixtures)
+
+        Returns:
+            One entry per fixture, in the same order: the match dictionary,
+            or the ScraperException raised for that fixture
+        """
+        tasks = [
+            self.scrape_match_shots(
+                fixture['match_url'],
+                home_team=fixture.get('home_team'),
+                away_team=fixture.get('away_team'),
+                match_date=fixture.get('match_date')
+            )
+            for fixture in fixtures
+        ]
+
+        started = time.monotonic()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        elapsed = time.monotonic() - started
+
+        failed = sum(1 for r in results if isinstance(r, Exception))
+        logger.info(
+            f"Scraped {len(results) - failed}/{len(results)} matches in {elapsed:.1f}s "
+            f"({self.max_concurrency} concurrent pages)"
+        )
+
+        return [
+            ScraperException(str(r))
+            if isinstance(r, Exception) and not isinstance(r, ScraperException) else r
+            for r in results
+        ]
@@ -4,16 +4,17 @@ Enhanced Backfill Script for Arsenal FC 2025-26 Season
 Scrapes all played matches from Understat and FBref for the 2025-26 season.
 """
 
+import asyncio
 import logging
 import sys
 import uuid
-import time
 from typing import List, Dict, Any
 from datetime import datetime
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from async_playwright_scraper import AsyncUnderstatPlaywrightScraper
 from fbref_scraper import FBrefScraper
 from db_loader import DatabaseLoader
+from write_behind import WriteBehindLoader
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,106 +24,92 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def scrape_all_2025_26_matches():
+async def scrape_all_2025_26_matches():
     """
     Scrape all played matches from 2025-26 season from both Understat and FBref
+
+    Match pages are fetched concurrently over one shared browser; the async
+    scraper's per-host throttle keeps request starts within
+    config.UNDERSTAT_REQUEST_DELAY.
     """
     logger.info("="*60)
     logger.info("ARSENAL FC 2025-26 SEASON BACKFILL")
     logger.info("="*60)
     
     # Initialize scrapers and loader
-    understat_scraper = UnderstatPlaywrightScraper()
-    fbref_scraper = FBrefScraper()
-    loader = DatabaseLoader()
+    async with AsyncUnderstatPlaywrightScraper() as understat_scraper:
+        fbref_scraper = FBrefScraper()
+        loader = DatabaseLoader()
     
-    # Get all fixtures for 2025 season
-    logger.info("Fetching fixtures from Understat for 2025 season...")
-    fixtures = understat_scraper.scrape_season_fixtures("2025")
+        # Get all fixtures for 2025 season
+        logger.info("Fetching fixtures from Understat for 2025 season...")
+        fixtures = await understat_scraper.scrape_season_fixtures("2025")
     
-    if not fixtures:
-        logger.error("No fixtures found! Check Understat URL.")
-        return
+        if not fixtures:
+            logger.error("No fixtures found! Check Understat URL.")
+            return
     
-    logger.info(f"Found {len(fixtures)} total fixtures")
+        logger.info(f"Found {len(fixtures)} total fixtures")
     
-    # Filter for completed matches
-    played_matches = [f for f in fixtures if f.get('is_result', False)]
-    logger.info(f"Found {len(played_matches)} completed matches")
+        # Filter for completed matches
+        played_matches = [f for f in fixtures if f.get('is_result', False)]
+        logger.info(f"Found {len(played_matches)} completed matches")
     
-    if not played_matches:
-        logger.warning("No completed matches found for 2025-26 season")
-        return
+        if not played_matches:
+            logger.warning("No completed matches found for 2025-26 season")
+            return
     
-    # Check which matches are already in database
-    with loader.get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT DISTINCT match_id
-                FROM bronze.understat_raw
-                WHERE match_id LIKE '2025%'
-            """)
-            existing_match_ids = set(row[0] for row in cur.fetchall())
+        # Keep only matches missing from (or stale in) the database
+        matches_to_scrape = loader.diff_fixtures(played_matches)
+        already_scraped = len(played_matches) - len(matches_to_scrape)
     
-    logger.info(f"Found {len(existing_match_ids)} existing matches in database")
+        logger.info(f"Found {already_scraped} existing matches in database")
     
-    # Filter out existing matches
-    matches_to_scrape = [
-        m for m in played_matches 
-        if m.get('match_id') not in existing_match_ids
-    ]
+        logger.info(f"Will scrape {len(matches_to_scrape)} new matches")
     
-    logger.info(f"Will scrape {len(matches_to_scrape)} new matches")
+        if not matches_to_scrape:
+            logger.info("All matches already scraped!")
+            return
     
-    if not matches_to_scrape:
-        logger.info("All matches already scraped!")
-        return
+        # Scrape Understat match data for all matches concurrently
+        logger.info("Scraping Understat match data...")
+        results = await understat_scraper.scrape_matches(matches_to_scrape)
     
     # Statistics
     success_count = 0
     error_count = 0
     errors = []
     
-    # Scrape each match
-    for i, fixture in enumerate(matches_to_scrape, 1):
+    # Save each match; writes are batched in the background
+    writer = WriteBehindLoader(loader)
+    for i, (fixture, match_data) in enumerate(zip(matches_to_scrape, results), 1):
         match_id = fixture.get('match_id')
         match_url = fixture.get('match_url')
         home_team = fixture.get('home_team', '')
         away_team = fixture.get('away_team', '')
         match_date = fixture.get('match_date', '')
-        
-        logger.info(f"\n[{i}/{len(matches_to_scrape)}] Scraping: {match_date} - {home_team} vs {away_team}")
+    
+        logger.info(f"\n[{i}/{len(matches_to_scrape)}] Saving: {match_date} - {home_team} vs {away_team}")
         logger.info(f"Match URL: {match_url}")
-        
+    
         try:
-            # Scrape Understat match data
-            logger.info("Scraping Understat match data...")
-            match_data = understat_scraper.scrape_match_shots(
-                match_url,
-                home_team=home_team,
-                away_team=away_team,
-                match_date=match_date
-            )
-            
+            if isinstance(match_data, Exception):
+                raise match_data
+    
             if not match_data or not match_data.get('shots'):
                 logger.warning(f"No shot data found for {match_id}")
                 error_count += 1
                 errors.append(f"{home_team} vs {away_team}: No shot data")
                 continue
-            
-            # Save Understat data
+    
+            # Queue Understat data
             run_id = f"backfill_2025_26_{uuid.uuid4().hex[:8]}"
-            loader.create_scrape_run(run_id, match_id, 'understat', None)
-            loader.save_understat_raw(
-                match_id,
-                match_data,
-                match_url,
-                run_id
+            writer.record_match_scrape(
+                run_id, match_id, 'understat', match_data, match_url, len(match_data['shots'])
             )
-            loader.update_scrape_run(run_id, 'success', len(match_data['shots']))
-            
+    
             logger.info(f"✓ Understat: {len(match_data['shots'])} shots, xG: {match_data.get('home_xg', 0):.2f}-{match_data.get('away_xg', 0):.2f}")
-            
+    
             # Scrape FBref data (optional - may not be available for all matches)
             try:
                 logger.info("Scraping FBref match data...")
@@ -131,13 +118,9 @@ def scrape_all_2025_26_matches():
                 logger.info("FBref scraping skipped (to be implemented)")
             except Exception as e:
                 logger.warning(f"FBref scraping failed (non-critical): {e}")
-            
+    
             success_count += 1
-            
-            # Rate limiting
-            if i < len(matches_to_scrape):
-                time.sleep(3)  # Be respectful to servers
-            
+    
         except Exception as e:
             error_msg = str(e)
             logger.error(f"✗ Error scraping {home_team} vs {away_team}: {error_msg}")
@@ -145,12 +128,19 @@ def scrape_all_2025_26_matches():
             errors.append(f"{home_team} vs {away_team}: {error_msg}")
             continue
     
+    # Wait for queued writes and count the ones that did not land
+    writer.close()
+    for failed in writer.failures:
+        success_count -= 1
+        error_count += 1
+        errors.append(f"{failed['match_id']}: database save failed")
+    
     # Summary
     logger.info("\n" + "="*60)
     logger.info("BACKFILL SUMMARY")
     logger.info("="*60)
     logger.info(f"Total matches: {len(played_matches)}")
-    logger.info(f"Already in DB: {len(existing_match_ids)}")
+    logger.info(f"Already in DB: {already_scraped}")
     logger.info(f"Attempted: {len(matches_to_scrape)}")
     logger.info(f"✓ Success: {success_count}")
     logger.info(f"✗ Errors: {error_count}")
@@ -167,7 +157,7 @@ def scrape_all_2025_26_matches():
 
 if __name__ == "__main__":
     try:
-        scrape_all_2025_26_matches()
+        asyncio.run(scrape_all_2025_26_matches())
     except KeyboardInterrupt:
         logger.info("\nBackfill interrupted by user")
         sys.exit(1)
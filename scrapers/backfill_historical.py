@@ -8,13 +8,16 @@ enabling immediate dashboard usability with full season context.
 import logging
 import re
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
-import time
+
+import psycopg2
 
 from understat_scraper import UnderstatScraper
 from fbref_scraper import FBrefScraper
+from fbref_schema import typed_frame, frame_to_columnar
 from db_loader import DatabaseLoader
+from write_behind import WriteBehindLoader
 from config import config
 from utils import generate_match_id, rate_limit
 
@@ -35,6 +38,7 @@ class HistoricalDataBackfill:
         self.understat_scraper = UnderstatScraper()
         self.fbref_scraper = FBrefScraper()
         self.loader = DatabaseLoader()
+        self.writer: Optional[WriteBehindLoader] = None  # Set while backfill_all_matches runs
 
     def get_season_fixtures(self) -> List[Dict[str, Any]]:
         """
@@ -92,38 +96,61 @@ class HistoricalDataBackfill:
             'matches': []
         }
 
-        for i, fixture in enumerate(fixtures, 1):
-            logger.info(f"\n[{i}/{len(fixtures)}] Processing match...")
-
-            try:
-                result = self.backfill_single_match(
-                    fixture,
-                    dry_run=dry_run,
-                    skip_existing=skip_existing
-                )
+        # One set-based lookup instead of an existence query per fixture
+        pending_urls = self.pending_match_urls(fixtures) if skip_existing else None
 
-                summary['matches'].append(result)
+        # Saves are queued and written in the background while the next
+        # match is scraped
+        self.writer = WriteBehindLoader(self.loader)
+        try:
+            for i, fixture in enumerate(fixtures, 1):
+                logger.info(f"\n[{i}/{len(fixtures)}] Processing match...")
 
-                if result['status'] == 'success':
-                    summary['success'] += 1
-                elif result['status'] == 'skipped':
+                if pending_urls is not None and fixture['match_url'] not in pending_urls:
+                    logger.info(f"⊘ Skipped (already in database)")
                     summary['skipped'] += 1
-                else:
+                    summary['matches'].append({
+                        'match_id': fixture.get('match_id'),
+                        'status': 'skipped',
+                        'reason': 'already_exists'
+                    })
+                    continue
+
+                try:
+                    result = self.backfill_single_match(
+                        fixture,
+                        dry_run=dry_run,
+                        skip_existing=False
+                    )
+
+                    summary['matches'].append(result)
+
+                    if result['status'] == 'success':
+                        summary['success'] += 1
+                    elif result['status'] == 'skipped':
+                        summary['skipped'] += 1
+                    else:
+                        summary['failed'] += 1
+
+                except Exception as e:
+                    logger.error(f"Error processing match: {e}")
                     summary['failed'] += 1
-
-            except Exception as e:
-                logger.error(f"Error processing match: {e}")
+                    summary['matches'].append({
+                        'match_id': fixture.get('match_id'),
+                        'status': 'failed',
+                        'error': str(e)
+                    })
+        finally:
+            writer, self.writer = self.writer, None
+            writer.close()
+
+        # Queued saves that failed after the match was counted
+        failed_ids = {item['match_id'] for item in writer.failures}
+        for result in summary['matches']:
+            if result['status'] == 'success' and result['match_id'] in failed_ids:
+                result.update(status='failed', error='database_save_failed')
+                summary['success'] -= 1
                 summary['failed'] += 1
-                summary['matches'].append({
-                    'match_id': fixture.get('match_id'),
-                    'status': 'failed',
-                    'error': str(e)
-                })
-
-            # Rate limiting between matches
-            if i < len(fixtures) and not dry_run:
-                logger.debug(f"Rate limiting: waiting {config.UNDERSTAT_REQUEST_DELAY}s...")
-                time.sleep(config.UNDERSTAT_REQUEST_DELAY)
 
         # Print summary
         logger.info("\n" + "="*60)
@@ -137,6 +164,21 @@ class HistoricalDataBackfill:
 
         return summary
 
+    def pending_match_urls(self, fixtures: List[Dict[str, Any]]) -> Optional[set]:
+        """
+        Match URLs of the fixtures that are missing or stale in bronze
+
+        Returns:
+            Set of pending match URLs, or None when the lookup failed and
+            every fixture should be treated as pending (bronze writes are
+            idempotent, so a redundant scrape only costs a request)
+        """
+        try:
+            return {f['match_url'] for f in self.loader.diff_fixtures(fixtures)}
+        except psycopg2.Error as e:
+            logger.warning(f"Could not check existing matches, treating all {len(fixtures)} as pending: {e}")
+            return None
+
     def backfill_single_match(
         self,
         fixture: Dict[str, Any],
@@ -173,8 +215,8 @@ class HistoricalDataBackfill:
 
         # Check if already exists
         if skip_existing:
-            exists = self.loader.check_match_exists(match_id)
-            if exists:
+            pending_urls = self.pending_match_urls([fixture])
+            if pending_urls is not None and understat_match_url not in pending_urls:
                 logger.info(f"⊘ Skipped (already in database)")
                 return {
                     'match_id': match_id,
@@ -218,15 +260,25 @@ class HistoricalDataBackfill:
         if understat_data:
             scrape_run_id = f"backfill_{self.season}_{match_id}"
 
-            success = self.loader.save_understat_raw(
-                match_id=match_id,
-                raw_shots=understat_data,
-                match_url=understat_match_url,
-                scrape_run_id=scrape_run_id
-            )
+            if self.writer:
+                self.writer.save_raw(
+                    'understat_raw',
+                    match_id=match_id,
+                    payload=understat_data,
+                    match_url=understat_match_url,
+                    scrape_run_id=scrape_run_id
+                )
+                success = True
+            else:
+                success = self.loader.save_understat_raw(
+                    match_id=match_id,
+                    raw_shots=understat_data,
+                    match_url=understat_match_url,
+                    scrape_run_id=scrape_run_id
+                )
 
             if success:
-                logger.info(f"✓ Data saved to bronze layer")
+                logger.info(f"✓ Data {'queued for' if self.writer else 'saved to'} bronze layer")
                 return {
                     'match_id': match_id,
                     'home_team': home_team,
@@ -290,7 +342,8 @@ class HistoricalDataBackfill:
                 'home': {},
                 'away': {}
             },
-            'player_stats': []  # Empty - no player data from backfill
+            # Empty - no player data from backfill (same columnar shape as FBrefScraper)
+            'player_stats': frame_to_columnar(typed_frame([], columns=['player_name', 'team']))
         }
 
         return stub_data
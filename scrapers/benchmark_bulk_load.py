@@ -0,0 +1,114 @@
+"""
+Benchmark bronze load throughput: per-row saves vs bulk VALUES vs COPY staging
+
+Writes synthetic match payloads to a bronze table through each load path
+and reports rows/second. Benchmark rows use match ids starting with
+'bench-' and are deleted before and after every run.
+
+Needs the analytics database (same POSTGRES_* / ANALYTICS_DB_* settings as
+the scrapers):
+
+    python benchmark_bulk_load.py
+    python benchmark_bulk_load.py --rows 5000 --table fbref_raw --methods values copy
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from db_loader import DatabaseLoader, BULK_TABLES, BULK_METHODS
+
+BENCH_PREFIX = 'bench-'
+METHODS = ('single',) + BULK_METHODS
+
+
+def synthetic_payloads(count: int, shots_per_match: int = 26, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build bulk_save payload dicts shaped like Understat match data"""
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        shots = [
+            {
+                'shot_id': str(i * 100 + n), 'minute': rng.randint(1, 95), 'player_name': f'Player {n}',
+                'x_coord': rng.random(), 'y_coord': rng.random(), 'xg': rng.random() / 3,
+                'result': 'MissedShots', 'situation': 'OpenPlay', 'shot_type': 'RightFoot',
+                'h_a': 'h' if n % 2 else 'a', 'h_team': 'Arsenal', 'a_team': 'Chelsea'
+            }
+            for n in range(shots_per_match)
+        ]
+        payloads.append({
+            'match_id': f'{BENCH_PREFIX}{i}',
+            'match_url': f'https://understat.com/match/{BENCH_PREFIX}{i}',
+            'payload': {'home_xg': 1.2, 'away_xg': 0.8, 'shots': shots},
+            'scrape_run_id': f'{BENCH_PREFIX}run',
+        })
+    return payloads
+
+
+def cleanup(loader: DatabaseLoader, table: str) -> None:
+    with loader.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DELETE FROM {table} WHERE match_id LIKE %s", (f'{BENCH_PREFIX}%',))
+
+
+def load_single(loader: DatabaseLoader, table_key: str, payloads: List[Dict[str, Any]]) -> bool:
+    """The per-row path: one save_* call (and transaction) per payload"""
+    save = {
+        'understat_raw': loader.save_understat_raw,
+        'fbref_raw': loader.save_fbref_raw,
+    }.get(table_key)
+
+    for item in payloads:
+        if save:
+            ok = save(item['match_id'], item['payload'], item['match_url'], item['scrape_run_id'])
+        else:
+            ok = loader.save_fbref_lineups(item['match_url'], item['payload'], item['match_id'], item['scrape_run_id'])
+        if not ok:
+            return False
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000, help='Payloads per method')
+    parser.add_argument('--table', default='understat_raw', choices=sorted(BULK_TABLES))
+    parser.add_argument('--methods', nargs='+', default=list(METHODS), choices=METHODS)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per method (best is reported)')
+    args = parser.parse_args()
+
+    loader = DatabaseLoader()
+    table = BULK_TABLES[args.table][0]
+    payloads = synthetic_payloads(args.rows)
+
+    print(f"Loading {args.rows} payloads into {table} x {args.repeat}")
+    print()
+    print(f"{'method':<8} {'best s':>9} {'rows/s':>10}")
+
+    try:
+        for method in args.methods:
+            best = None
+            for _ in range(args.repeat):
+                cleanup(loader, table)
+                started = time.perf_counter()
+                if method == 'single':
+                    ok = load_single(loader, args.table, payloads)
+                else:
+                    ok = loader.bulk_save(args.table, payloads, method)
+                elapsed = time.perf_counter() - started
+                if not ok:
+                    print(f"✗ {method} load failed (see log)")
+                    return 1
+                best = elapsed if best is None else min(best, elapsed)
+
+            print(f"{method:<8} {best:>9.2f} {args.rows / best:>10.0f}")
+    finally:
+        cleanup(loader, table)
+        loader.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
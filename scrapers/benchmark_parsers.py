@@ -0,0 +1,136 @@
+"""
+Benchmark the FBref parser backends on saved match-report pages
+
+Parses every page with each backend (see html_parsers.py) and reports parse
+time and peak memory per backend, and checks that all backends produce the
+same match reports.
+
+Pages can be given as files (.html or .html.gz) or taken from the on-disk
+HTTP response cache:
+
+    python benchmark_parsers.py pages/*.html
+    python benchmark_parsers.py --from-cache --repeat 3
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from config import config
+from fbref_scraper import FBrefScraper
+from html_parsers import PARSER_BACKENDS
+from http_cache import ResponseCache
+
+
+def load_pages(paths: List[str], from_cache: bool) -> List[Tuple[str, bytes]]:
+    """Load (name, html) pairs from files and/or the HTTP cache"""
+    pages = []
+
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+
+    if from_cache:
+        cache = ResponseCache(mode='replay')
+        for index_path in glob.glob(os.path.join(cache.cache_dir, 'index', '*', '*.json')):
+            with open(index_path) as f:
+                url = json.load(f)['url']
+            if '/en/matches/' in url:
+                pages.append((url, cache.load(cache.lookup(url))))
+
+    return pages
+
+
+def _run_backend(backend: str, pages: List[Tuple[str, bytes]], repeat: int, results) -> None:
+    """Parse all pages with one backend (runs in a fresh process)"""
+    scraper = FBrefScraper(cache=ResponseCache(mode='off'), parser_backend=backend)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    reports = {}
+    for _ in range(repeat):
+        for name, html in pages:
+            started = time.perf_counter()
+            report = scraper.parse_match_report(html, name)
+            timings.append(time.perf_counter() - started)
+            report.pop('scraped_at')
+            reports[name] = report
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results[backend] = {
+        'timings': timings,
+        'peak_mb': (peak_kb - baseline_kb) / 1024,
+        'reports': json.dumps(reports, sort_keys=True)
+    }
+
+
+def run_benchmark(pages: List[Tuple[str, bytes]], backends: List[str], repeat: int) -> Dict[str, Dict]:
+    """
+    Benchmark each backend in its own process so peak RSS is per backend
+
+    Returns:
+        Dict of backend -> {'timings', 'peak_mb', 'reports'}
+    """
+    manager = multiprocessing.Manager()
+    results = manager.dict()
+
+    for backend in backends:
+        worker = multiprocessing.Process(target=_run_backend, args=(backend, pages, repeat, results))
+        worker.start()
+        worker.join()
+
+    return dict(results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*', help='Saved match-report pages (.html or .html.gz)')
+    parser.add_argument('--from-cache', action='store_true',
+                        help=f'Also use FBref match reports from the HTTP cache ({config.HTTP_CACHE_DIR})')
+    parser.add_argument('--backends', nargs='+', default=sorted(PARSER_BACKENDS),
+                        choices=sorted(PARSER_BACKENDS))
+    parser.add_argument('--repeat', type=int, default=1, help='Parse every page this many times')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.from_cache)
+    if not pages:
+        parser.error('No pages to benchmark')
+
+    total_mb = sum(len(html) for _, html in pages) / 1024 / 1024
+    print(f"Benchmarking {len(pages)} pages ({total_mb:.1f} MB) x {args.repeat}")
+    print()
+
+    results = run_benchmark(pages, args.backends, args.repeat)
+
+    print(f"{'backend':<8} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} {'pages/s':>9} {'peak MB':>9}")
+    for backend in args.backends:
+        timings = results[backend]['timings']
+        total = sum(timings)
+        p95 = sorted(timings)[int(0.95 * (len(timings) - 1))]
+        print(
+            f"{backend:<8} {total:>9.2f} {statistics.mean(timings) * 1000:>9.1f} "
+            f"{p95 * 1000:>9.1f} {len(timings) / total:>9.1f} {results[backend]['peak_mb']:>9.1f}"
+        )
+
+    reference = results[args.backends[0]]['reports']
+    mismatched = [b for b in args.backends[1:] if results[b]['reports'] != reference]
+    print()
+    if mismatched:
+        print(f"✗ Output differs from {args.backends[0]}: {', '.join(mismatched)}")
+        return 1
+
+    print("✓ All backends produced identical match reports")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
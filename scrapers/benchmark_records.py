@@ -0,0 +1,130 @@
+"""
+Memory benchmark: plain dicts vs slotted records for fixtures and shots
+
+Builds a synthetic league-wide, multi-season fixture and shot set (shaped
+like Understat's datesData / shotsData payloads) and measures the memory
+retained by each in-memory representation:
+
+- dicts:   what the scraper APIs return (build_understat_fixtures /
+           build_understat_match)
+- records: records.Fixture / records.Shot
+- columns: shot_batch.ShotBatch (shots only)
+
+    python benchmark_records.py
+    python benchmark_records.py --seasons 10 --shots-per-match 30
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from config import config
+from playwright_scraper import build_understat_fixtures, build_understat_match
+from records import Fixture
+from shot_batch import ShotBatch, SHOT_RESULTS, SHOT_SITUATIONS, SHOT_TYPES
+
+TEAMS = [f'Team {i:02d}' for i in range(20)]
+PLAYERS = [f'Player {i:03d}' for i in range(500)]
+
+
+def synthetic_league(seasons: int, shots_per_match: int, seed: int = 0) -> Tuple[List[Dict], List[Tuple]]:
+    """
+    Generate datesData entries and per-match shotsData payloads
+
+    Returns:
+        (dates_data, matches) where matches is a list of
+        (shots_data, match_url, home_team, away_team, match_date)
+    """
+    rng = random.Random(seed)
+    dates_data, matches = [], []
+    match_id = 10000
+
+    for season in range(2014, 2014 + seasons):
+        for home in TEAMS:
+            for away in TEAMS:
+                if home == away:
+                    continue
+                match_id += 1
+                kickoff = f'{season}-{rng.randint(8, 12):02d}-{rng.randint(1, 28):02d} 15:00:00'
+                dates_data.append({
+                    'id': str(match_id), 'isResult': True, 'datetime': kickoff,
+                    'h': {'id': '1', 'title': home, 'short_title': home[:3]},
+                    'a': {'id': '2', 'title': away, 'short_title': away[:3]},
+                })
+
+                shots = {'h': [], 'a': []}
+                for n in range(shots_per_match):
+                    side = 'h' if n % 2 == 0 else 'a'
+                    shots[side].append({
+                        'id': str(match_id * 100 + n), 'minute': str(rng.randint(1, 95)),
+                        'result': rng.choice(SHOT_RESULTS[:5]), 'X': f'{rng.random():.3f}',
+                        'Y': f'{rng.random():.3f}', 'xG': f'{rng.random() / 3:.6f}',
+                        'player': rng.choice(PLAYERS), 'player_id': str(rng.randint(1, 9999)),
+                        'situation': rng.choice(SHOT_SITUATIONS), 'shotType': rng.choice(SHOT_TYPES),
+                        'player_assisted': rng.choice(PLAYERS), 'lastAction': 'Pass',
+                    })
+                matches.append((
+                    shots, f'{config.UNDERSTAT_BASE_URL}/match/{match_id}', home, away, kickoff[:10]
+                ))
+
+    return dates_data, matches
+
+
+def measure(build: Callable[[], Any]) -> Tuple[float, float]:
+    """
+    Build a representation and report the memory it retains
+
+    Returns:
+        (retained MB, build seconds)
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained / 1024 / 1024, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=5, help='Seasons of a 20-team league')
+    parser.add_argument('--shots-per-match', type=int, default=26)
+    args = parser.parse_args()
+
+    dates_data, matches = synthetic_league(args.seasons, args.shots_per_match)
+    base_url = config.UNDERSTAT_BASE_URL
+    print(f"{len(dates_data)} fixtures, {len(dates_data) * args.shots_per_match} shots "
+          f"({args.seasons} seasons)")
+    print()
+
+    cases = [
+        ('fixtures', 'dicts', lambda: build_understat_fixtures(dates_data, base_url)),
+        ('fixtures', 'records', lambda: [Fixture.from_understat(m, base_url) for m in dates_data]),
+        ('shots', 'dicts', lambda: [build_understat_match(*m)['shots'] for m in matches]),
+        ('shots', 'records', lambda: [ShotBatch.from_payload(m[0], m[2], m[3]).to_records() for m in matches]),
+        ('shots', 'columns', lambda: [ShotBatch.from_payload(m[0], m[2], m[3]) for m in matches]),
+    ]
+
+    print(f"{'data':<9} {'form':<8} {'MB':>8} {'build s':>8}")
+    baseline = {}
+    for data, form, build in cases:
+        retained, elapsed = measure(build)
+        baseline.setdefault(data, retained)
+        line = f"{data:<9} {form:<8} {retained:>8.1f} {elapsed:>8.2f}"
+        if form != 'dicts':
+            line += f"   ({baseline[data] / retained:.1f}x smaller than dicts)"
+        print(line)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
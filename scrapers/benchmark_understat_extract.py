@@ -0,0 +1,171 @@
+"""
+Benchmark Understat payload extraction: BeautifulSoup + unicode_escape vs bytes scan
+
+Compares the original extraction path (parse the page with BeautifulSoup,
+regex each <script>, decode with .encode().decode('unicode_escape')) with
+understat_payload.extract_payloads, and counts the string values the old
+path mangles (non-ASCII player names decoded as Latin-1).
+
+Pages can be given as files (.html or .html.gz), taken from the on-disk
+HTTP response cache, or generated (a synthetic match page with accented
+player names is used when nothing else is given):
+
+    python benchmark_understat_extract.py pages/*.html
+    python benchmark_understat_extract.py --from-cache --repeat 20
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from config import config
+from http_cache import ResponseCache
+from understat_payload import UNDERSTAT_PAYLOADS, extract_payloads
+
+SYNTHETIC_PLAYERS = ('Martin Ødegaard', 'Gabriel Martinelli', 'Kai Havertz', 'Jurriën Timber', 'Ángel Di María')
+
+
+def _js_escape(payload: Any) -> str:
+    """Encode a payload the way Understat does: JSON with \\xNN-escaped punctuation"""
+    text = json.dumps(payload, ensure_ascii=False)
+    # \w also matches non-ASCII letters, which Understat leaves as raw UTF-8
+    return re.sub(r'[^\w\s.\-]', lambda m: f'\\x{ord(m.group(0)):02X}', text)
+
+
+def synthetic_page(shots_per_team: int = 15) -> bytes:
+    """Build a match page shaped like Understat's, with non-ASCII names"""
+    shots = {
+        side: [
+            {
+                'id': str(10000 + i), 'minute': str(i * 6), 'result': 'MissedShots',
+                'X': '0.885', 'Y': '0.5', 'xG': '0.0765', 'player': SYNTHETIC_PLAYERS[i % len(SYNTHETIC_PLAYERS)],
+                'h_a': side, 'player_id': str(5000 + i), 'situation': 'OpenPlay', 'season': '2025',
+                'shotType': 'LeftFoot', 'match_id': '26602', 'h_team': 'Arsenal', 'a_team': 'Chelsea',
+                'date': '2025-10-04 16:30:00', 'player_assisted': 'Bukayo Saka', 'lastAction': 'Pass'
+            }
+            for i in range(shots_per_team)
+        ]
+        for side in ('h', 'a')
+    }
+    match_info = {'id': '26602', 'team_h': 'Arsenal', 'team_a': 'Chelsea', 'date': '2025-10-04 16:30:00'}
+    filler = '<div class="block">' + '<span>menu</span>' * 2000 + '</div>'
+
+    return (
+        '<html><head><title>Arsenal - Chelsea</title></head><body>'
+        f'{filler}'
+        f"<script>var shotsData = JSON.parse('{_js_escape(shots)}');\n"
+        f"var match_info = JSON.parse('{_js_escape(match_info)}');</script>"
+        '</body></html>'
+    ).encode('utf-8')
+
+
+def extract_legacy(html: bytes) -> Dict[str, Any]:
+    """The original path: BeautifulSoup, per-script regex, unicode_escape"""
+    payloads = {}
+    soup = BeautifulSoup(html, 'lxml')
+    for script in soup.find_all('script'):
+        text = script.string
+        if not text:
+            continue
+        for name in UNDERSTAT_PAYLOADS:
+            if name in payloads or name not in text:
+                continue
+            match = re.search(rf"var {name}\s*=\s*JSON\.parse\('(.+?)'\)", text)
+            if match:
+                payloads[name] = json.loads(match.group(1).encode().decode('unicode_escape'))
+    return payloads
+
+
+def count_mismatches(old: Any, new: Any) -> int:
+    """Count leaf values that differ between two decoded payloads"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        return sum(count_mismatches(old.get(k), new.get(k)) for k in set(old) | set(new))
+    if isinstance(old, list) and isinstance(new, list):
+        return sum(count_mismatches(a, b) for a, b in zip(old, new)) + abs(len(old) - len(new))
+    return int(old != new)
+
+
+def load_pages(paths: List[str], from_cache: bool) -> List[Tuple[str, bytes]]:
+    """Load (name, html) pairs from files and/or the HTTP cache"""
+    pages = []
+
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+
+    if from_cache:
+        cache = ResponseCache(mode='replay')
+        for index_path in glob.glob(os.path.join(cache.cache_dir, 'index', '*', '*.json')):
+            with open(index_path) as f:
+                url = json.load(f)['url']
+            if config.understat_host in url:
+                pages.append((url, cache.load(cache.lookup(url))))
+
+    return pages
+
+
+def _time(extract, pages: List[Tuple[str, bytes]], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        for _, html in pages:
+            started = time.perf_counter()
+            extract(html)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*', help='Saved Understat pages (.html or .html.gz)')
+    parser.add_argument('--from-cache', action='store_true',
+                        help=f'Also use Understat pages from the HTTP cache ({config.HTTP_CACHE_DIR})')
+    parser.add_argument('--repeat', type=int, default=10, help='Extract every page this many times')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.from_cache) or [('synthetic', synthetic_page())]
+
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"Benchmarking {len(pages)} pages ({total_kb:.0f} KB) x {args.repeat}")
+    print()
+
+    results = {
+        'legacy': _time(extract_legacy, pages, args.repeat),
+        'bytes': _time(extract_payloads, pages, args.repeat),
+    }
+
+    print(f"{'path':<8} {'total s':>9} {'mean ms':>9} {'p95 ms':>9}")
+    for path, timings in results.items():
+        p95 = sorted(timings)[int(0.95 * (len(timings) - 1))]
+        print(f"{path:<8} {sum(timings):>9.3f} {statistics.mean(timings) * 1000:>9.2f} {p95 * 1000:>9.2f}")
+
+    speedup = sum(results['legacy']) / sum(results['bytes'])
+    print()
+    print(f"Speedup: {speedup:.1f}x")
+
+    mangled = 0
+    for name, html in pages:
+        try:
+            mangled += count_mismatches(extract_legacy(html), extract_payloads(html))
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"✗ Legacy path failed on {name}: {e}")
+            mangled += 1
+
+    if mangled:
+        print(f"Legacy path mangled {mangled} values (e.g. non-ASCII player names)")
+    else:
+        print("✓ Both paths produced identical payloads")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
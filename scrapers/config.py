@@ -4,6 +4,7 @@ Configuration for web scrapers
 
 import os
 from dataclasses import dataclass
+from urllib.parse import urlparse
 
 @dataclass
 class ScraperConfig:
@@ -12,6 +13,23 @@ class ScraperConfig:
     # Rate limiting (seconds between requests)
     FBREF_REQUEST_DELAY: float = 3.0  # FBref rate limit: 3 seconds minimum
     UNDERSTAT_REQUEST_DELAY: float = 2.0  # Understat: 2 seconds
+    RATE_LIMIT_BURST: float = 1.0  # Token-bucket capacity per host
+    RATE_LIMIT_STATE_DIR: str = os.getenv(
+        "SCRAPER_RATE_LIMIT_DIR", "/tmp/arsenalfc_scrapers/rate_limits"
+    )  # Shared by all scraper processes on this machine
+
+    # Adaptive pacing (AIMD) - the delays above are the starting pace
+    FBREF_MIN_REQUEST_DELAY: float = 3.0  # Never faster than FBref's documented limit
+    UNDERSTAT_MIN_REQUEST_DELAY: float = 1.0
+    PACING_MAX_DELAY: float = 120.0  # Slowest pace backoff can reach
+    PACING_INCREASE_STEP: float = 0.02  # Requests/second added per healthy response
+    PACING_DECREASE_FACTOR: float = 0.5  # Rate multiplier on 429/503 or a latency spike
+    PACING_LATENCY_RATIO: float = 2.0  # Latency above this multiple of its average is a spike
+    PACING_STATE_TTL_MINUTES: float = 30.0  # An adapted pace not updated for this long reverts to the configured delay
+
+    # Concurrency (max in-flight pages per host for the async scraper)
+    FBREF_MAX_CONCURRENCY: int = 1
+    UNDERSTAT_MAX_CONCURRENCY: int = 4
 
     # Retry configuration
     MAX_RETRIES: int = 3
@@ -20,6 +38,19 @@ class ScraperConfig:
     # Timeouts (seconds)
     REQUEST_TIMEOUT: int = 30
 
+    # HTTP response cache ('off', 'revalidate' or 'replay' - see http_cache.py)
+    HTTP_CACHE_MODE: str = os.getenv("SCRAPER_HTTP_CACHE_MODE", "revalidate")
+    HTTP_CACHE_DIR: str = os.getenv(
+        "SCRAPER_HTTP_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "arsenalfc_scrapers", "http")
+    )
+    HTTP_CACHE_MAX_VERSIONS: int = 3  # Distinct versions kept per URL
+    HTTP_CACHE_SWEEP_HOURS: float = 24.0  # Delete unreferenced blobs at most this often
+
+    # Playwright browser pool
+    PLAYWRIGHT_MAX_NAVIGATIONS_PER_PAGE: int = 25  # Recycle pooled page to cap renderer memory
+    PLAYWRIGHT_READY_TIMEOUT_MS: int = 15000  # Max wait for page data globals after DOM load
+
     # User agent
     USER_AGENT: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -30,10 +61,18 @@ class ScraperConfig:
     # FBref specific
     FBREF_BASE_URL: str = "https://fbref.com"
     ARSENAL_FBREF_ID: str = "18bb7c10"  # Arsenal's FBref squad ID
+    FBREF_PARSER_BACKEND: str = os.getenv("SCRAPER_PARSER_BACKEND", "lxml")  # 'lxml' or 'bs4' (see html_parsers.py)
 
     # Understat specific
     UNDERSTAT_BASE_URL: str = "https://understat.com"
     ARSENAL_UNDERSTAT_NAME: str = "Arsenal"
+    TIERED_HTTP_REPROBE_INTERVAL: int = 20  # Retry plain HTTP after N browser-served pages of a URL pattern
+
+    # Fixture-list cache in bronze.match_reference (see fixture_cache.py)
+    FIXTURE_CACHE_TTL_HOURS: float = 12.0  # Normal freshness of a cached fixture list
+    FIXTURE_CACHE_MATCHDAY_TTL_MINUTES: float = 30.0  # Freshness while a match is near kickoff
+    FIXTURE_CACHE_PRE_KICKOFF_HOURS: float = 2.0  # Matchday window opens this long before kickoff
+    FIXTURE_CACHE_POST_KICKOFF_HOURS: float = 12.0  # ...and closes this long after, if no result yet
 
     # Database connection (from environment)
     DB_HOST: str = os.getenv("POSTGRES_HOST", "postgres")
@@ -42,6 +81,41 @@ class ScraperConfig:
     DB_USER: str = os.getenv("ANALYTICS_DB_USER", "analytics_user")
     DB_PASSWORD: str = os.getenv("ANALYTICS_DB_PASSWORD", "analytics_pass")
 
+    # Connection pool shared by every DatabaseLoader in a process (see db_pool.py)
+    DB_POOL_MAX_CONNECTIONS: int = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "5"))
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_HEALTH_CHECK_SECONDS: float = 30.0  # Ping connections idle longer than this on checkout
+    DB_BULK_PAGE_SIZE: int = 500  # Rows per multi-row INSERT in bulk saves (execute_values)
+    DB_COPY_CHUNK_ROWS: int = 5000  # Rows buffered per COPY into the bulk staging table
+
+    # Write-behind queue between scrape loops and the database (see write_behind.py)
+    WRITE_BEHIND_QUEUE_SIZE: int = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "200"))  # Pending writes before submitters block
+    WRITE_BEHIND_BATCH_SIZE: int = 50  # Writes per flushed batch
+    WRITE_BEHIND_FLUSH_SECONDS: float = 5.0  # Flush a partial batch after this long
+
+    # Local spool for bronze writes ('off', 'on_failure' or 'always' - see write_spool.py)
+    SPOOL_MODE: str = os.getenv("SCRAPER_SPOOL_MODE", "on_failure")
+    SPOOL_DIR: str = os.getenv(
+        "SCRAPER_SPOOL_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "arsenalfc_scrapers", "spool")
+    )
+
+    # Scrape planner (see scrape_planner.py)
+    SCRAPE_REVISION_DAYS: int = 7  # Understat may still revise xG this long after kickoff
+    SCRAPE_REFRESH_HOURS: float = 24.0  # Re-scrape a revisable match at most this often
+    SCRAPE_RETRY_BASE_MINUTES: float = 30.0  # First retry delay; doubles per consecutive failure
+    SCRAPE_MAX_RETRIES: int = 5  # Consecutive failures before a match is left alone
+
+    @property
+    def fbref_host(self) -> str:
+        """FBref host name (key for the shared rate limiter)"""
+        return urlparse(self.FBREF_BASE_URL).netloc
+
+    @property
+    def understat_host(self) -> str:
+        """Understat host name (key for the shared rate limiter)"""
+        return urlparse(self.UNDERSTAT_BASE_URL).netloc
+
     @property
     def db_connection_string(self) -> str:
         """Get PostgreSQL connection string"""
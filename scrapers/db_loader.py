@@ -2,48 +2,161 @@
 Database Loader - Persist scraped data to PostgreSQL Bronze layer
 """
 
+import hashlib
+import io
 import logging
 import json
-from typing import Dict, List, Any, Optional
+import os
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from datetime import datetime
 import psycopg2
 from psycopg2.extras import Json, execute_values
+from psycopg2.pool import PoolError
 from contextlib import contextmanager
 
 from config import config
+from db_pool import get_pool, close_pool
+from fixture_cache import fixture_hash, parse_kickoff
+from write_spool import WriteSpool, SPOOL_MODES, SPOOL_OFF, SPOOL_ALWAYS
 
 logger = logging.getLogger(__name__)
 
+# Bronze payload table and JSON column written per scrape type by record_match_scrape
+MATCH_PAYLOAD_TABLES = {
+    'understat': ('bronze.understat_raw', 'raw_shots'),
+    'fbref': ('bronze.fbref_raw', 'raw_data'),
+}
+
+# Bulk-loadable bronze tables: (table, JSON payload column, conflict key)
+BULK_TABLES = {
+    'understat_raw': ('bronze.understat_raw', 'raw_shots', ('match_id',)),
+    'fbref_raw': ('bronze.fbref_raw', 'raw_data', ('match_id',)),
+    'fbref_lineups': ('bronze.fbref_lineups', 'raw_lineups', ('match_url',)),
+}
+BULK_METHODS = ('values', 'copy')
+
+# Bulk tables keeping one current row per match, with superseded payloads
+# moved to a history table: BULK_TABLES key -> history table
+HISTORY_TABLES = {
+    'fbref_lineups': 'bronze.fbref_lineups_history',
+}
+
+# Write target for record_match_scrape(s) in the write-behind queue and spool
+MATCH_SCRAPE = 'match_scrape'
+
+# Failures that mean the database is unreachable rather than the write bad;
+# only these are spooled in 'on_failure' mode
+SPOOLABLE_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, PoolError)
+
+# Top-level payload keys that change on every scrape even when the data does not
+VOLATILE_PAYLOAD_KEYS = ('scraped_at',)
+
+# Escapes for COPY ... FROM STDIN text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_field(value: Any) -> str:
+    """Render one value as a COPY text-format field"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """
+    Return a sha256 of a payload's canonical JSON
+
+    Keys are sorted and VOLATILE_PAYLOAD_KEYS dropped, so re-scraping
+    identical data gives the same hash. Stored in each bronze row's
+    content_hash; upserts skip the rewrite when it is unchanged.
+    """
+    canonical = {key: value for key, value in payload.items() if key not in VOLATILE_PAYLOAD_KEYS}
+    return hashlib.sha256(
+        json.dumps(canonical, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+    ).hexdigest()
+
 
 class DatabaseLoader:
     """Handle loading scraped data into PostgreSQL"""
 
-    def __init__(self, connection_string: Optional[str] = None):
+    def __init__(self, connection_string: Optional[str] = None, spool_mode: Optional[str] = None):
         """
         Initialize database loader
 
         Args:
             connection_string: PostgreSQL connection string
                              (defaults to config value)
+            spool_mode: 'off', 'on_failure' or 'always' (defaults to
+                        config.SPOOL_MODE - see write_spool.py)
         """
         self.connection_string = connection_string or config.db_connection_string
+        self.spool_mode = spool_mode or config.SPOOL_MODE
+
+        if self.spool_mode not in SPOOL_MODES:
+            raise ValueError(f"Unknown spool mode: {self.spool_mode}")
+
+        self.spool = WriteSpool() if self.spool_mode != SPOOL_OFF else None
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
+        """
+        Context manager for one transaction on a pooled connection
+
+        Connections come from the process-wide pool for this connection
+        string (see db_pool.py), so consecutive calls reuse an open
+        connection instead of reconnecting. Commits on success, rolls back
+        on error.
+        """
         try:
-            conn = psycopg2.connect(self.connection_string)
-            yield conn
-            conn.commit()
+            with get_pool(self.connection_string).connection() as conn:
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    if not conn.closed:
+                        conn.rollback()
+                    raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             logger.error(f"Database error: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
+
+    def close(self) -> None:
+        """Close this connection string's pooled connections (also done at exit)"""
+        close_pool(self.connection_string)
+
+    def _spool_writes(self, target: str, items: List[Dict[str, Any]], error: Optional[Exception] = None) -> bool:
+        """
+        Append writes to the local spool instead of the database
+
+        Args:
+            target: MATCH_SCRAPE or a BULK_TABLES key
+            items: Write fields (see write_spool.WriteSpool.append)
+            error: The database error, if the write was attempted; only
+                   SPOOLABLE_ERRORS are spooled
+
+        Returns:
+            True if the writes are safely spooled
+        """
+        if self.spool is None or (error is not None and not isinstance(error, SPOOLABLE_ERRORS)):
+            return False
+
+        now = datetime.utcnow()
+        try:
+            for item in items:
+                self.spool.append(target, {**item, 'scraped_at': item.get('scraped_at') or now})
+        except OSError as e:
+            logger.error(f"Failed to spool {target} writes: {e}")
+            return False
+
+        reason = f" (database unavailable: {error})" if error else ""
+        logger.warning(f"Spooled {len(items)} {target} writes to {self.spool.journal_path}{reason}")
+        return True
+
+    def _defer(self, target: str, items: List[Dict[str, Any]]) -> bool:
+        """Spool writes without touching the database in 'always' mode"""
+        return self.spool_mode == SPOOL_ALWAYS and self._spool_writes(target, items)
 
     def save_fbref_raw(
         self,
@@ -55,6 +168,9 @@ class DatabaseLoader:
         """
         Save FBref raw data to bronze layer
 
+        An existing row is only rewritten when the payload's content hash
+        changed and the stored row was not scraped later.
+
         Args:
             match_id: Unique match identifier
             raw_data: Raw scraped data dictionary
@@ -62,22 +178,31 @@ class DatabaseLoader:
             scrape_run_id: ID of scrape run for tracking
 
         Returns:
-            True if successful
+            True if successful (or spooled - see write_spool.py)
         """
+        now = datetime.utcnow()
+        spooled = {'match_id': match_id, 'match_url': match_url, 'payload': raw_data,
+                   'scrape_run_id': scrape_run_id, 'scraped_at': now}
+        if self._defer('fbref_raw', [spooled]):
+            return True
+
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
                     query = """
                         INSERT INTO bronze.fbref_raw
-                            (match_id, match_url, raw_data, scrape_run_id, scraped_at, updated_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
+                            (match_id, match_url, raw_data, content_hash, scrape_run_id, scraped_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
                         ON CONFLICT (match_id)
                         DO UPDATE SET
                             raw_data = EXCLUDED.raw_data,
+                            content_hash = EXCLUDED.content_hash,
                             match_url = EXCLUDED.match_url,
                             scrape_run_id = EXCLUDED.scrape_run_id,
                             scraped_at = EXCLUDED.scraped_at,
                             updated_at = CURRENT_TIMESTAMP
+                        WHERE bronze.fbref_raw.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                            AND EXCLUDED.scraped_at >= bronze.fbref_raw.scraped_at
                         RETURNING id
                     """
 
@@ -85,19 +210,23 @@ class DatabaseLoader:
                         match_id,
                         match_url,
                         Json(raw_data),
+                        content_hash(raw_data),
                         scrape_run_id,
-                        datetime.utcnow(),
-                        datetime.utcnow()
+                        now,
+                        now
                     ))
 
                     result = cur.fetchone()
-                    logger.info(f"Saved FBref data for match {match_id} (ID: {result[0]})")
+                    if result:
+                        logger.info(f"Saved FBref data for match {match_id} (ID: {result[0]})")
+                    else:
+                        logger.info(f"FBref data for match {match_id} unchanged or superseded, not rewritten")
 
             return True
 
         except Exception as e:
             logger.error(f"Failed to save FBref data: {e}")
-            return False
+            return self._spool_writes('fbref_raw', [spooled], e)
 
     def save_understat_raw(
         self,
@@ -109,6 +238,9 @@ class DatabaseLoader:
         """
         Save Understat raw shot data to bronze layer
 
+        An existing row is only rewritten when the payload's content hash
+        changed and the stored row was not scraped later.
+
         Args:
             match_id: Unique match identifier
             raw_shots: Raw shot data dictionary
@@ -116,21 +248,30 @@ class DatabaseLoader:
             scrape_run_id: ID of scrape run for tracking
 
         Returns:
-            True if successful
+            True if successful (or spooled - see write_spool.py)
         """
+        now = datetime.utcnow()
+        spooled = {'match_id': match_id, 'match_url': match_url, 'payload': raw_shots,
+                   'scrape_run_id': scrape_run_id, 'scraped_at': now}
+        if self._defer('understat_raw', [spooled]):
+            return True
+
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
                     query = """
                         INSERT INTO bronze.understat_raw
-                            (match_id, match_url, raw_shots, scrape_run_id, scraped_at)
-                        VALUES (%s, %s, %s, %s, %s)
+                            (match_id, match_url, raw_shots, content_hash, scrape_run_id, scraped_at)
+                        VALUES (%s, %s, %s, %s, %s, %s)
                         ON CONFLICT (match_id)
                         DO UPDATE SET
                             raw_shots = EXCLUDED.raw_shots,
+                            content_hash = EXCLUDED.content_hash,
                             match_url = EXCLUDED.match_url,
                             scraped_at = EXCLUDED.scraped_at,
                             updated_at = CURRENT_TIMESTAMP
+                        WHERE bronze.understat_raw.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                            AND EXCLUDED.scraped_at >= bronze.understat_raw.scraped_at
                         RETURNING id
                     """
 
@@ -138,18 +279,22 @@ class DatabaseLoader:
                         match_id,
                         match_url,
                         Json(raw_shots),
+                        content_hash(raw_shots),
                         scrape_run_id,
-                        datetime.utcnow()
+                        now
                     ))
 
                     result = cur.fetchone()
-                    logger.info(f"Saved Understat data for match {match_id} (ID: {result[0]})")
+                    if result:
+                        logger.info(f"Saved Understat data for match {match_id} (ID: {result[0]})")
+                    else:
+                        logger.info(f"Understat data for match {match_id} unchanged or superseded, not rewritten")
 
             return True
 
         except Exception as e:
             logger.error(f"Failed to save Understat data: {e}")
-            return False
+            return self._spool_writes('understat_raw', [spooled], e)
 
     def create_scrape_run(
         self,
@@ -242,10 +387,310 @@ class DatabaseLoader:
             logger.error(f"Failed to update scrape run: {e}")
             return False
 
+    def record_match_scrape(
+        self,
+        run_id: str,
+        match_id: str,
+        scrape_type: str,
+        payload: Dict[str, Any],
+        match_url: str,
+        records_scraped: Optional[int] = None,
+        dag_run_id: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        status: str = 'success'
+    ) -> bool:
+        """
+        Record a scraped match: ledger row and bronze payload in one statement
+
+        Replaces create_scrape_run + save_*_raw + update_scrape_run. The
+        scrape_runs row is written with its final status together with the
+        payload upsert, in a single round trip and transaction, so a crash
+        can no longer leave a 'running' row without data (or data without
+        its run). The payload row is left untouched when its content hash
+        is unchanged or it was scraped later; the run is still recorded.
+
+        Args:
+            run_id: Unique run ID
+            match_id: Unique match identifier
+            scrape_type: 'understat' or 'fbref' (see MATCH_PAYLOAD_TABLES)
+            payload: Raw scraped data dictionary
+            match_url: URL of the scraped page
+            records_scraped: Number of records scraped (e.g. shots)
+            dag_run_id: Airflow DAG run ID
+            started_at: When scraping started (defaults to now)
+            status: Final run status ('success' or 'partial')
+
+        Returns:
+            True if both rows were written (or spooled - see write_spool.py)
+        """
+        if scrape_type not in MATCH_PAYLOAD_TABLES:
+            raise ValueError(f"Unknown scrape type: {scrape_type} (expected one of {sorted(MATCH_PAYLOAD_TABLES)})")
+
+        table, column = MATCH_PAYLOAD_TABLES[scrape_type]
+        now = datetime.utcnow()
+        spooled = {
+            'run_id': run_id, 'match_id': match_id, 'scrape_type': scrape_type, 'payload': payload,
+            'match_url': match_url, 'records_scraped': records_scraped, 'dag_run_id': dag_run_id,
+            'started_at': started_at or now, 'status': status, 'scraped_at': now,
+        }
+        if self._defer(MATCH_SCRAPE, [spooled]):
+            return True
+
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(f"""
+                        WITH run AS (
+                            INSERT INTO bronze.scrape_runs
+                                (run_id, dag_run_id, match_id, scrape_type, status,
+                                 records_scraped, started_at, completed_at)
+                            VALUES (%(run_id)s, %(dag_run_id)s, %(match_id)s, %(scrape_type)s, %(status)s,
+                                    %(records_scraped)s, %(started_at)s, %(now)s)
+                            ON CONFLICT (run_id) DO UPDATE SET
+                                status = EXCLUDED.status,
+                                records_scraped = EXCLUDED.records_scraped,
+                                error_message = NULL,
+                                completed_at = EXCLUDED.completed_at
+                            RETURNING run_id
+                        )
+                        INSERT INTO {table}
+                            (match_id, match_url, {column}, content_hash, scrape_run_id, scraped_at, updated_at)
+                        SELECT %(match_id)s, %(match_url)s, %(payload)s, %(content_hash)s, run.run_id, %(now)s, %(now)s
+                        FROM run
+                        ON CONFLICT (match_id) DO UPDATE SET
+                            {column} = EXCLUDED.{column},
+                            content_hash = EXCLUDED.content_hash,
+                            match_url = EXCLUDED.match_url,
+                            scrape_run_id = EXCLUDED.scrape_run_id,
+                            scraped_at = EXCLUDED.scraped_at,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                            AND EXCLUDED.scraped_at >= {table}.scraped_at
+                        RETURNING id
+                    """, {
+                        'run_id': run_id,
+                        'dag_run_id': dag_run_id,
+                        'match_id': match_id,
+                        'scrape_type': scrape_type,
+                        'status': status,
+                        'records_scraped': records_scraped,
+                        'started_at': started_at or now,
+                        'now': now,
+                        'match_url': match_url,
+                        'payload': Json(payload),
+                        'content_hash': content_hash(payload),
+                    })
+
+                    result = cur.fetchone()
+                    if result:
+                        logger.info(f"Recorded {scrape_type} scrape {run_id} for match {match_id} (ID: {result[0]})")
+                    else:
+                        logger.info(f"Recorded {scrape_type} scrape {run_id} for match {match_id} (payload unchanged or superseded)")
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to record {scrape_type} scrape for match {match_id}: {e}")
+            return self._spool_writes(MATCH_SCRAPE, [spooled], e)
+
+    def record_match_scrapes(self, scrapes: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Record many scraped matches in one transaction
+
+        Batched form of record_match_scrape used by the write-behind queue:
+        the scrape_runs rows go in with one multi-row upsert and the payloads
+        with one bulk upsert per bronze table, so either every match in the
+        batch is recorded or none is.
+
+        Args:
+            scrapes: Dicts of record_match_scrape keyword arguments
+
+        Returns:
+            True if every row was written (or spooled - see write_spool.py)
+        """
+        scrapes = list(scrapes)
+        if not scrapes or self._defer(MATCH_SCRAPE, scrapes):
+            return True
+
+        now = datetime.utcnow()
+        runs = {}
+        payloads = {}
+
+        for scrape in scrapes:
+            scrape_type = scrape['scrape_type']
+            if scrape_type not in MATCH_PAYLOAD_TABLES:
+                raise ValueError(f"Unknown scrape type: {scrape_type} (expected one of {sorted(MATCH_PAYLOAD_TABLES)})")
+
+            runs[scrape['run_id']] = (
+                scrape['run_id'], scrape.get('dag_run_id'), scrape['match_id'], scrape_type,
+                scrape.get('status', 'success'), scrape.get('records_scraped'),
+                scrape.get('started_at') or now, now
+            )
+            # BULK_TABLES key of the scrape type's payload table
+            payloads.setdefault(f'{scrape_type}_raw', []).append({
+                'match_id': scrape['match_id'],
+                'match_url': scrape['match_url'],
+                'payload': scrape['payload'],
+                'scrape_run_id': scrape['run_id'],
+                'scraped_at': scrape.get('scraped_at'),
+            })
+
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, """
+                        INSERT INTO bronze.scrape_runs
+                            (run_id, dag_run_id, match_id, scrape_type, status,
+                             records_scraped, started_at, completed_at)
+                        VALUES %s
+                        ON CONFLICT (run_id) DO UPDATE SET
+                            status = EXCLUDED.status,
+                            records_scraped = EXCLUDED.records_scraped,
+                            error_message = NULL,
+                            completed_at = EXCLUDED.completed_at
+                    """, list(runs.values()), page_size=config.DB_BULK_PAGE_SIZE)
+
+                    for table_key, items in payloads.items():
+                        self._bulk_upsert(cur, table_key, items)
+
+            logger.info(f"Recorded {len(runs)} match scrapes")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to record {len(scrapes)} match scrapes: {e}")
+            return self._spool_writes(MATCH_SCRAPE, scrapes, e)
+
+    def record_scrape_failure(
+        self,
+        run_id: str,
+        match_id: str,
+        scrape_type: str,
+        error_message: str,
+        dag_run_id: Optional[str] = None,
+        started_at: Optional[datetime] = None
+    ) -> bool:
+        """
+        Record a failed match scrape in the scrape_runs ledger
+
+        The scrape planner backs off on matches with recent failures
+        (see scrape_planner.py).
+
+        Args:
+            run_id: Unique run ID
+            match_id: Match that failed (see scrape_planner.fixture_match_id)
+            scrape_type: Type of scrape
+            error_message: Why the scrape failed
+            dag_run_id: Airflow DAG run ID
+            started_at: When scraping started (defaults to now)
+
+        Returns:
+            True if successful
+        """
+        now = datetime.utcnow()
+
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        INSERT INTO bronze.scrape_runs
+                            (run_id, dag_run_id, match_id, scrape_type, status,
+                             error_message, started_at, completed_at)
+                        VALUES (%s, %s, %s, %s, 'failed', %s, %s, %s)
+                        ON CONFLICT (run_id) DO UPDATE SET
+                            status = EXCLUDED.status,
+                            error_message = EXCLUDED.error_message,
+                            completed_at = EXCLUDED.completed_at
+                    """, (run_id, dag_run_id, match_id, scrape_type, error_message[:1000], started_at or now, now))
+
+            logger.info(f"Recorded failed {scrape_type} scrape {run_id} for match {match_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to record scrape failure: {e}")
+            return False
+
+    def get_scrape_ledger(
+        self,
+        matches: List[Tuple[str, str]],
+        scrape_type: str = 'understat'
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Read scrape history for many matches in one query
+
+        For each match: when its bronze payload was written, its latest
+        successful run, and the failed runs since then. Every lookup is an
+        index probe (scrape_runs ledger index, bronze match_url index).
+
+        Args:
+            matches: (match_id, match_url) pairs
+            scrape_type: 'understat' or 'fbref' (see MATCH_PAYLOAD_TABLES)
+
+        Returns:
+            {match_id: {'payload_scraped_at', 'last_success', 'failures',
+            'last_failure'}}
+
+        Raises:
+            psycopg2.Error: If the ledger cannot be read
+        """
+        if scrape_type not in MATCH_PAYLOAD_TABLES:
+            raise ValueError(f"Unknown scrape type: {scrape_type} (expected one of {sorted(MATCH_PAYLOAD_TABLES)})")
+
+        matches = dict(matches)
+        if not matches:
+            return {}
+
+        table = MATCH_PAYLOAD_TABLES[scrape_type][0]
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    SELECT
+                        f.match_id,
+                        (SELECT max(p.scraped_at) FROM {table} p WHERE p.match_url = f.match_url),
+                        ok.completed_at,
+                        failed.failures,
+                        failed.last_failure
+                    FROM unnest(%(match_ids)s::text[], %(match_urls)s::text[]) AS f(match_id, match_url)
+                    LEFT JOIN LATERAL (
+                        SELECT r.completed_at
+                        FROM bronze.scrape_runs r
+                        WHERE r.match_id = f.match_id
+                          AND r.scrape_type = %(scrape_type)s
+                          AND r.status = 'success'
+                          AND r.completed_at IS NOT NULL
+                        ORDER BY r.completed_at DESC
+                        LIMIT 1
+                    ) ok ON TRUE
+                    CROSS JOIN LATERAL (
+                        SELECT count(*) AS failures, max(r.completed_at) AS last_failure
+                        FROM bronze.scrape_runs r
+                        WHERE r.match_id = f.match_id
+                          AND r.scrape_type = %(scrape_type)s
+                          AND r.status = 'failed'
+                          AND r.completed_at > COALESCE(ok.completed_at, '-infinity')
+                    ) failed
+                """, {
+                    'match_ids': list(matches),
+                    'match_urls': list(matches.values()),
+                    'scrape_type': scrape_type,
+                })
+
+                return {
+                    row[0]: {
+                        'payload_scraped_at': row[1],
+                        'last_success': row[2],
+                        'failures': row[3],
+                        'last_failure': row[4],
+                    }
+                    for row in cur.fetchall()
+                }
+
     def get_latest_scrape_for_match(self, match_id: str, scrape_type: str) -> Optional[Dict]:
         """
         Get latest successful scrape for a match
 
+        Served from the (match_id, scrape_type, status, completed_at) index.
+
         Args:
             match_id: Match ID
             scrape_type: Type of scrape
@@ -257,11 +702,12 @@ class DatabaseLoader:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
                     query = """
-                        SELECT run_id, status, scraped_at, records_scraped
+                        SELECT run_id, status, completed_at, records_scraped
                         FROM bronze.scrape_runs
                         WHERE match_id = %s
                           AND scrape_type = %s
                           AND status = 'success'
+                          AND completed_at IS NOT NULL
                         ORDER BY completed_at DESC
                         LIMIT 1
                     """
@@ -273,7 +719,7 @@ class DatabaseLoader:
                         return {
                             'run_id': row[0],
                             'status': row[1],
-                            'scraped_at': row[2],
+                            'completed_at': row[2],
                             'records_scraped': row[3]
                         }
 
@@ -304,6 +750,62 @@ class DatabaseLoader:
             logger.error(f"Failed to check match existence: {e}")
             return False
 
+    def diff_fixtures(
+        self,
+        fixtures: List[Dict[str, Any]],
+        scrape_type: str = 'understat'
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the fixtures whose bronze payload is missing or stale
+
+        All candidate match URLs (and kickoff times) go to Postgres as array
+        parameters and are checked in one indexed anti-join, instead of
+        pulling every stored URL into Python or querying per fixture.
+
+        A payload counts as stale when it was scraped before the fixture's
+        kickoff (e.g. a pre-match page); once re-scraped after the match
+        its scraped_at moves past kickoff.
+
+        Args:
+            fixtures: Fixture dictionaries with 'match_url' (and optionally
+                      'kickoff_at' / 'match_date')
+            scrape_type: 'understat' or 'fbref' (see MATCH_PAYLOAD_TABLES)
+
+        Returns:
+            The missing or stale fixtures, in their original order
+
+        Raises:
+            psycopg2.Error: If the lookup fails (the caller cannot tell what
+                            is missing)
+        """
+        if scrape_type not in MATCH_PAYLOAD_TABLES:
+            raise ValueError(f"Unknown scrape type: {scrape_type} (expected one of {sorted(MATCH_PAYLOAD_TABLES)})")
+
+        if not fixtures:
+            return []
+
+        table = MATCH_PAYLOAD_TABLES[scrape_type][0]
+        kickoffs = {}
+        for fixture in fixtures:
+            kickoffs.setdefault(fixture['match_url'], parse_kickoff(fixture))
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    SELECT f.match_url
+                    FROM unnest(%s::text[], %s::timestamp[]) AS f(match_url, kickoff_at)
+                    WHERE NOT EXISTS (
+                        SELECT 1
+                        FROM {table} r
+                        WHERE r.match_url = f.match_url
+                          AND (f.kickoff_at IS NULL OR r.scraped_at >= f.kickoff_at)
+                    )
+                """, (list(kickoffs), list(kickoffs.values())))
+                pending = {row[0] for row in cur.fetchall()}
+
+        logger.info(f"{len(pending)} of {len(kickoffs)} fixtures missing or stale in {table}")
+        return [fixture for fixture in fixtures if fixture['match_url'] in pending]
+
     def save_fbref_lineups(
         self,
         match_url: str,
@@ -314,6 +816,10 @@ class DatabaseLoader:
         """
         Save FBref lineup data to bronze layer
 
+        Each match has one current lineup row. A changed payload replaces it
+        and the previous version moves to bronze.fbref_lineups_history in
+        the same transaction; an unchanged one leaves both untouched.
+
         Args:
             match_url: FBref match report URL
             lineup_data: Lineup data dictionary with home_lineup and away_lineup
@@ -321,21 +827,34 @@ class DatabaseLoader:
             scrape_run_id: ID of scrape run for tracking
 
         Returns:
-            True if successful
+            True if successful (or spooled - see write_spool.py)
         """
+        now = datetime.utcnow()
+        spooled = {'match_id': match_id, 'match_url': match_url, 'payload': lineup_data,
+                   'scrape_run_id': scrape_run_id, 'scraped_at': now}
+        if self._defer('fbref_lineups', [spooled]):
+            return True
+
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
+                    lineup_hash = content_hash(lineup_data)
+                    self._archive_superseded(cur, 'fbref_lineups', [(match_url, lineup_hash, now)])
+
                     query = """
                         INSERT INTO bronze.fbref_lineups
-                            (match_id, match_url, raw_lineups, scrape_run_id, scraped_at, updated_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (match_url, scraped_at)
+                            (match_id, match_url, raw_lineups, content_hash, scrape_run_id, scraped_at, updated_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (match_url)
                         DO UPDATE SET
                             raw_lineups = EXCLUDED.raw_lineups,
+                            content_hash = EXCLUDED.content_hash,
                             match_id = EXCLUDED.match_id,
                             scrape_run_id = EXCLUDED.scrape_run_id,
+                            scraped_at = EXCLUDED.scraped_at,
                             updated_at = CURRENT_TIMESTAMP
+                        WHERE bronze.fbref_lineups.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                            AND EXCLUDED.scraped_at >= bronze.fbref_lineups.scraped_at
                         RETURNING id
                     """
 
@@ -343,16 +862,397 @@ class DatabaseLoader:
                         match_id,
                         match_url,
                         Json(lineup_data),
+                        lineup_hash,
                         scrape_run_id,
-                        datetime.utcnow(),
-                        datetime.utcnow()
+                        now,
+                        now
                     ))
 
                     result = cur.fetchone()
-                    logger.info(f"Saved FBref lineups (ID: {result[0]})")
+                    if result:
+                        logger.info(f"Saved FBref lineups (ID: {result[0]})")
+                    else:
+                        logger.info(f"FBref lineups for {match_url} unchanged or superseded, not rewritten")
 
             return True
 
         except Exception as e:
             logger.error(f"Failed to save FBref lineups: {e}")
+            return self._spool_writes('fbref_lineups', [spooled], e)
+
+    def bulk_save(
+        self,
+        table_key: str,
+        payloads: Iterable[Dict[str, Any]],
+        method: str = 'values'
+    ) -> bool:
+        """
+        Upsert many payloads into a bronze table in one transaction
+
+        Methods:
+        - 'values': multi-row INSERT ... ON CONFLICT via execute_values,
+                    config.DB_BULK_PAGE_SIZE rows per statement
+        - 'copy':   COPY into a temporary staging table, then one set-based
+                    INSERT ... SELECT ... ON CONFLICT; fastest for backfills
+
+        Payloads repeating a conflict key keep the last one; existing rows
+        whose content hash is unchanged, or that were scraped after the
+        incoming payload (e.g. a replayed spool journal), are not rewritten.
+        For HISTORY_TABLES, rows that are rewritten are first copied to the
+        history table.
+
+        Args:
+            table_key: 'understat_raw', 'fbref_raw' or 'fbref_lineups'
+            payloads: Dicts with 'match_id', 'match_url', 'payload' and
+                      optionally 'scrape_run_id' and 'scraped_at'
+            method: 'values' or 'copy'
+
+        Returns:
+            True if successful (or spooled - see write_spool.py)
+        """
+        if table_key not in BULK_TABLES:
+            raise ValueError(f"Unknown bulk table: {table_key} (expected one of {sorted(BULK_TABLES)})")
+        if method not in BULK_METHODS:
+            raise ValueError(f"Unknown bulk method: {method} (expected one of {BULK_METHODS})")
+
+        table = BULK_TABLES[table_key][0]
+        payloads = list(payloads)
+        if self._defer(table_key, payloads):
+            return True
+
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    written = self._bulk_upsert(cur, table_key, payloads, method)
+
+            if written is not None:
+                logger.info(f"Bulk saved {written} changed rows into {table} ({method})")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to bulk save into {table}: {e}")
+            return self._spool_writes(table_key, payloads, e)
+
+    def _bulk_upsert(self, cur, table_key: str, payloads: Iterable[Dict[str, Any]], method: str = 'values') -> int:
+        """
+        Upsert payloads into a bronze table on an open cursor (see bulk_save)
+
+        Returns:
+            Number of rows inserted or changed, or None if there was nothing
+            to write
+        """
+        table, payload_column, conflict = BULK_TABLES[table_key]
+        columns = ('match_id', 'match_url', payload_column, 'content_hash', 'scrape_run_id', 'scraped_at', 'updated_at')
+        key_positions = [columns.index(name) for name in conflict]
+        now = datetime.utcnow()
+
+        rows = {}
+        for item in payloads:
+            row = (
+                item.get('match_id'), item['match_url'], item['payload'], content_hash(item['payload']),
+                item.get('scrape_run_id'), item.get('scraped_at') or now, now
+            )
+            rows[tuple(row[i] for i in key_positions)] = row
+
+        if not rows:
+            return None
+
+        column_list = ', '.join(columns)
+        upsert = f"""
+            ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET
+                {', '.join(f'{name} = EXCLUDED.{name}' for name in columns if name not in conflict)}
+            WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                AND EXCLUDED.scraped_at >= {table}.scraped_at
+        """
+
+        if method == 'values':
+            self._archive_superseded(cur, table_key, [(row[1], row[3], row[5]) for row in rows.values()])
+            changed = execute_values(
+                cur,
+                f"INSERT INTO {table} ({column_list}) VALUES %s {upsert} RETURNING 1",
+                [row[:2] + (Json(row[2]),) + row[3:] for row in rows.values()],
+                page_size=config.DB_BULK_PAGE_SIZE,
+                fetch=True
+            )
+            return len(changed)
+
+        self._copy_into_staging(cur, payload_column, list(rows.values()))
+        self._archive_superseded(cur, table_key)
+        cur.execute(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM bulk_stage
+            {upsert}
+        """)
+        return cur.rowcount
+
+    def _archive_superseded(
+        self,
+        cur,
+        table_key: str,
+        incoming: Optional[List[Tuple[str, str, datetime]]] = None
+    ) -> None:
+        """
+        Copy current rows that incoming payloads will replace into the history table
+
+        Only rows whose content hash differs from the incoming payload's and
+        that were not scraped after it are copied, matching the upsert's
+        WHERE guard. No-op for tables not in HISTORY_TABLES.
+
+        Args:
+            cur: Cursor of the transaction that then runs the upsert
+            table_key: BULK_TABLES key
+            incoming: (conflict key, content_hash, scraped_at) per incoming
+                      payload, or None to read them from the bulk_stage table
+        """
+        history = HISTORY_TABLES.get(table_key)
+        if history is None:
+            return
+
+        table, payload_column, conflict = BULK_TABLES[table_key]
+        key = conflict[0]
+        source = (
+            'bulk_stage incoming' if incoming is None
+            else f'(VALUES %s) AS incoming ({key}, content_hash, scraped_at)'
+        )
+        query = f"""
+            INSERT INTO {history}
+                (source_id, match_id, match_url, scraped_at, scrape_run_id, {payload_column}, content_hash)
+            SELECT t.id, t.match_id, t.match_url, t.scraped_at, t.scrape_run_id, t.{payload_column}, t.content_hash
+            FROM {table} t
+            JOIN {source} ON t.{key} = incoming.{key}
+            WHERE t.content_hash IS DISTINCT FROM incoming.content_hash
+                AND incoming.scraped_at >= t.scraped_at
+        """
+
+        if incoming is None:
+            cur.execute(query)
+        else:
+            execute_values(cur, query, incoming, page_size=config.DB_BULK_PAGE_SIZE)
+
+    def _copy_into_staging(self, cur, payload_column: str, rows: List[tuple]) -> None:
+        """Create the bulk_stage temp table (dropped on commit) and COPY rows into it"""
+        cur.execute(f"""
+            CREATE TEMP TABLE bulk_stage (
+                match_id VARCHAR(50),
+                match_url TEXT,
+                {payload_column} JSONB,
+                content_hash CHAR(64),
+                scrape_run_id VARCHAR(100),
+                scraped_at TIMESTAMP,
+                updated_at TIMESTAMP
+            ) ON COMMIT DROP
+        """)
+
+        copy_sql = (
+            f"COPY bulk_stage (match_id, match_url, {payload_column}, content_hash, "
+            f"scrape_run_id, scraped_at, updated_at) FROM STDIN"
+        )
+        chunk_size = config.DB_COPY_CHUNK_ROWS
+
+        for start in range(0, len(rows), chunk_size):
+            buffer = io.StringIO()
+            for row in rows[start:start + chunk_size]:
+                fields = row[:2] + (json.dumps(row[2]),) + row[3:]
+                buffer.write('\t'.join(_copy_field(value) for value in fields))
+                buffer.write('\n')
+            buffer.seek(0)
+            cur.copy_expert(copy_sql, buffer)
+
+    def bulk_save_understat_raw(self, payloads: Iterable[Dict[str, Any]], method: str = 'values') -> bool:
+        """Bulk upsert Understat shot payloads (see bulk_save)"""
+        return self.bulk_save('understat_raw', payloads, method)
+
+    def bulk_save_fbref_raw(self, payloads: Iterable[Dict[str, Any]], method: str = 'values') -> bool:
+        """Bulk upsert FBref match payloads (see bulk_save)"""
+        return self.bulk_save('fbref_raw', payloads, method)
+
+    def bulk_save_fbref_lineups(self, payloads: Iterable[Dict[str, Any]], method: str = 'values') -> bool:
+        """Bulk upsert the current FBref lineup per match (see bulk_save)"""
+        return self.bulk_save('fbref_lineups', payloads, method)
+
+    def replay_spool(self, spool: Optional[WriteSpool] = None, method: str = 'copy') -> Dict[str, int]:
+        """
+        Load spooled writes back into bronze
+
+        Each claimed journal is loaded with one batched call per target and
+        deleted once all of it is written; a journal that fails is kept and
+        retried by the next replay. Safe to re-run (see write_spool.py).
+
+        Args:
+            spool: Journal to replay (defaults to this loader's, or config.SPOOL_DIR)
+            method: Bulk load method for payload tables ('values' or 'copy')
+
+        Returns:
+            {'files', 'records', 'failed'} - journals replayed, writes
+            loaded, journals kept
+        """
+        spool = spool or self.spool or WriteSpool()
+        # Writes must reach the database; failures must not be spooled again
+        direct = DatabaseLoader(self.connection_string, spool_mode=SPOOL_OFF)
+        summary = {'files': 0, 'records': 0, 'failed': 0}
+
+        for path in spool.claim():
+            writes: Dict[str, List[Dict[str, Any]]] = {}
+            for target, item in spool.read(path):
+                writes.setdefault(target, []).append(item)
+
+            ok = all(
+                direct.record_match_scrapes(items) if target == MATCH_SCRAPE
+                else direct.bulk_save(target, items, method)
+                for target, items in writes.items()
+            )
+
+            if ok:
+                os.remove(path)
+                summary['files'] += 1
+                summary['records'] += sum(map(len, writes.values()))
+            else:
+                logger.error(f"Replay of {path} failed; keeping it for the next replay")
+                summary['failed'] += 1
+
+        logger.info(f"Replayed {summary['records']} spooled writes from {summary['files']} journals")
+        return summary
+
+    def get_cached_fixtures(self, season: str, source: str = 'understat') -> Optional[Dict[str, Any]]:
+        """
+        Get a cached fixture list from bronze.match_reference
+
+        Args:
+            season: Understat season year (e.g., "2025")
+            source: Fixture source the list was fetched from
+
+        Returns:
+            Dict with 'fixtures', 'list_hash' and 'fetched_at', or None if the
+            season has not been cached (or the cache could not be read)
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT list_hash, fetched_at
+                        FROM bronze.fixture_lists
+                        WHERE source = %s AND season = %s
+                    """, (source, season))
+                    header = cur.fetchone()
+
+                    if not header:
+                        return None
+
+                    cur.execute("""
+                        SELECT understat_match_id, match_url, home_team, away_team,
+                               match_date, kickoff_at, is_result
+                        FROM bronze.match_reference
+                        WHERE understat_season = %s
+                        ORDER BY kickoff_at, match_date
+                    """, (season,))
+
+                    fixtures = [
+                        {
+                            'match_id': row[0],
+                            'match_url': row[1],
+                            'home_team': row[2],
+                            'away_team': row[3],
+                            'match_date': row[4].isoformat(),
+                            'kickoff_at': row[5].strftime('%Y-%m-%d %H:%M:%S') if row[5] else None,
+                            'is_result': row[6]
+                        }
+                        for row in cur.fetchall()
+                    ]
+
+            return {'fixtures': fixtures, 'list_hash': header[0], 'fetched_at': header[1]}
+
+        except Exception as e:
+            logger.error(f"Failed to read cached fixtures: {e}")
+            return None
+
+    def save_fixtures(
+        self,
+        season: str,
+        fixtures: List[Dict[str, Any]],
+        list_hash: str,
+        changed: bool = True,
+        source: str = 'understat'
+    ) -> bool:
+        """
+        Cache a freshly fetched fixture list in bronze.match_reference
+
+        Rows are only rewritten when their fixture hash changed; an unchanged
+        list just has its fetched_at bumped.
+
+        Args:
+            season: Understat season year (e.g., "2025")
+            fixtures: Fixture dictionaries from scrape_season_fixtures
+            list_hash: Hash of the whole list (see fixture_cache.fixture_list_hash)
+            changed: False if the list matches the cached one
+            source: Fixture source the list was fetched from
+
+        Returns:
+            True if successful
+        """
+        now = datetime.utcnow()
+        season_label = f"{season}-{str(int(season) + 1)[-2:]}"
+
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    if changed:
+                        rows = [
+                            (
+                                f['match_url'],
+                                f['match_date'],
+                                f['home_team'],
+                                f['away_team'],
+                                season_label,
+                                str(f['match_id']) if f.get('match_id') else None,
+                                season,
+                                f.get('kickoff_at'),
+                                bool(f.get('is_result')),
+                                fixture_hash(f),
+                                now
+                            )
+                            for f in fixtures
+                        ]
+
+                        execute_values(cur, """
+                            INSERT INTO bronze.match_reference
+                                (match_url, match_date, home_team, away_team, season,
+                                 understat_match_id, understat_season, kickoff_at,
+                                 is_result, fixture_hash, fetched_at)
+                            VALUES %s
+                            ON CONFLICT (match_url) DO UPDATE SET
+                                match_date = EXCLUDED.match_date,
+                                home_team = EXCLUDED.home_team,
+                                away_team = EXCLUDED.away_team,
+                                season = EXCLUDED.season,
+                                understat_match_id = EXCLUDED.understat_match_id,
+                                understat_season = EXCLUDED.understat_season,
+                                kickoff_at = EXCLUDED.kickoff_at,
+                                is_result = EXCLUDED.is_result,
+                                fixture_hash = EXCLUDED.fixture_hash,
+                                fetched_at = EXCLUDED.fetched_at,
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE bronze.match_reference.fixture_hash
+                                  IS DISTINCT FROM EXCLUDED.fixture_hash
+                        """, rows)
+
+                    cur.execute("""
+                        INSERT INTO bronze.fixture_lists
+                            (source, season, list_hash, fixture_count, fetched_at, changed_at)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (source, season) DO UPDATE SET
+                            list_hash = EXCLUDED.list_hash,
+                            fixture_count = EXCLUDED.fixture_count,
+                            fetched_at = EXCLUDED.fetched_at,
+                            changed_at = CASE
+                                WHEN bronze.fixture_lists.list_hash = EXCLUDED.list_hash
+                                THEN bronze.fixture_lists.changed_at
+                                ELSE EXCLUDED.changed_at
+                            END
+                    """, (source, season, list_hash, len(fixtures), now, now))
+
+            logger.info(f"Cached {len(fixtures)} {source} fixtures for {season}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to cache fixtures: {e}")
             return False
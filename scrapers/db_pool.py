@@ -0,0 +1,223 @@
+"""
+Process-wide PostgreSQL connection pool for DatabaseLoader
+
+Every DatabaseLoader call used to open (and close) its own connection, so
+each scraped match paid several TCP + auth handshakes. The pool keeps
+connections open between calls and hands them out per transaction:
+
+- thread-safe; callers block (up to config.DB_POOL_TIMEOUT) when all
+  config.DB_POOL_MAX_CONNECTIONS connections are in use
+- connections are opened lazily and reused most-recently-returned first
+- a connection idle longer than config.DB_POOL_HEALTH_CHECK_SECONDS is
+  pinged before reuse; dead or broken connections are replaced
+- one pool per connection string per process, shared by every
+  DatabaseLoader instance (DAG callables, backfill scripts); pools are
+  closed at interpreter exit, and a forked child never reuses its
+  parent's sockets
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """A bounded, lazily filled pool of psycopg2 connections"""
+
+    def __init__(
+        self,
+        dsn: str,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        health_check_seconds: Optional[float] = None,
+        connect: Callable = psycopg2.connect
+    ):
+        """
+        Args:
+            dsn: PostgreSQL connection string
+            max_connections: Most connections open at once (defaults to config)
+            timeout: Seconds to wait for a free connection (defaults to config)
+            health_check_seconds: Idle time after which a connection is
+                                  pinged before reuse (defaults to config)
+            connect: Connection factory (psycopg2.connect)
+        """
+        self.dsn = dsn
+        self.max_connections = max_connections or config.DB_POOL_MAX_CONNECTIONS
+        self.timeout = config.DB_POOL_TIMEOUT if timeout is None else timeout
+        self.health_check_seconds = (
+            config.DB_POOL_HEALTH_CHECK_SECONDS if health_check_seconds is None else health_check_seconds
+        )
+        self.pid = os.getpid()
+        self._connect = connect
+        self._idle: List[Tuple[object, float]] = []  # (connection, returned at)
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {'checkouts': 0, 'connects': 0, 'health_checks': 0, 'discarded': 0, 'waits': 0}
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for one unit of work
+
+        The caller commits or rolls back; a connection left mid-transaction
+        is rolled back on return. Connections that raised OperationalError /
+        InterfaceError are discarded rather than reused.
+
+        Raises:
+            PoolError: If the pool is closed or no connection frees up in time
+        """
+        conn = self._checkout()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._checkin(conn, discard=broken)
+
+    def _checkout(self):
+        while True:
+            conn, idle_since = self._reserve()
+
+            if conn is None:
+                try:
+                    conn = self._connect(self.dsn)
+                except Exception:
+                    self._release_slot()
+                    raise
+                self.stats['connects'] += 1
+            elif conn.closed or (
+                time.monotonic() - idle_since >= self.health_check_seconds and not self._ping(conn)
+            ):
+                self._discard(conn)
+                continue
+
+            self.stats['checkouts'] += 1
+            return conn
+
+    def _reserve(self) -> Tuple[Optional[object], float]:
+        """Take an idle connection, or a slot to open a new one (conn None)"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.max_connections:
+                    self._open += 1
+                    return None, 0.0
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(f"No database connection free after {self.timeout}s")
+                self.stats['waits'] += 1
+                self._cond.wait(remaining)
+
+    def _ping(self, conn) -> bool:
+        """Round-trip a trivial query to check a connection is still alive"""
+        self.stats['health_checks'] += 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding dead database connection: {e}")
+            return False
+
+    def _checkin(self, conn, discard: bool = False) -> None:
+        if not discard and not conn.closed:
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                discard = True
+            elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+
+        with self._cond:
+            if not discard and not conn.closed and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+
+        self._discard(conn)
+
+    def _discard(self, conn) -> None:
+        self.stats['discarded'] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close idle connections now; in-use ones are closed when returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+
+        for conn, _ in idle:
+            self._discard(conn)
+
+        logger.info(f"Closed database pool ({self.stats['connects']} connections opened, "
+                    f"{self.stats['checkouts']} checkouts)")
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dsn: str) -> ConnectionPool:
+    """
+    Get the process-wide pool for a connection string
+
+    A pool inherited through fork() is left alone (its sockets belong to
+    the parent) and replaced with a fresh one.
+    """
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[dsn] = ConnectionPool(dsn)
+        return pool
+
+
+def close_pool(dsn: str) -> None:
+    """Close and forget the pool for a connection string, if any"""
+    with _pools_lock:
+        pool = _pools.pop(dsn, None)
+    if pool is not None and pool.pid == os.getpid():
+        pool.close()
+
+
+def close_pools() -> None:
+    """Close every pool opened by this process"""
+    with _pools_lock:
+        dsns = list(_pools)
+    for dsn in dsns:
+        close_pool(dsn)
+
+
+atexit.register(close_pools)
@@ -0,0 +1,228 @@
+"""
+Schema registry and columnar typed extraction for FBref stat tables
+
+FBref identifies every column by its data-stat attribute. STAT_TYPES maps
+those names to a type so a whole table can be converted column-wise with
+vectorized pandas casts, instead of cell-by-cell safe_extract_* calls.
+
+Columns missing from the registry are inferred: numeric if every non-empty
+value parses as a number, text otherwise.
+
+Typed tables are stored in bronze as column-oriented JSON
+({'columns': [...], 'data': {column: [values]}}), which drops the repeated
+per-row keys and the quoted numbers.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from html_parsers import ParsedTable
+
+logger = logging.getLogger(__name__)
+
+STR = 'str'
+INT = 'int'
+FLOAT = 'float'
+PCT = 'pct'  # Percentage, stored as a float without the '%'
+
+# Column dtype per type, for tables without rows (unregistered columns stay text)
+_EMPTY_DTYPES = {STR: object, INT: 'Int64', FLOAT: 'float64', PCT: 'float64'}
+
+
+def _types(type_name: str, names: Iterable[str]) -> Dict[str, str]:
+    return {name: type_name for name in names}
+
+
+STAT_TYPES: Dict[str, str] = {
+    # Player / match identity
+    **_types(STR, (
+        'player', 'nationality', 'position', 'age', 'team',
+        'date', 'dayofweek', 'start_time', 'comp', 'round', 'venue',
+        'result', 'opponent', 'formation', 'referee', 'match_report', 'notes',
+    )),
+    **_types(INT, (
+        'shirtnumber', 'jersey_number', 'minutes', 'goals_for', 'goals_against',
+        'possession', 'attendance',
+        # Summary
+        'goals', 'assists', 'pens_made', 'pens_att', 'shots', 'shots_on_target',
+        'cards_yellow', 'cards_red', 'cards_yellow_red', 'touches', 'tackles',
+        'interceptions', 'blocks', 'sca', 'gca',
+        # Passing
+        'passes_completed', 'passes', 'passes_total_distance', 'passes_progressive_distance',
+        'passes_completed_short', 'passes_short', 'passes_completed_medium', 'passes_medium',
+        'passes_completed_long', 'passes_long', 'assisted_shots', 'passes_into_final_third',
+        'passes_into_penalty_area', 'crosses_into_penalty_area', 'progressive_passes',
+        'passes_live', 'passes_dead', 'passes_free_kicks', 'through_balls', 'passes_switches',
+        'crosses', 'throw_ins', 'corner_kicks', 'passes_offsides', 'passes_blocked',
+        # Defense
+        'tackles_won', 'tackles_def_3rd', 'tackles_mid_3rd', 'tackles_att_3rd',
+        'challenge_tackles', 'challenges', 'challenges_lost', 'blocked_shots',
+        'blocked_passes', 'tackles_interceptions', 'clearances', 'errors',
+        # Possession
+        'touches_def_pen_area', 'touches_def_3rd', 'touches_mid_3rd', 'touches_att_3rd',
+        'touches_att_pen_area', 'touches_live_ball', 'take_ons', 'take_ons_won',
+        'take_ons_tackled', 'carries', 'carries_distance', 'carries_progressive_distance',
+        'progressive_carries', 'carries_into_final_third', 'carries_into_penalty_area',
+        'miscontrols', 'dispossessed', 'passes_received', 'progressive_passes_received',
+        # Miscellaneous
+        'fouls', 'fouled', 'offsides', 'pens_won', 'pens_conceded', 'own_goals',
+        'ball_recoveries', 'aerials_won', 'aerials_lost',
+        # Goal and shot creation
+        'sca_passes_live', 'sca_passes_dead', 'sca_take_ons', 'sca_shots', 'sca_fouled',
+        'sca_defense', 'gca_passes_live', 'gca_passes_dead', 'gca_take_ons', 'gca_shots',
+        'gca_fouled', 'gca_defense',
+        # Goalkeeping
+        'gk_shots_on_target_against', 'gk_goals_against', 'gk_saves',
+    )),
+    **_types(FLOAT, (
+        'xg', 'npxg', 'xg_assist', 'npxg_xg_assist', 'pass_xa', 'xg_for', 'xg_against',
+        'gk_psxg',
+    )),
+    **_types(PCT, (
+        'passes_pct', 'passes_pct_short', 'passes_pct_medium', 'passes_pct_long',
+        'challenge_tackles_pct', 'take_ons_won_pct', 'take_ons_tackled_pct',
+        'aerials_won_pct', 'gk_save_pct',
+    )),
+}
+
+
+def stat_type(name: str) -> Optional[str]:
+    """Return the registered type for a data-stat name, or None if unknown"""
+    return STAT_TYPES.get(name)
+
+
+def _to_numbers(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized numeric cast of a block of FBref cell text ('1,234', '56.2%', '')
+
+    Returns:
+        (float values with NaN where unparseable, mask of empty cells)
+    """
+    cleaned = np.char.strip(np.char.rstrip(np.char.replace(cells.astype(str), ',', ''), '%'))
+    numbers = pd.to_numeric(cleaned.ravel(), errors='coerce').astype('float64')
+    return numbers.reshape(cleaned.shape), cleaned == ''
+
+
+def typed_frame(
+    rows: List[Dict[str, str]],
+    columns: Optional[List[str]] = None,
+    schema: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from data-stat rows
+
+    All numeric columns of the table are cast together in one vectorized
+    pass; only the per-column type decision runs in Python.
+
+    Args:
+        rows: One dict per row (data-stat name -> cell text)
+        columns: Column order (defaults to first-seen order in rows)
+        schema: Type registry (defaults to STAT_TYPES)
+
+    Returns:
+        DataFrame with Int64 / float64 / object columns
+    """
+    schema = STAT_TYPES if schema is None else schema
+
+    if columns is None:
+        columns = list(dict.fromkeys(name for row in rows for name in row))
+
+    if not rows:
+        # Header-only table (unplayed or partial match): nothing to cast or infer
+        return pd.DataFrame(
+            {name: pd.Series([], dtype=_EMPTY_DTYPES.get(schema.get(name), object)) for name in columns},
+            columns=columns
+        )
+
+    text = np.array(
+        [[row.get(name) or '' for name in columns] for row in rows], dtype=object
+    ).reshape(len(rows), len(columns))
+
+    numeric = [j for j, name in enumerate(columns) if schema.get(name) != STR]
+    if numeric:
+        numbers, empty = _to_numbers(text[:, numeric])
+    position = {j: k for k, j in enumerate(numeric)}
+
+    data = {}
+    for j, name in enumerate(columns):
+        kind = schema.get(name)
+        as_text = np.where(text[:, j] == '', None, text[:, j])
+
+        if kind == STR:
+            data[name] = as_text
+            continue
+
+        values = numbers[:, position[j]]
+        missing = np.isnan(values)
+        unparsed = missing & ~empty[:, position[j]]
+
+        if kind is None:
+            # Unregistered column: numeric only if every non-empty value parsed
+            if unparsed.any():
+                data[name] = as_text
+                continue
+            kind = INT if np.all(values[~missing] % 1 == 0) else FLOAT
+
+        if unparsed.any():
+            logger.warning(
+                f"Column '{name}': {int(unparsed.sum())} non-empty value(s) are not numbers "
+                f"and were stored as missing (e.g. {text[unparsed, j][0]!r})"
+            )
+
+        if kind == INT and np.any(values[~missing] % 1 != 0):
+            # FBref sometimes reports a registered int stat with decimals:
+            # keep the values rather than dropping them to NA
+            logger.warning(f"Column '{name}' is registered as int but has decimal values, keeping it as float")
+            kind = FLOAT
+
+        if kind == INT:
+            data[name] = pd.arrays.IntegerArray(np.where(missing, 0, values).astype('int64'), missing)
+        else:
+            data[name] = values
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def typed_table(table: ParsedTable, schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Return a parsed FBref table as a typed DataFrame"""
+    columns = list(dict.fromkeys(table.columns + [name for row in table.rows for name in row]))
+    return typed_frame(table.rows, columns=columns, schema=schema)
+
+
+def frame_to_columnar(frame: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Serialize a typed DataFrame to column-oriented JSON-friendly data
+
+    Missing values become None; numbers become plain Python ints / floats.
+    """
+    return {
+        'columns': list(frame.columns),
+        'data': {
+            name: frame[name].to_numpy(dtype=object, na_value=None).tolist()
+            for name in frame.columns
+        }
+    }
+
+
+def columnar_to_frame(payload: Dict[str, Any], schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Load column-oriented data (see frame_to_columnar) back into a typed DataFrame
+
+    Args:
+        payload: {'columns': [...], 'data': {column: [values]}}
+        schema: Type registry (defaults to STAT_TYPES)
+    """
+    schema = STAT_TYPES if schema is None else schema
+    frame = pd.DataFrame({name: payload['data'][name] for name in payload['columns']})
+
+    for name in frame.columns:
+        kind = schema.get(name)
+        if kind == INT or (kind is None and pd.api.types.is_integer_dtype(frame[name])):
+            frame[name] = frame[name].astype('Int64')
+        elif kind in (FLOAT, PCT):
+            frame[name] = frame[name].astype('float64')
+
+    return frame
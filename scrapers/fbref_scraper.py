@@ -15,11 +15,16 @@ from datetime import datetime, timedelta
 import requests
 from bs4 import BeautifulSoup
 import json
+import pandas as pd
 
 from config import config
+from fbref_schema import typed_table, frame_to_columnar
+from html_parsers import ParsedTable, TableIndex, parse_document
+from http_cache import ResponseCache
+from records import LineupEntry, to_dicts
 from utils import (
     get_session_with_retries,
-    rate_limit,
+    get_pacer,
     safe_extract_text,
     safe_extract_int,
     safe_extract_float,
@@ -31,20 +36,37 @@ from utils import (
 
 logger = logging.getLogger(__name__)
 
+# Match-log types scraped by scrape_match_logs_batch by default
+DEFAULT_MATCH_LOG_TYPES = (
+    'shooting', 'passing', 'passing_types', 'gca', 'defense', 'possession', 'misc'
+)
+
+# Match-log columns that describe the match rather than Arsenal's numbers
+MATCH_LOG_MATCH_COLUMNS = {
+    'date', 'dayofweek', 'start_time', 'comp', 'round', 'venue', 'result',
+    'goals_for', 'goals_against', 'opponent', 'formation', 'referee',
+    'match_report', 'notes'
+}
+
 
 class FBrefScraper:
     """Scraper for FBref football statistics"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None, parser_backend: Optional[str] = None):
         self.session = get_session_with_retries()
+        self.cache = cache or ResponseCache()
+        self.parser_backend = parser_backend or config.FBREF_PARSER_BACKEND
         self.base_url = config.FBREF_BASE_URL
         self.arsenal_id = config.ARSENAL_FBREF_ID
 
-    @rate_limit(config.FBREF_REQUEST_DELAY)
     def _make_request(self, url: str) -> requests.Response:
         """
         Make HTTP request with rate limiting
 
+        Pages are served through the on-disk response cache; in replay mode
+        they come straight from the cache without touching the network (or
+        the rate limiter).
+
         Args:
             url: URL to fetch
 
@@ -54,9 +76,21 @@ class FBrefScraper:
         Raises:
             ScraperException: If request fails
         """
+        if self.cache.replay:
+            return self.cache.get(self.session, url, timeout=config.REQUEST_TIMEOUT)
+
+        return self._fetch(url)
+
+    def _fetch(self, url: str) -> requests.Response:
+        """Fetch a URL from the network (adaptively paced, conditional if cached)"""
+        pacer = get_pacer(
+            config.fbref_host, config.FBREF_REQUEST_DELAY, config.FBREF_MIN_REQUEST_DELAY
+        )
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=config.REQUEST_TIMEOUT)
+            response = pacer.request(
+                lambda: self.cache.get(self.session, url, timeout=config.REQUEST_TIMEOUT)
+            )
             response.raise_for_status()
             return response
         except requests.RequestException as e:
@@ -197,44 +231,94 @@ class FBrefScraper:
 
         return fixture
 
-    def scrape_match_stats(self, match_report_url: str) -> Dict[str, Any]:
+    def scrape_match_report(self, match_report_url: str) -> Dict[str, Any]:
         """
-        Scrape detailed match statistics from FBref match report
+        Scrape match statistics and both lineups from FBref with one fetch and one parse
+
+        Callers that need stats and lineups for the same match should use this
+        instead of scrape_match_stats plus scrape_match_lineups, which fetch
+        the page once each.
 
         Args:
             match_report_url: URL to match report page
 
         Returns:
-            Dictionary containing match statistics
+            Dictionary containing match metadata, team stats, player stats
+            and both lineups
 
         Raises:
-            ScraperException: If scraping fails
+            ScraperException: If the request fails
             DataValidationException: If data validation fails
         """
         response = self._make_request(match_report_url)
-        soup = BeautifulSoup(response.content, 'lxml')
+        report = self.parse_match_report(response.content, match_report_url)
+
+        self._validate_match_data(report)
+
+        total_players = len(report['home_lineup']) + len(report['away_lineup'])
+        logger.info(f"Scraped lineups: {total_players} players")
+
+        return report
+
+    def parse_match_report(self, html: bytes, match_report_url: str) -> Dict[str, Any]:
+        """
+        Parse a fetched match report page (see scrape_match_report)
+
+        Args:
+            html: Raw page bytes
+            match_report_url: URL the page was fetched from
 
-        match_data = {
+        Returns:
+            Dictionary containing match metadata, team stats, player stats
+            and both lineups
+        """
+        doc = parse_document(html, self.parser_backend)
+
+        metadata = self._extract_match_metadata(doc.fragment('div', {'class': 'scorebox'}))
+
+        report = {
             'match_url': match_report_url,
             'scraped_at': datetime.utcnow().isoformat(),
-            'match_metadata': {},
-            'team_stats': {},
-            'player_stats': []
+            'match_metadata': metadata,
+            'home_team': metadata.get('home_team'),
+            'away_team': metadata.get('away_team'),
+            'team_stats': self._extract_team_stats(doc.fragment('div', {'id': 'team_stats'})),
+            'player_stats': self._extract_player_stats(doc.tables),
+            'home_lineup': [],
+            'away_lineup': []
         }
 
-        # Extract match metadata
-        match_data['match_metadata'] = self._extract_match_metadata(soup)
+        # FBref has two tables with class "lineup" - first for home, second for away
+        lineup_tables = doc.tables.with_class('lineup')
+
+        if len(lineup_tables) >= 2:
+            report['home_lineup'] = to_dicts(self._parse_lineup_table(lineup_tables[0], 'home'))
+            report['away_lineup'] = to_dicts(self._parse_lineup_table(lineup_tables[1], 'away'))
+        else:
+            logger.warning(f"Could not find lineup tables (found {len(lineup_tables)})")
+
+        return report
+
+    def scrape_match_stats(self, match_report_url: str) -> Dict[str, Any]:
+        """
+        Scrape detailed match statistics from FBref match report
 
-        # Extract team-level statistics
-        match_data['team_stats'] = self._extract_team_stats(soup)
+        Args:
+            match_report_url: URL to match report page
 
-        # Extract player-level statistics
-        match_data['player_stats'] = self._extract_player_stats(soup)
+        Returns:
+            Dictionary containing match statistics
 
-        # Validate data
-        self._validate_match_data(match_data)
+        Raises:
+            ScraperException: If scraping fails
+            DataValidationException: If data validation fails
+        """
+        report = self.scrape_match_report(match_report_url)
 
-        return match_data
+        return {
+            key: report[key]
+            for key in ('match_url', 'scraped_at', 'match_metadata', 'team_stats', 'player_stats')
+        }
 
     def _extract_match_metadata(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract match metadata (score, teams, date, venue, etc.)"""
@@ -325,10 +409,14 @@ class FBrefScraper:
 
         return team_stats
 
-    def _extract_player_stats(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract player-level statistics from all stat tables"""
-        player_stats = []
+    def _extract_player_stats(self, tables: TableIndex) -> Dict[str, Any]:
+        """
+        Extract player-level statistics from all stat tables
 
+        Returns:
+            Typed column-oriented stats (see fbref_schema.frame_to_columnar),
+            one row per player and team
+        """
         # Find all player stat tables (summary, passing, defense, etc.)
         # FBref uses multiple tables with different IDs
         stat_tables = [
@@ -339,57 +427,39 @@ class FBrefScraper:
             ('gca_', 'gca')  # Goal and shot creating actions
         ]
 
-        # We'll merge stats by player
-        player_data_map = {}
+        frames = []
 
         for table_prefix, stat_type in stat_tables:
             # Tables are typically ID'd as "stats_<home_team_id>" and "stats_<away_team_id>"
-            # We'll find all tables starting with the prefix
-            tables = soup.find_all('table', id=lambda x: x and x.startswith(table_prefix))
-
-            for table in tables:
+            # Only the matching tables get parsed (commented-out ones included)
+            for table in tables.with_prefix(table_prefix):
                 # Determine if home or away team
-                table_id = table.get('id', '')
+                table_id = table.table_id
                 team = 'home' if 'home' in table_id or table_prefix + 'home' in table_id else 'away'
 
-                tbody = table.find('tbody')
-                if not tbody:
+                frame = typed_table(table)
+                if 'player' not in frame.columns:
                     continue
 
-                rows = tbody.find_all('tr')
-                for row in rows:
-                    # Skip header rows
-                    if 'thead' in row.get('class', []):
-                        continue
-
-                    player_name_cell = row.find('th', {'data-stat': 'player'})
-                    if not player_name_cell:
-                        continue
-
-                    player_name = clean_player_name(player_name_cell.get_text(strip=True))
-
-                    # Create unique key for player in this match
-                    player_key = f"{player_name}_{team}"
-
-                    if player_key not in player_data_map:
-                        player_data_map[player_key] = {
-                            'player_name': player_name,
-                            'team': team
-                        }
+                frame = frame[frame['player'].notna()].assign(team=team)
+                frame['player'] = frame['player'].map(clean_player_name)
+                frames.append(frame)
 
-                    # Extract all data-stat attributes
-                    cells = row.find_all(['th', 'td'])
-                    for cell in cells:
-                        stat = cell.get('data-stat')
-                        if stat and stat != 'player':
-                            value = cell.get_text(strip=True)
-                            player_data_map[player_key][stat] = value
+        if not frames:
+            logger.info("Extracted stats for 0 players")
+            return frame_to_columnar(pd.DataFrame(columns=['player_name', 'team']))
 
-        # Convert map to list
-        player_stats = list(player_data_map.values())
+        # Merge stats by player: later tables fill in / overwrite earlier values
+        merged = (
+            pd.concat(frames, ignore_index=True, sort=False)
+            .groupby(['player', 'team'], sort=False)
+            .last()
+            .reset_index()
+            .rename(columns={'player': 'player_name'})
+        )
 
-        logger.info(f"Extracted stats for {len(player_stats)} players")
-        return player_stats
+        logger.info(f"Extracted stats for {len(merged)} players")
+        return frame_to_columnar(merged)
 
     def _validate_match_data(self, match_data: Dict[str, Any]) -> None:
         """
@@ -413,9 +483,9 @@ class FBrefScraper:
             logger.warning("Missing team stats")
 
         # Check player stats
-        player_stats = match_data.get('player_stats', [])
-        if len(player_stats) < 14:  # Should have at least 11 starters per team
-            logger.warning(f"Only {len(player_stats)} player records found")
+        player_count = len(match_data.get('player_stats', {}).get('data', {}).get('player_name', []))
+        if player_count < 14:  # Should have at least 11 starters per team
+            logger.warning(f"Only {player_count} player records found")
 
         logger.info("Match data validation passed")
 
@@ -430,87 +500,43 @@ class FBrefScraper:
             Dictionary with lineup data including player positions
         """
         response = self._make_request(match_report_url)
-        soup = BeautifulSoup(response.content, 'lxml')
-
-        lineup_data = {
-            'match_url': match_report_url,
-            'scraped_at': datetime.utcnow().isoformat(),
-            'home_lineup': [],
-            'away_lineup': []
-        }
-
-        # Extract metadata
-        metadata = self._extract_match_metadata(soup)
-        lineup_data['home_team'] = metadata.get('home_team')
-        lineup_data['away_team'] = metadata.get('away_team')
-
-        # Find lineup tables
-        # FBref has two tables with class "lineup" - first for home, second for away
-        lineup_tables = soup.find_all('table', {'class': 'lineup'})
-
-        if len(lineup_tables) >= 2:
-            lineup_data['home_lineup'] = self._parse_lineup_table(lineup_tables[0], 'home')
-            lineup_data['away_lineup'] = self._parse_lineup_table(lineup_tables[1], 'away')
-        else:
-            logger.warning(f"Could not find lineup tables (found {len(lineup_tables)})")
+        report = self.parse_match_report(response.content, match_report_url)
 
-        total_players = len(lineup_data['home_lineup']) + len(lineup_data['away_lineup'])
+        total_players = len(report['home_lineup']) + len(report['away_lineup'])
         logger.info(f"Scraped lineups: {total_players} players")
 
-        return lineup_data
+        return {
+            key: report[key]
+            for key in ('match_url', 'scraped_at', 'home_lineup', 'away_lineup', 'home_team', 'away_team')
+        }
 
-    def _parse_lineup_table(self, table, team_side: str) -> List[Dict[str, str]]:
+    def _parse_lineup_table(self, table: ParsedTable, team_side: str) -> List[LineupEntry]:
         """
         Parse lineup table to extract player positions
 
         Args:
-            table: BeautifulSoup table element
+            table: Parsed lineup table
             team_side: 'home' or 'away'
 
         Returns:
-            List of player dictionaries with name and position
+            List of lineup entries with name and position
         """
         lineup = []
 
-        tbody = table.find('tbody')
-        if not tbody:
-            return lineup
-
-        rows = tbody.find_all('tr')
-
-        for row in rows:
-            try:
-                # Get player name (in th with data-stat="player")
-                player_cell = row.find('th', {'data-stat': 'player'})
-                if not player_cell:
-                    continue
-
-                player_name = clean_player_name(player_cell.get_text(strip=True))
-
-                # Get jersey number (in th with data-stat="jersey_number")
-                number_cell = row.find('th', {'data-stat': 'jersey_number'})
-                jersey_number = number_cell.get_text(strip=True) if number_cell else ''
-
-                # Get position (in td with data-stat="position")
-                position_cell = row.find('td', {'data-stat': 'position'})
-                position = position_cell.get_text(strip=True) if position_cell else 'Unknown'
-
-                # Normalize position to category
-                position_category = self._normalize_position(position)
-
-                player_data = {
-                    'player_name': player_name,
-                    'position': position,  # Raw position (e.g., "CM", "LW")
-                    'position_category': position_category,  # Normalized (GK, DEF, MID, FWD)
-                    'jersey_number': jersey_number,
-                    'team_side': team_side
-                }
+        for row in table.rows:
+            # Player name is in th with data-stat="player"
+            if 'player' not in row:
+                continue
 
-                lineup.append(player_data)
+            position = row.get('position', 'Unknown')
 
-            except Exception as e:
-                logger.debug(f"Error parsing lineup row: {e}")
-                continue
+            lineup.append(LineupEntry(
+                player_name=clean_player_name(row['player']),
+                position=position,
+                position_category=self._normalize_position(position),
+                jersey_number=row.get('jersey_number', ''),
+                team_side=team_side
+            ))
 
         return lineup
 
@@ -525,100 +551,126 @@ class FBrefScraper:
         Returns:
             List of match log dictionaries with player statistics per match
         """
-        # Construct URL for match logs
-        # Example: https://fbref.com/en/squads/18bb7c10/2025-2026/matchlogs/c9/passing/Arsenal-Match-Logs-Premier-League
-        url = f"{self.base_url}/en/squads/{self.arsenal_id}/{season}/matchlogs/c9/{log_type}/Arsenal-Match-Logs-Premier-League"
-        
-        logger.info(f"Scraping FBref match logs: {url}")
-        response = self._make_request(url)
-        soup = BeautifulSoup(response.content, 'lxml')
-        
         match_logs = []
-        
-        # Find the match logs table
-        table = soup.find('table', {'id': f'matchlogs_{log_type}'})
-        
+
+        table = self._fetch_match_log_table(season, log_type)
         if not table:
-            logger.warning(f"Could not find match logs table for {log_type}")
-            return match_logs
-        
-        tbody = table.find('tbody')
-        if not tbody:
             return match_logs
-        
-        rows = tbody.find_all('tr')
-        
-        for row in rows:
-            # Skip header rows
-            if row.get('class') and 'thead' in row.get('class'):
+
+        # Cast every stat column in one vectorized pass
+        typed = frame_to_columnar(typed_table(table))
+        stat_columns = [c for c in typed['columns'] if c not in MATCH_LOG_MATCH_COLUMNS]
+
+        for i, (row, links) in enumerate(zip(table.rows, table.links)):
+            if not row.get('date'):
                 continue
-            
-            try:
-                cells = row.find_all(['th', 'td'])
-                if len(cells) < 5:
-                    continue
-                
-                # Extract match date
-                date_cell = cells[0]
-                match_date = safe_extract_text(date_cell.find('a')) if date_cell.find('a') else safe_extract_text(date_cell)
-                
-                # Extract opponent
-                opponent_cell = cells[1]
-                opponent = safe_extract_text(opponent_cell.find('a')) if opponent_cell.find('a') else safe_extract_text(opponent_cell)
-                
-                # Extract venue (H/A)
-                venue_cell = cells[2]
-                venue = safe_extract_text(venue_cell).upper()
-                
-                # Extract result
-                result_cell = cells[3]
-                result = safe_extract_text(result_cell)
-                
-                # Extract score
-                score_cell = cells[4]
-                score = safe_extract_text(score_cell)
-                
-                # Extract match report URL if available
-                match_url = None
-                match_link = date_cell.find('a')
-                if match_link and match_link.get('href'):
-                    match_url = f"{self.base_url}{match_link['href']}"
-                
-                # Extract additional stats based on log type
-                stats = {}
-                if len(cells) > 5:
-                    # Get column headers to map stats
-                    header_row = table.find('thead')
-                    if header_row:
-                        headers = [safe_extract_text(th) for th in header_row.find_all('th')]
-                        for i, header in enumerate(headers[5:], start=5):
-                            if i < len(cells):
-                                value = safe_extract_text(cells[i])
-                                # Try to parse as number
-                                num_value = safe_extract_float(value)
-                                stats[header] = num_value if num_value is not None else value
-                
-                match_log = {
-                    'match_date': match_date,
-                    'opponent': opponent,
-                    'venue': venue,
-                    'result': result,
-                    'score': score,
-                    'match_url': match_url,
-                    'log_type': log_type,
-                    'season': season,
-                    'stats': stats
+
+            # Link to the match report sits on the date (or the match report column)
+            href = links.get('match_report') or links.get('date')
+            match_url = f"{self.base_url}{href}" if href else None
+
+            goals_for, goals_against = row.get('goals_for'), row.get('goals_against')
+
+            match_logs.append({
+                'match_date': row['date'],
+                'opponent': row.get('opponent', ''),
+                'venue': row.get('venue', '').upper(),
+                'result': row.get('result', ''),
+                'score': f"{goals_for}-{goals_against}" if goals_for and goals_against else '',
+                'match_url': match_url,
+                'log_type': log_type,
+                'season': season,
+                'stats': {
+                    stat: typed['data'][stat][i]
+                    for stat in stat_columns
+                    if typed['data'][stat][i] is not None
                 }
-                
-                match_logs.append(match_log)
-                
-            except Exception as e:
-                logger.debug(f"Error parsing match log row: {e}")
-                continue
-        
+            })
+
         logger.info(f"Scraped {len(match_logs)} match logs from FBref")
         return match_logs
 
+    def scrape_match_logs_batch(
+        self,
+        season: str = "2025-2026",
+        log_types: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Scrape several match-log types for a season into one wide frame
+
+        Each log page is fetched through the shared per-host pacer, and each
+        table's header row is read once and cast column-wise. The per-type
+        frames are joined on match date and match report URL.
+
+        Args:
+            season: Season string (e.g., "2025-2026")
+            log_types: Log types to scrape (defaults to DEFAULT_MATCH_LOG_TYPES)
+
+        Returns:
+            One typed row per match: match_date, match_url and the match
+            columns (opponent, venue, result, ...), then one column per stat
+            named "<log_type>_<data-stat>" (e.g. passing_passes_completed)
+        """
+        log_types = list(log_types or DEFAULT_MATCH_LOG_TYPES)
+        keys = ['match_date', 'match_url']
+
+        wide = None
+        for log_type in log_types:
+            table = self._fetch_match_log_table(season, log_type)
+            if not table:
+                continue
+
+            frame = self._match_log_frame(table)
+            stat_columns = [c for c in frame.columns if c not in MATCH_LOG_MATCH_COLUMNS and c not in keys]
+            frame = frame.rename(columns={c: f"{log_type}_{c}" for c in stat_columns})
+
+            if wide is None:
+                wide = frame
+            else:
+                # Match columns come from the first log type that had them
+                frame = frame.drop(columns=[c for c in frame.columns if c in wide.columns and c not in keys])
+                wide = wide.merge(frame, on=keys, how='outer', sort=False)
+
+        if wide is None:
+            logger.warning(f"No match logs found for {season}")
+            return pd.DataFrame(columns=keys)
+
+        wide = wide.sort_values('match_date', kind='stable').reset_index(drop=True)
+        logger.info(f"Scraped {len(wide)} matches x {len(wide.columns)} columns of FBref match logs")
+        return wide
+
+    def _fetch_match_log_table(self, season: str, log_type: str) -> Optional[ParsedTable]:
+        """Fetch a match-log page and return its table, or None if missing"""
+        # Construct URL for match logs
+        # Example: https://fbref.com/en/squads/18bb7c10/2025-2026/matchlogs/c9/passing/Arsenal-Match-Logs-Premier-League
+        url = f"{self.base_url}/en/squads/{self.arsenal_id}/{season}/matchlogs/c9/{log_type}/Arsenal-Match-Logs-Premier-League"
+
+        logger.info(f"Scraping FBref match logs: {url}")
+        response = self._make_request(url)
+        doc = parse_document(response.content, self.parser_backend)
+
+        # Find the match logs table (FBref often ships it inside an HTML comment)
+        table = doc.tables.get(f'matchlogs_{log_type}') or doc.tables.get('matchlogs_for')
+
+        if not table:
+            logger.warning(f"Could not find match logs table for {log_type}")
+        return table
+
+    def _match_log_frame(self, table: ParsedTable) -> pd.DataFrame:
+        """Typed frame of a match-log table, keyed by match date and report URL"""
+        frame = typed_table(table)
+        frame.insert(0, 'match_url', [
+            f"{self.base_url}{href}" if href else None
+            for href in (links.get('match_report') or links.get('date') for links in table.links)
+        ])
+
+        if 'date' not in frame.columns:
+            logger.warning(f"Match logs table {table.table_id} has no date column")
+            return pd.DataFrame(columns=['match_date', 'match_url'])
+
+        frame = frame[frame['date'].notna()].rename(columns={'date': 'match_date'})
+        return frame[['match_date'] + [c for c in frame.columns if c != 'match_date']]
+
     def _normalize_position(self, position: str) -> str:
         """
         Normalize FBref positions to categories
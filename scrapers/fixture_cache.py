@@ -0,0 +1,175 @@
+"""
+Fixture-list cache backed by bronze.match_reference
+
+Understat fixture lists change rarely: a result flips is_result, a match is
+rescheduled. DAG tasks read fixtures through FixtureCache, which serves the
+list from Postgres and only goes upstream when:
+
+- the cached list is older than config.FIXTURE_CACHE_TTL_HOURS, or
+- an unplayed fixture is near kickoff (from FIXTURE_CACHE_PRE_KICKOFF_HOURS
+  before to FIXTURE_CACHE_POST_KICKOFF_HOURS after) and the list is older
+  than FIXTURE_CACHE_MATCHDAY_TTL_MINUTES.
+
+Every fixture is hashed, and so is the whole list, so an unchanged refetch
+only bumps the list's fetched_at instead of rewriting every row.
+
+Usage:
+    with TieredUnderstatFetcher() as fetcher:
+        fixtures = FixtureCache(DatabaseLoader(), fetcher).get_season_fixtures("2025")
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+
+from config import config
+from utils import ScraperException
+
+logger = logging.getLogger(__name__)
+
+# Fields that define a fixture; a change in any of them is a real change
+FIXTURE_HASH_FIELDS = ('match_url', 'home_team', 'away_team', 'match_date', 'kickoff_at', 'is_result')
+
+
+def fixture_hash(fixture: Dict[str, Any]) -> str:
+    """Return a stable sha256 of a fixture's defining fields"""
+    payload = {field: fixture.get(field) for field in FIXTURE_HASH_FIELDS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def fixture_list_hash(fixtures: List[Dict[str, Any]]) -> str:
+    """Return a sha256 over a fixture list, independent of its order"""
+    digests = sorted(fixture_hash(f) for f in fixtures)
+    return hashlib.sha256(''.join(digests).encode('ascii')).hexdigest()
+
+
+def parse_kickoff(fixture: Dict[str, Any]) -> Optional[datetime]:
+    """Return a fixture's kickoff as a datetime, falling back to its date"""
+    for value, fmt in (
+        (fixture.get('kickoff_at'), '%Y-%m-%d %H:%M:%S'),
+        (fixture.get('match_date'), '%Y-%m-%d'),
+    ):
+        if not value:
+            continue
+        try:
+            return datetime.strptime(str(value)[:19], fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def is_near_kickoff(fixtures: List[Dict[str, Any]], now: datetime) -> bool:
+    """
+    Check whether any unplayed fixture is inside its matchday window
+
+    Args:
+        fixtures: Cached fixture dictionaries
+        now: Current time (UTC, naive - same clock as Understat kickoff times)
+
+    Returns:
+        True if a result may be about to appear upstream
+    """
+    before = timedelta(hours=config.FIXTURE_CACHE_PRE_KICKOFF_HOURS)
+    after = timedelta(hours=config.FIXTURE_CACHE_POST_KICKOFF_HOURS)
+
+    for fixture in fixtures:
+        if fixture.get('is_result'):
+            continue
+        kickoff = parse_kickoff(fixture)
+        if kickoff is not None and kickoff - before <= now <= kickoff + after:
+            return True
+    return False
+
+
+def is_stale(fixtures: List[Dict[str, Any]], fetched_at: datetime, now: Optional[datetime] = None) -> bool:
+    """
+    Decide whether a cached fixture list must be refreshed from upstream
+
+    Args:
+        fixtures: Cached fixture dictionaries
+        fetched_at: When upstream was last checked for this list
+        now: Current time (defaults to utcnow)
+
+    Returns:
+        True if the list should be re-fetched
+    """
+    now = now or datetime.utcnow()
+    age = now - fetched_at
+
+    if age >= timedelta(hours=config.FIXTURE_CACHE_TTL_HOURS):
+        return True
+
+    return (
+        age >= timedelta(minutes=config.FIXTURE_CACHE_MATCHDAY_TTL_MINUTES)
+        and is_near_kickoff(fixtures, now)
+    )
+
+
+class FixtureCache:
+    """Serve Understat season fixtures from Postgres, refreshing when stale"""
+
+    def __init__(self, loader, fetcher):
+        """
+        Args:
+            loader: DatabaseLoader used to read and write the cache
+            fetcher: Upstream fixture source with scrape_season_fixtures(season)
+                     (e.g. TieredUnderstatFetcher); only used on a refresh
+        """
+        self.loader = loader
+        self.fetcher = fetcher
+        self.stats = {'hits': 0, 'refreshes': 0, 'unchanged': 0, 'stale_served': 0}
+
+    def get_season_fixtures(self, season: str, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get all Arsenal fixtures for a season
+
+        Args:
+            season: Understat season year (e.g., "2025" for 2025-2026)
+            force_refresh: Always check upstream (e.g. for manual runs)
+
+        Returns:
+            List of fixture dictionaries (same shape as scrape_season_fixtures)
+
+        Raises:
+            ScraperException: If upstream fails and nothing is cached
+        """
+        cached = self.loader.get_cached_fixtures(season)
+
+        if cached and not force_refresh and not is_stale(cached['fixtures'], cached['fetched_at']):
+            self.stats['hits'] += 1
+            logger.info(
+                f"Serving {len(cached['fixtures'])} cached fixtures for {season} "
+                f"(fetched {cached['fetched_at']:%Y-%m-%d %H:%M} UTC)"
+            )
+            return cached['fixtures']
+
+        try:
+            fixtures = self.fetcher.scrape_season_fixtures(season)
+        except ScraperException as e:
+            if not cached:
+                raise
+            self.stats['stale_served'] += 1
+            logger.warning(f"Fixture refresh failed for {season}, serving cached list: {e}")
+            return cached['fixtures']
+
+        if not fixtures and cached:
+            # An empty list is far more likely a bad scrape than a wiped season
+            self.stats['stale_served'] += 1
+            logger.warning(f"Upstream returned no fixtures for {season}, serving cached list")
+            return cached['fixtures']
+
+        list_hash = fixture_list_hash(fixtures)
+        changed = not cached or cached['list_hash'] != list_hash
+
+        self.stats['refreshes'] += 1
+        if not changed:
+            self.stats['unchanged'] += 1
+
+        self.loader.save_fixtures(season, fixtures, list_hash, changed=changed)
+        logger.info(
+            f"Refreshed fixtures for {season}: {len(fixtures)} fixtures "
+            f"({'changed' if changed else 'unchanged'})"
+        )
+        return fixtures
@@ -0,0 +1,351 @@
+"""
+HTML parser backends and lazy table index for FBref pages
+
+FBref stat tables mark every cell with a data-stat attribute, and many of
+them are shipped inside HTML comments (un-commented by JavaScript in the
+browser), so a normal parse of the page silently misses them.
+
+TableIndex scans the raw page once for <table> spans - commented or not -
+and maps each table id to its span. A table is only parsed when a caller
+asks for it, so a page with twenty tables costs one cheap scan plus the
+tables actually read. The small non-table parts of a page (scorebox, team
+stats) are cut out the same way and parsed on their own.
+
+Table backends:
+- bs4:  BeautifulSoup over lxml (the original implementation)
+- lxml: lxml.html tree walked directly; several times faster and the
+        default for scraping
+
+Select with config.FBREF_PARSER_BACKEND / SCRAPER_PARSER_BACKEND, and use
+benchmark_parsers.py to compare them on saved pages.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+import lxml.html
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+TABLE_START = re.compile(r'<table\b[^>]*>', re.IGNORECASE)
+TABLE_END = re.compile(r'</table\s*>', re.IGNORECASE)
+DIV_TAG = re.compile(r'<(/?)div\b[^>]*>', re.IGNORECASE)
+COMMENT_START = '<!--'
+COMMENT_END = '-->'
+
+
+@dataclass
+class ParsedTable:
+    """One data-stat table: its id, classes and body rows"""
+
+    table_id: str
+    classes: Tuple[str, ...]
+    # data-stat names of the last header row, in column order
+    columns: List[str] = field(default_factory=list)
+    # One dict per tbody row: data-stat name -> cell text
+    rows: List[Dict[str, str]] = field(default_factory=list)
+    # Parallel to rows: data-stat name -> href of the cell's first link
+    links: List[Dict[str, str]] = field(default_factory=list)
+
+
+def _attr(tag: str, name: str) -> str:
+    """Read an attribute value from a raw start tag"""
+    match = re.search(rf'\b{name}\s*=\s*["\']([^"\']*)["\']', tag, re.IGNORECASE)
+    return match.group(1) if match else ''
+
+
+def _is_header_row(classes: List[str]) -> bool:
+    """Header rows FBref repeats inside tbody"""
+    return 'thead' in classes
+
+
+def parse_table_soup(markup: str) -> ParsedTable:
+    """Parse one table's markup with BeautifulSoup"""
+    table = BeautifulSoup(markup, 'lxml').find('table')
+    parsed = ParsedTable(table_id=table.get('id', ''), classes=tuple(table.get('class', [])))
+
+    thead = table.find('thead')
+    if thead:
+        header_rows = thead.find_all('tr')
+        if header_rows:
+            parsed.columns = [
+                cell['data-stat'] for cell in header_rows[-1].find_all(['th', 'td'])
+                if cell.get('data-stat')
+            ]
+
+    tbody = table.find('tbody')
+    if not tbody:
+        return parsed
+
+    for row in tbody.find_all('tr'):
+        if _is_header_row(row.get('class', [])):
+            continue
+
+        cells, links = {}, {}
+        for cell in row.find_all(['th', 'td']):
+            stat = cell.get('data-stat')
+            if not stat:
+                continue
+            cells[stat] = cell.get_text(strip=True)
+            link = cell.find('a')
+            if link and link.get('href'):
+                links[stat] = link['href']
+
+        if cells:
+            parsed.rows.append(cells)
+            parsed.links.append(links)
+
+    return parsed
+
+
+def _lxml_text(element) -> str:
+    """Same result as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(part.strip() for part in element.itertext())
+
+
+def parse_table_lxml(markup: str) -> ParsedTable:
+    """Parse one table's markup by walking an lxml tree directly"""
+    root = lxml.html.fromstring(markup)
+    table = root if root.tag == 'table' else root.find('.//table')
+    parsed = ParsedTable(
+        table_id=table.get('id', ''),
+        classes=tuple((table.get('class') or '').split())
+    )
+
+    for thead in table.iterchildren('thead'):
+        header_rows = list(thead.iterchildren('tr'))
+        if header_rows:
+            parsed.columns = [
+                cell.get('data-stat') for cell in header_rows[-1].iterchildren('th', 'td')
+                if cell.get('data-stat')
+            ]
+
+    for tbody in table.iterchildren('tbody'):
+        for row in tbody.iterchildren('tr'):
+            if _is_header_row((row.get('class') or '').split()):
+                continue
+
+            cells, links = {}, {}
+            for cell in row.iterchildren('th', 'td'):
+                stat = cell.get('data-stat')
+                if not stat:
+                    continue
+                cells[stat] = _lxml_text(cell)
+                for link in cell.iter('a'):
+                    if link.get('href'):
+                        links[stat] = link.get('href')
+                    break
+
+            if cells:
+                parsed.rows.append(cells)
+                parsed.links.append(links)
+
+    return parsed
+
+
+PARSER_BACKENDS: Dict[str, Callable[[str], ParsedTable]] = {
+    'bs4': parse_table_soup,
+    'lxml': parse_table_lxml,
+}
+
+
+@dataclass
+class TableEntry:
+    """Location of one table in the raw page"""
+
+    table_id: str
+    classes: Tuple[str, ...]
+    start: int
+    end: int
+    in_comment: bool
+
+
+class TableIndex:
+    """
+    Index of every table on a page, parsed on first access
+
+    Tables are found by scanning the raw markup, so tables inside HTML
+    comments are indexed like any other. Nested tables are not supported
+    (FBref does not use them).
+    """
+
+    def __init__(self, html: str, backend: Optional[str] = None):
+        """
+        Args:
+            html: Decoded page markup
+            backend: Table parser backend ('bs4' or 'lxml', defaults to
+                     config.FBREF_PARSER_BACKEND)
+        """
+        name = backend or config.FBREF_PARSER_BACKEND
+        if name not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {name} (expected one of {sorted(PARSER_BACKENDS)})")
+
+        self.html = html
+        self.parse_table = PARSER_BACKENDS[name]
+        self.entries: List[TableEntry] = []
+        self._by_id: Dict[str, TableEntry] = {}
+        self._parsed: Dict[int, ParsedTable] = {}
+
+        self._scan()
+
+    def _scan(self) -> None:
+        """Record the span of every table, noting those inside comments"""
+        comments = []
+        pos = self.html.find(COMMENT_START)
+        while pos != -1:
+            end = self.html.find(COMMENT_END, pos + len(COMMENT_START))
+            end = len(self.html) if end == -1 else end + len(COMMENT_END)
+            comments.append((pos, end))
+            pos = self.html.find(COMMENT_START, end)
+
+        comment_iter = iter(comments)
+        comment = next(comment_iter, None)
+
+        for match in TABLE_START.finditer(self.html):
+            start = match.start()
+            close = TABLE_END.search(self.html, match.end())
+            end = close.end() if close else len(self.html)
+
+            while comment is not None and comment[1] <= start:
+                comment = next(comment_iter, None)
+
+            tag = match.group(0)
+            entry = TableEntry(
+                table_id=_attr(tag, 'id'),
+                classes=tuple(_attr(tag, 'class').split()),
+                start=start,
+                end=end,
+                in_comment=comment is not None and comment[0] < start
+            )
+            self.entries.append(entry)
+            if entry.table_id:
+                self._by_id.setdefault(entry.table_id, entry)
+
+        logger.debug(
+            f"Indexed {len(self.entries)} tables "
+            f"({sum(e.in_comment for e in self.entries)} inside comments)"
+        )
+
+    def __contains__(self, table_id: str) -> bool:
+        return table_id in self._by_id
+
+    def ids(self) -> List[str]:
+        """Ids of all indexed tables, in page order"""
+        return [e.table_id for e in self.entries if e.table_id]
+
+    def get(self, table_id: str) -> Optional[ParsedTable]:
+        """Return the table with this id (parsed now if needed), or None"""
+        entry = self._by_id.get(table_id)
+        return self._materialize(entry) if entry else None
+
+    def with_prefix(self, prefix: str) -> List[ParsedTable]:
+        """Return all tables whose id starts with prefix, in page order"""
+        return [self._materialize(e) for e in self.entries if e.table_id.startswith(prefix)]
+
+    def with_class(self, css_class: str) -> List[ParsedTable]:
+        """Return all tables carrying a CSS class, in page order"""
+        return [self._materialize(e) for e in self.entries if css_class in e.classes]
+
+    def all(self) -> List[ParsedTable]:
+        """Parse and return every table, in page order"""
+        return [self._materialize(e) for e in self.entries]
+
+    @property
+    def materialized(self) -> int:
+        """Number of tables parsed so far"""
+        return len(self._parsed)
+
+    def _materialize(self, entry: TableEntry) -> ParsedTable:
+        key = entry.start
+        if key not in self._parsed:
+            self._parsed[key] = self.parse_table(self.html[entry.start:entry.end])
+        return self._parsed[key]
+
+
+def element_markup(html: str, attrs: Dict[str, str]) -> str:
+    """
+    Cut the markup of the first <div> matching an id or class out of a page
+
+    Args:
+        html: Decoded page markup
+        attrs: {'id': ...} or {'class': ...} to match
+
+    Returns:
+        The div's markup including nested divs, or '' if not found
+    """
+    if 'id' in attrs:
+        start_tag = re.compile(rf'<div\b[^>]*\bid\s*=\s*["\']{re.escape(attrs["id"])}["\'][^>]*>', re.IGNORECASE)
+    else:
+        start_tag = re.compile(
+            rf'<div\b[^>]*\bclass\s*=\s*["\'](?:[^"\']*\s)?{re.escape(attrs["class"])}(?:\s[^"\']*)?["\'][^>]*>',
+            re.IGNORECASE
+        )
+
+    match = start_tag.search(html)
+    if not match:
+        return ''
+
+    depth = 1
+    for tag in DIV_TAG.finditer(html, match.end()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[match.start():tag.end()]
+
+    return html[match.start():]
+
+
+class ParsedDocument:
+    """A page with a lazy table index and on-demand fragments"""
+
+    def __init__(self, html: Union[bytes, str], backend: Optional[str] = None):
+        """
+        Args:
+            html: Raw page (bytes are decoded as UTF-8, FBref's encoding)
+            backend: Table parser backend (defaults to config.FBREF_PARSER_BACKEND)
+        """
+        if isinstance(html, bytes):
+            html = html.decode('utf-8', errors='replace')
+        self.html = html
+        self.tables = TableIndex(html, backend)
+
+    def data_stat_tables(self) -> List[ParsedTable]:
+        """Parse every table and return those with data-stat rows"""
+        return [t for t in self.tables.all() if t.rows]
+
+    def fragment(self, tag: str, attrs: Dict[str, str]) -> BeautifulSoup:
+        """
+        Return a BeautifulSoup tree containing the first matching element
+
+        Lets the small, irregular parts of a page (scorebox, team stats)
+        keep using the BeautifulSoup extractors without parsing the whole
+        page. The tree is empty if the element is missing.
+
+        Args:
+            tag: Element name (only 'div' is supported)
+            attrs: {'id': ...} or {'class': ...} to match
+        """
+        if tag != 'div':
+            raise ValueError(f"Unsupported fragment tag: {tag}")
+        return BeautifulSoup(element_markup(self.html, attrs), 'lxml')
+
+
+def parse_document(html: Union[bytes, str], backend: Optional[str] = None) -> ParsedDocument:
+    """
+    Index a page for lazy table access with the chosen backend
+
+    Args:
+        html: Raw page
+        backend: 'bs4' or 'lxml' (defaults to config.FBREF_PARSER_BACKEND)
+
+    Returns:
+        ParsedDocument
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    return ParsedDocument(html, backend)
@@ -0,0 +1,327 @@
+"""
+On-disk HTTP response cache for the requests-based scrapers
+
+Page bodies are stored gzip-compressed and content-addressed (sha256 of the
+body), so identical re-fetches share one blob. A small JSON index per URL
+records the most recent distinct versions (config.HTTP_CACHE_MAX_VERSIONS)
+with their fetch time and validators (ETag / Last-Modified). Blobs no index
+refers to any more are deleted by sweep(), which store() runs at most every
+config.HTTP_CACHE_SWEEP_HOURS after dropping a version.
+
+Modes (config.HTTP_CACHE_MODE / SCRAPER_HTTP_CACHE_MODE):
+- off:        no caching, every request goes to the network
+- revalidate: always ask the server, but conditionally; a 304 is served
+              from the cache and the body is not downloaded again
+- replay:     never touch the network; serve purely from the cache and fail
+              on a miss. Use this to re-run parsing over a whole season
+              after a parser fix, e.g.
+
+                  SCRAPER_HTTP_CACHE_MODE=replay python backfill_historical.py 2024
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import List, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import config
+from utils import ScraperException
+
+logger = logging.getLogger(__name__)
+
+CACHE_OFF = 'off'
+CACHE_REVALIDATE = 'revalidate'
+CACHE_REPLAY = 'replay'
+
+SWEEP_MARKER = 'last_sweep'  # Touched by each sweep; its mtime paces automatic sweeps
+_SWEEP_GRACE_SECONDS = 3600  # Never sweep blobs this fresh (their index may not be written yet)
+
+
+@dataclass
+class CacheEntry:
+    """One stored version of a URL's response"""
+
+    fetched_at: str
+    blob: str
+    status_code: int
+    content_type: Optional[str] = None
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    validated_at: Optional[str] = None
+
+
+class ResponseCache:
+    """Content-addressed, compressed on-disk cache of fetched pages"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        mode: Optional[str] = None,
+        max_versions: Optional[int] = None
+    ):
+        """
+        Args:
+            cache_dir: Cache root directory (defaults to config.HTTP_CACHE_DIR)
+            mode: 'off', 'revalidate' or 'replay' (defaults to config.HTTP_CACHE_MODE)
+            max_versions: Versions kept per URL (defaults to config.HTTP_CACHE_MAX_VERSIONS)
+        """
+        self.cache_dir = cache_dir or config.HTTP_CACHE_DIR
+        self.mode = mode or config.HTTP_CACHE_MODE
+        self.max_versions = max(1, max_versions or config.HTTP_CACHE_MAX_VERSIONS)
+
+        if self.mode not in (CACHE_OFF, CACHE_REVALIDATE, CACHE_REPLAY):
+            raise ValueError(f"Unknown HTTP cache mode: {self.mode}")
+
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'dropped': 0}
+
+    @property
+    def replay(self) -> bool:
+        """True if the cache must serve every request without the network"""
+        return self.mode == CACHE_REPLAY
+
+    def get(self, session: requests.Session, url: str, timeout: int) -> requests.Response:
+        """
+        Fetch a URL through the cache according to the cache mode
+
+        Args:
+            session: Session used for network requests
+            url: URL to fetch
+            timeout: Request timeout in seconds
+
+        Returns:
+            Response object (rebuilt from the cache on a hit or a 304)
+
+        Raises:
+            ScraperException: On a cache miss in replay mode
+            requests.RequestException: On network errors
+        """
+        if self.mode == CACHE_OFF:
+            return session.get(url, timeout=timeout)
+
+        entry = self.lookup(url)
+
+        if self.mode == CACHE_REPLAY:
+            if entry is None:
+                self.stats['misses'] += 1
+                raise ScraperException(f"Not in HTTP cache (replay mode): {url}")
+            self.stats['hits'] += 1
+            return self._to_response(url, entry)
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = session.get(url, timeout=timeout, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"Not modified, serving from cache: {url}")
+            entry.validated_at = datetime.utcnow().isoformat()
+            self._update_latest(url, entry)
+            self.stats['revalidated'] += 1
+            return self._to_response(url, entry)
+
+        self.stats['misses'] += 1
+        if response.status_code == 200:
+            self.store(url, response)
+
+        return response
+
+    def lookup(self, url: str, as_of: Optional[datetime] = None) -> Optional[CacheEntry]:
+        """
+        Find the cached version of a URL
+
+        Args:
+            url: URL to look up
+            as_of: Return the latest version fetched at or before this time
+                   (defaults to the latest version)
+
+        Returns:
+            CacheEntry or None if the URL has not been cached
+        """
+        entries = self._read_index(url)
+        if as_of is not None:
+            entries = [e for e in entries if e.fetched_at <= as_of.isoformat()]
+        return entries[-1] if entries else None
+
+    def history(self, url: str) -> List[CacheEntry]:
+        """Return the kept versions of a URL, oldest first"""
+        return self._read_index(url)
+
+    def load(self, entry: CacheEntry) -> bytes:
+        """Read and decompress a cached body"""
+        with gzip.open(self._blob_path(entry.blob), 'rb') as f:
+            return f.read()
+
+    def store(self, url: str, response: requests.Response) -> CacheEntry:
+        """
+        Store a response body and record it as the latest version of the URL
+
+        Versions beyond max_versions are dropped from the URL's index (their
+        blobs go with the next sweep).
+
+        Returns:
+            The new (or unchanged latest) CacheEntry
+        """
+        body = response.content
+        blob = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(blob)
+
+        if os.path.exists(blob_path):
+            os.utime(blob_path)  # Keep a sweep running right now from taking it
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            self._atomic_write(blob_path, gzip.compress(body))
+
+        now = datetime.utcnow().isoformat()
+        entries = self._read_index(url)
+
+        if entries and entries[-1].blob == blob:
+            # Same content as the latest version - just refresh validators
+            entry = entries[-1]
+            entry.validated_at = now
+        else:
+            entry = CacheEntry(fetched_at=now, blob=blob, status_code=response.status_code)
+            entries.append(entry)
+            self.stats['stored'] += 1
+
+        entry.content_type = response.headers.get('Content-Type')
+        entry.encoding = response.encoding
+        entry.etag = response.headers.get('ETag')
+        entry.last_modified = response.headers.get('Last-Modified')
+
+        dropped = len(entries) - self.max_versions
+        self._write_index(url, entries[-self.max_versions:])
+
+        if dropped > 0:
+            self.stats['dropped'] += dropped
+            self._maybe_sweep()
+        return entry
+
+    def sweep(self) -> int:
+        """
+        Delete blobs that no URL's index refers to
+
+        Blobs are shared between URLs with identical bodies, so a blob is only
+        deleted once every index has been checked. Blobs written in the last
+        hour are kept, as a concurrent store() may not have indexed them yet.
+
+        Returns:
+            Number of blobs deleted
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, SWEEP_MARKER), 'a'):
+            os.utime(os.path.join(self.cache_dir, SWEEP_MARKER))
+
+        referenced = set()
+        for dirpath, _, names in os.walk(os.path.join(self.cache_dir, 'index')):
+            for name in names:
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(dirpath, name), 'r') as f:
+                        referenced.update(e['blob'] for e in json.load(f).get('entries', []))
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable cache index {name}: {e}")
+
+        cutoff = time.time() - _SWEEP_GRACE_SECONDS
+        deleted = 0
+        for dirpath, _, names in os.walk(os.path.join(self.cache_dir, 'blobs')):
+            for name in names:
+                if not name.endswith('.gz') or name[:-len('.gz')] in referenced:
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        deleted += 1
+                except FileNotFoundError:
+                    continue
+
+        logger.info(f"HTTP cache sweep deleted {deleted} unreferenced blobs")
+        return deleted
+
+    def _maybe_sweep(self) -> None:
+        """Sweep if the last sweep is older than config.HTTP_CACHE_SWEEP_HOURS"""
+        try:
+            age = time.time() - os.path.getmtime(os.path.join(self.cache_dir, SWEEP_MARKER))
+            if age < config.HTTP_CACHE_SWEEP_HOURS * 3600:
+                return
+        except FileNotFoundError:
+            pass
+        self.sweep()
+
+    def _to_response(self, url: str, entry: CacheEntry) -> requests.Response:
+        """Rebuild a requests.Response from a cache entry"""
+        response = requests.Response()
+        response.url = url
+        response.status_code = entry.status_code
+        response._content = self.load(entry)
+        response.encoding = entry.encoding
+        response.headers = CaseInsensitiveDict({
+            k: v for k, v in (
+                ('Content-Type', entry.content_type),
+                ('ETag', entry.etag),
+                ('Last-Modified', entry.last_modified),
+                ('X-Cache-Fetched-At', entry.fetched_at),
+            ) if v
+        })
+        return response
+
+    def _update_latest(self, url: str, entry: CacheEntry) -> None:
+        """Replace the latest index entry for a URL"""
+        entries = self._read_index(url)
+        if entries:
+            entries[-1] = entry
+            self._write_index(url, entries)
+
+    def _index_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'index', key[:2], f"{key}.json")
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', blob[:2], f"{blob}.gz")
+
+    def _read_index(self, url: str) -> List[CacheEntry]:
+        path = self._index_path(url)
+        if not os.path.exists(path):
+            return []
+
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return [CacheEntry(**e) for e in data.get('entries', [])]
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring corrupt cache index for {url}: {e}")
+            return []
+
+    def _write_index(self, url: str, entries: List[CacheEntry]) -> None:
+        path = self._index_path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {'url': url, 'entries': [asdict(e) for e in entries]}
+        self._atomic_write(path, json.dumps(data, indent=2).encode('utf-8'))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        """Write a file atomically so concurrent readers never see partial data"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -5,22 +5,22 @@ Populate bronze.match_reference table with match metadata
 import sys
 sys.path.insert(0, '/opt/airflow/scrapers')
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from tiered_fetcher import TieredUnderstatFetcher
 from db_loader import DatabaseLoader
 
 def populate_match_reference():
     """Populate match reference table from scraped fixtures"""
-    scraper = UnderstatPlaywrightScraper()
-    loader = DatabaseLoader()
+    with TieredUnderstatFetcher() as scraper:
+        loader = DatabaseLoader()
 
-    print('Fetching fixtures metadata...')
+        print('Fetching fixtures metadata...')
 
-    # Get fixtures from both seasons
-    fixtures_2024 = scraper.scrape_season_fixtures('2024')
-    played_2024 = [f for f in fixtures_2024 if f['is_result']]
+        # Get fixtures from both seasons
+        fixtures_2024 = scraper.scrape_season_fixtures('2024')
+        played_2024 = [f for f in fixtures_2024 if f['is_result']]
 
-    fixtures_2025 = scraper.scrape_season_fixtures('2025')
-    played_2025 = [f for f in fixtures_2025 if f['is_result']]
+        fixtures_2025 = scraper.scrape_season_fixtures('2025')
+        played_2025 = [f for f in fixtures_2025 if f['is_result']]
 
     all_matches = played_2024 + played_2025
 
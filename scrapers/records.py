@@ -0,0 +1,155 @@
+"""
+Compact record types for scraped fixtures, shots, lineups and player stats
+
+The scraper APIs hand plain dicts to the loader because bronze stores JSON.
+Code that keeps many of them in memory (league-wide backfills, fixture
+diffs) can use these records instead: frozen, slotted dataclasses with no
+per-instance __dict__, several times smaller than the equivalent dicts.
+
+Every record converts back with to_dict(), producing exactly the dict the
+scraper APIs return, so JSON payloads are unchanged.
+
+See benchmark_records.py for the memory comparison.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class _Record:
+    """Shared dict conversion for the slotted records below"""
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as the dict the scraper APIs use"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Build a record from its dict form (unknown keys are ignored)"""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+@dataclass(frozen=True, slots=True)
+class Fixture(_Record):
+    """One Understat fixture (see playwright_scraper.build_understat_fixtures)"""
+
+    match_id: Optional[str]
+    match_url: str
+    home_team: str
+    away_team: str
+    match_date: str
+    kickoff_at: Optional[str] = None
+    is_result: bool = False
+
+    @classmethod
+    def from_understat(cls, match_data: Dict[str, Any], base_url: str) -> 'Fixture':
+        """
+        Build a fixture from one entry of Understat's datesData payload
+
+        Args:
+            match_data: datesData entry
+            base_url: Understat base URL used to build the match URL
+        """
+        return cls(
+            match_id=match_data.get('id'),
+            match_url=f"{base_url}/match/{match_data.get('id')}",
+            home_team=match_data.get('h', {}).get('title', ''),
+            away_team=match_data.get('a', {}).get('title', ''),
+            match_date=match_data.get('datetime', '')[:10],
+            kickoff_at=match_data.get('datetime') or None,
+            is_result=match_data.get('isResult', False)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Shot(_Record):
+    """One Understat shot (see shot_batch.SHOT_FIELDS)"""
+
+    shot_id: Optional[str]
+    minute: int
+    player_name: str
+    player_id: Optional[str]
+    x_coord: float
+    y_coord: float
+    xg: float
+    result: str
+    situation: str
+    shot_type: str
+    assisted_by: str
+    last_action: str
+    h_a: str
+    h_team: Optional[str]
+    a_team: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class LineupEntry(_Record):
+    """One player row of an FBref lineup table"""
+
+    player_name: str
+    position: str  # Raw position (e.g., "CM", "LW")
+    position_category: str  # Normalized (GK, DEF, MID, FWD)
+    jersey_number: str
+    team_side: str  # 'home' or 'away'
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerMatchStats(_Record):
+    """
+    One player's FBref stats for a match
+
+    Stats vary by table, so they are kept as (data-stat name, value) pairs;
+    to_dict() flattens them next to player_name and team.
+    """
+
+    player_name: str
+    team: str
+    stats: Tuple[Tuple[str, Any], ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'player_name': self.player_name, 'team': self.team, **dict(self.stats)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PlayerMatchStats':
+        return cls(
+            player_name=data['player_name'],
+            team=data['team'],
+            stats=tuple((k, v) for k, v in data.items() if k not in ('player_name', 'team'))
+        )
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return one stat by data-stat name"""
+        for key, value in self.stats:
+            if key == name:
+                return value
+        return default
+
+    @classmethod
+    def from_columnar(cls, payload: Dict[str, Any]) -> List['PlayerMatchStats']:
+        """
+        Build records from column-oriented player stats
+
+        Args:
+            payload: {'columns': [...], 'data': {column: [values]}} as stored
+                     in a match report's player_stats
+        """
+        stat_columns = [c for c in payload['columns'] if c not in ('player_name', 'team')]
+        data = payload['data']
+
+        return [
+            cls(
+                player_name=player_name,
+                team=team,
+                stats=tuple(zip(stat_columns, values))
+            )
+            for player_name, team, *values in zip(
+                data['player_name'], data['team'], *(data[c] for c in stat_columns)
+            )
+        ]
+
+
+def to_dicts(records: Iterable[_Record]) -> List[Dict[str, Any]]:
+    """Convert records to the dict form the scraper APIs return"""
+    return [record.to_dict() for record in records]
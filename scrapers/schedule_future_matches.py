@@ -11,7 +11,7 @@ from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import requests
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from tiered_fetcher import TieredUnderstatFetcher
 
 logging.basicConfig(
     level=logging.INFO,
@@ -100,11 +100,11 @@ def schedule_future_matches(season: str = "2025"):
     logger.info(f"Season: {season}")
     logger.info("="*60)
     
-    scraper = UnderstatPlaywrightScraper()
+    with TieredUnderstatFetcher() as scraper:
     
-    # Get all fixtures
-    logger.info(f"Fetching fixtures from Understat for {season} season...")
-    fixtures = scraper.scrape_season_fixtures(season)
+        # Get all fixtures
+        logger.info(f"Fetching fixtures from Understat for {season} season...")
+        fixtures = scraper.scrape_season_fixtures(season)
     
     if not fixtures:
         logger.error("No fixtures found!")
@@ -0,0 +1,158 @@
+"""
+Freshness-aware scrape planning from the bronze.scrape_runs ledger
+
+The DAGs used to know only whether a match was in bronze or not. The
+planner reads the ledger for a whole fixture list in one query
+(DatabaseLoader.get_scrape_ledger) and returns a prioritized work list:
+
+1. missing  - played, but no payload yet (or only one scraped before kickoff)
+2. retry    - the last attempts failed and the backoff has elapsed; the delay
+              is config.SCRAPE_RETRY_BASE_MINUTES doubled per consecutive
+              failure, and a match is left alone after
+              config.SCRAPE_MAX_RETRIES failures
+3. refresh  - scraped, but kickoff was under config.SCRAPE_REVISION_DAYS ago
+              (Understat can still revise xG) and the last success is older
+              than config.SCRAPE_REFRESH_HOURS
+
+Matches older than the revision window that were scraped successfully are
+settled and never planned again. Within each group the most recent kickoff
+comes first.
+
+Usage:
+    for task in build_scrape_plan(loader, fixtures):
+        scrape(task.fixture)  # task.reason is 'missing', 'retry' or 'refresh'
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import config
+from fixture_cache import parse_kickoff
+from utils import generate_match_id
+
+logger = logging.getLogger(__name__)
+
+# Plan reasons, highest priority first
+PLAN_REASONS = ('missing', 'retry', 'refresh')
+
+
+@dataclass(frozen=True)
+class ScrapeTask:
+    """One planned match scrape"""
+
+    fixture: Dict[str, Any]
+    match_id: str  # Ledger match ID (see fixture_match_id)
+    reason: str  # One of PLAN_REASONS
+    kickoff: Optional[datetime]
+
+
+def fixture_match_id(fixture: Dict[str, Any]) -> str:
+    """
+    Return the match ID a fixture's scrape is recorded under
+
+    Scraped match data is keyed by generate_match_id(home, away, date)
+    (see playwright_scraper.build_understat_match), not Understat's ID.
+    """
+    return generate_match_id(fixture['home_team'], fixture['away_team'], fixture['match_date'])
+
+
+def retry_delay(failures: int) -> timedelta:
+    """Backoff before retrying a match after consecutive failures"""
+    return timedelta(minutes=config.SCRAPE_RETRY_BASE_MINUTES * 2 ** max(failures - 1, 0))
+
+
+def plan_scrapes(
+    fixtures: List[Dict[str, Any]],
+    ledger: Dict[str, Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> List[ScrapeTask]:
+    """
+    Decide which played fixtures to scrape, and in what order
+
+    Args:
+        fixtures: Fixture dictionaries (unplayed ones are ignored)
+        ledger: get_scrape_ledger result keyed by fixture_match_id
+        now: Planning time in UTC (defaults to now)
+
+    Returns:
+        ScrapeTasks ordered by PLAN_REASONS, then most recent kickoff first
+    """
+    now = now or datetime.utcnow()
+    revision_window = timedelta(days=config.SCRAPE_REVISION_DAYS)
+    refresh_interval = timedelta(hours=config.SCRAPE_REFRESH_HOURS)
+    tasks = []
+
+    for fixture in fixtures:
+        if not fixture.get('is_result'):
+            continue
+
+        match_id = fixture_match_id(fixture)
+        kickoff = parse_kickoff(fixture)
+        entry = ledger.get(match_id, {})
+
+        # Older bronze rows may predate the ledger; their payload still counts
+        successes = [t for t in (entry.get('last_success'), entry.get('payload_scraped_at')) if t]
+        last_success = max(successes) if successes else None
+        if last_success and kickoff and last_success < kickoff:
+            last_success = None  # Pre-match page, not the result
+
+        revisable = kickoff is None or now - kickoff < revision_window
+        failures = entry.get('failures') or 0
+
+        if last_success and not revisable:
+            continue  # Settled
+
+        if failures:
+            if failures >= config.SCRAPE_MAX_RETRIES:
+                logger.debug(f"Not retrying {match_id} after {failures} failures")
+                continue
+            if now < entry['last_failure'] + retry_delay(failures):
+                continue
+            reason = 'retry'
+        elif last_success is None:
+            reason = 'missing'
+        elif now - last_success >= refresh_interval:
+            reason = 'refresh'
+        else:
+            continue
+
+        tasks.append(ScrapeTask(fixture=fixture, match_id=match_id, reason=reason, kickoff=kickoff))
+
+    # Most recent kickoff first; unknown kickoffs last
+    tasks.sort(key=lambda t: (PLAN_REASONS.index(t.reason), t.kickoff is None, -(t.kickoff or now).timestamp()))
+    return tasks
+
+
+def build_scrape_plan(
+    loader,
+    fixtures: List[Dict[str, Any]],
+    scrape_type: str = 'understat',
+    now: Optional[datetime] = None
+) -> List[ScrapeTask]:
+    """
+    Plan scrapes for a fixture list from the scrape_runs ledger
+
+    Args:
+        loader: DatabaseLoader
+        fixtures: Fixture dictionaries (e.g. from FixtureCache)
+        scrape_type: Ledger scrape type
+        now: Planning time in UTC (defaults to now)
+
+    Returns:
+        Prioritized ScrapeTasks (see plan_scrapes)
+    """
+    played = [f for f in fixtures if f.get('is_result')]
+    ledger = loader.get_scrape_ledger(
+        [(fixture_match_id(f), f['match_url']) for f in played], scrape_type
+    )
+    tasks = plan_scrapes(played, ledger, now)
+
+    counts = Counter(task.reason for task in tasks)
+    logger.info(
+        f"Scrape plan: {len(tasks)} of {len(played)} played matches "
+        f"({', '.join(f'{counts[r]} {r}' for r in PLAN_REASONS)})"
+    )
+    return tasks
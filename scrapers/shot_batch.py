@@ -0,0 +1,270 @@
+"""
+Columnar shot batches for Understat shot data
+
+Understat ships every shot as a dict of strings. Instead of converting each
+shot into another dict field by field, ShotBatch keeps a match's shots (or a
+whole league's) as contiguous typed arrays:
+
+- minute / x / y / xg as int32 / float64 arrays
+- result / situation / shot_type as small-integer categorical codes
+- home/away as one boolean array, team names stored once per batch
+
+Totals are vectorized, and to_dicts() rebuilds the per-shot dict form used
+by bronze.understat_raw exactly, so callers can switch representation
+without changing what is stored.
+
+Usage:
+    batch = ShotBatch.from_payload(shots_data, 'Arsenal', 'Chelsea')
+    batch.totals()          # {'home_goals': 2, 'away_goals': 0, 'home_xg': 2.31, ...}
+    batch.side('h').to_dicts(UNDERSTAT_SHOT_FIELDS)
+"""
+
+import logging
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from records import Shot
+from utils import safe_extract_int, safe_extract_float
+
+logger = logging.getLogger(__name__)
+
+# Known category values first, so codes are stable across batches
+SHOT_RESULTS = ('Goal', 'SavedShot', 'MissedShots', 'BlockedShot', 'ShotOnPost', 'OwnGoal')
+SHOT_SITUATIONS = ('OpenPlay', 'FromCorner', 'SetPiece', 'DirectFreekick', 'Penalty')
+SHOT_TYPES = ('RightFoot', 'LeftFoot', 'Head', 'OtherBodyPart')
+
+# Per-shot dict fields, in output order
+UNDERSTAT_SHOT_FIELDS = (
+    'shot_id', 'minute', 'player_name', 'player_id', 'x_coord', 'y_coord', 'xg',
+    'result', 'situation', 'shot_type', 'assisted_by', 'last_action'
+)
+SHOT_FIELDS = UNDERSTAT_SHOT_FIELDS + ('h_a', 'h_team', 'a_team')
+
+
+def _column(shots: Sequence[Dict], key: str, default: Any = '') -> np.ndarray:
+    """Pull one field out of every shot dict as an object array"""
+    values = np.empty(len(shots), dtype=object)
+    try:
+        values[:] = list(map(itemgetter(key), shots))
+    except KeyError:
+        values[:] = [shot.get(key, default) for shot in shots]
+    return values
+
+
+def _numbers(values: np.ndarray, dtype, fallback) -> np.ndarray:
+    """
+    Bulk equivalent of safe_extract_int / safe_extract_float
+
+    Clean values are converted in one C-level pass; if any value is empty or
+    malformed the column is converted with the safe_extract_* fallback, which
+    maps it to 0 like the per-shot parser did.
+    """
+    convert = int if np.issubdtype(dtype, np.integer) else float
+    try:
+        return np.fromiter(map(convert, values), dtype=dtype, count=len(values))
+    except (ValueError, TypeError):
+        return np.fromiter(
+            (fallback(v if v is None else str(v)) for v in values), dtype=dtype, count=len(values)
+        )
+
+
+def _encode(values: np.ndarray, known: Tuple[str, ...]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """
+    Encode values as categorical codes
+
+    Returns:
+        (codes, categories) - known values keep their position; unseen values
+        are appended in first-seen order so nothing is lost
+    """
+    categories = list(known) + [v for v in dict.fromkeys(values) if v not in known]
+    index = {value: code for code, value in enumerate(categories)}
+    codes = np.fromiter(
+        (index[v] for v in values),
+        dtype=np.min_scalar_type(len(categories)),
+        count=len(values)
+    )
+    return codes, tuple(categories)
+
+
+def _decode(codes: np.ndarray, categories: Tuple[str, ...]) -> np.ndarray:
+    lookup = np.empty(len(categories), dtype=object)
+    lookup[:] = categories
+    return lookup[codes]
+
+
+@dataclass
+class ShotBatch:
+    """A batch of Understat shots stored as parallel typed arrays"""
+
+    home_team: Optional[str]
+    away_team: Optional[str]
+    home: np.ndarray  # bool: True for home-team shots
+    shot_id: np.ndarray  # object
+    minute: np.ndarray  # int32
+    player_name: np.ndarray  # object
+    player_id: np.ndarray  # object
+    x: np.ndarray  # float64, 0-1 normalized
+    y: np.ndarray  # float64, 0-1 normalized
+    xg: np.ndarray  # float64
+    result: np.ndarray  # categorical codes into result_categories
+    situation: np.ndarray  # categorical codes into situation_categories
+    shot_type: np.ndarray  # categorical codes into shot_type_categories
+    assisted_by: np.ndarray  # object
+    last_action: np.ndarray  # object
+    result_categories: Tuple[str, ...] = SHOT_RESULTS
+    situation_categories: Tuple[str, ...] = SHOT_SITUATIONS
+    shot_type_categories: Tuple[str, ...] = SHOT_TYPES
+
+    @classmethod
+    def from_payload(
+        cls,
+        shots_data: Dict[str, List[Dict]],
+        home_team: Optional[str] = None,
+        away_team: Optional[str] = None
+    ) -> 'ShotBatch':
+        """
+        Build a batch from Understat's shotsData payload
+
+        Args:
+            shots_data: Parsed shotsData dict with 'h' and 'a' shot lists
+            home_team: Home team name
+            away_team: Away team name
+
+        Returns:
+            ShotBatch with home shots first, then away shots
+        """
+        home_shots = shots_data.get('h') or []
+        shots = list(home_shots) + list(shots_data.get('a') or [])
+
+        home = np.zeros(len(shots), dtype=bool)
+        home[:len(home_shots)] = True
+
+        result, result_categories = _encode(_column(shots, 'result'), SHOT_RESULTS)
+        situation, situation_categories = _encode(_column(shots, 'situation'), SHOT_SITUATIONS)
+        shot_type, shot_type_categories = _encode(_column(shots, 'shotType'), SHOT_TYPES)
+
+        return cls(
+            home_team=home_team,
+            away_team=away_team,
+            home=home,
+            shot_id=_column(shots, 'id', None),
+            minute=_numbers(_column(shots, 'minute'), np.int32, safe_extract_int),
+            player_name=_column(shots, 'player'),
+            player_id=_column(shots, 'player_id', None),
+            x=_numbers(_column(shots, 'X'), np.float64, safe_extract_float),
+            y=_numbers(_column(shots, 'Y'), np.float64, safe_extract_float),
+            xg=_numbers(_column(shots, 'xG'), np.float64, safe_extract_float),
+            result=result,
+            situation=situation,
+            shot_type=shot_type,
+            assisted_by=_column(shots, 'player_assisted'),
+            last_action=_column(shots, 'lastAction'),
+            result_categories=result_categories,
+            situation_categories=situation_categories,
+            shot_type_categories=shot_type_categories,
+        )
+
+    def __len__(self) -> int:
+        return len(self.home)
+
+    def select(self, mask: np.ndarray) -> 'ShotBatch':
+        """Return the shots where mask is True (categories are shared)"""
+        return ShotBatch(
+            home_team=self.home_team,
+            away_team=self.away_team,
+            home=self.home[mask],
+            shot_id=self.shot_id[mask],
+            minute=self.minute[mask],
+            player_name=self.player_name[mask],
+            player_id=self.player_id[mask],
+            x=self.x[mask],
+            y=self.y[mask],
+            xg=self.xg[mask],
+            result=self.result[mask],
+            situation=self.situation[mask],
+            shot_type=self.shot_type[mask],
+            assisted_by=self.assisted_by[mask],
+            last_action=self.last_action[mask],
+            result_categories=self.result_categories,
+            situation_categories=self.situation_categories,
+            shot_type_categories=self.shot_type_categories,
+        )
+
+    def side(self, h_a: str) -> 'ShotBatch':
+        """Return the home ('h') or away ('a') shots"""
+        return self.select(self.home if h_a == 'h' else ~self.home)
+
+    def is_result(self, result: str) -> np.ndarray:
+        """Boolean mask of shots with a given result (e.g. 'Goal')"""
+        if result not in self.result_categories:
+            return np.zeros(len(self), dtype=bool)
+        return self.result == self.result_categories.index(result)
+
+    def totals(self) -> Dict[str, Any]:
+        """
+        Goals and xG per side
+
+        Returns:
+            {'home_goals', 'away_goals', 'home_xg', 'away_xg'} with xG
+            rounded to 2 decimals
+        """
+        goals = self.is_result('Goal')
+        return {
+            'home_goals': int(np.count_nonzero(goals & self.home)),
+            'away_goals': int(np.count_nonzero(goals & ~self.home)),
+            'home_xg': round(float(self.xg[self.home].sum()), 2),
+            'away_xg': round(float(self.xg[~self.home].sum()), 2),
+        }
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Every output field as an array (categoricals decoded)"""
+        return {
+            'shot_id': self.shot_id,
+            'minute': self.minute,
+            'player_name': self.player_name,
+            'player_id': self.player_id,
+            'x_coord': self.x,
+            'y_coord': self.y,
+            'xg': self.xg,
+            'result': _decode(self.result, self.result_categories),
+            'situation': _decode(self.situation, self.situation_categories),
+            'shot_type': _decode(self.shot_type, self.shot_type_categories),
+            'assisted_by': self.assisted_by,
+            'last_action': self.last_action,
+            'h_a': _decode((~self.home).view(np.uint8), ('h', 'a')),
+            'h_team': np.full(len(self), self.home_team, dtype=object),
+            'a_team': np.full(len(self), self.away_team, dtype=object),
+        }
+
+    def to_dicts(self, fields: Iterable[str] = SHOT_FIELDS) -> List[Dict[str, Any]]:
+        """
+        Convert to the per-shot dict form (plain Python values)
+
+        Args:
+            fields: Fields to include, in order (defaults to SHOT_FIELDS;
+                    UNDERSTAT_SHOT_FIELDS drops the side and team names)
+        """
+        fields = list(fields)
+        columns = self.columns()
+        values = [columns[name].tolist() for name in fields]
+        return [dict(zip(fields, row)) for row in zip(*values)]
+
+    def to_records(self) -> List[Shot]:
+        """Convert to immutable Shot records (see records.py)"""
+        columns = self.columns()
+        return [Shot(*row) for row in zip(*(columns[name].tolist() for name in SHOT_FIELDS))]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the batch as a DataFrame with pandas categoricals"""
+        frame = pd.DataFrame(self.columns())
+        for name, codes, categories in (
+            ('result', self.result, self.result_categories),
+            ('situation', self.situation, self.situation_categories),
+            ('shot_type', self.shot_type, self.shot_type_categories),
+        ):
+            frame[name] = pd.Categorical.from_codes(codes, categories=categories)
+        return frame
@@ -0,0 +1,241 @@
+"""
+Tiered Understat fetcher - plain HTTP first, Playwright only when needed
+
+Understat embeds datesData/shotsData as JSON.parse('...') literals in the page
+HTML, so a plain requests fetch is normally enough. The browser is only
+launched when the HTTP response looks blocked or the payload is missing, and
+the tier that worked is remembered per URL pattern so later pages of the same
+kind go straight to it.
+
+The fetcher returns the same fixture/match dictionaries as
+UnderstatPlaywrightScraper, whichever tier served the page.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
+
+from config import config
+from understat_scraper import UnderstatScraper
+from understat_payload import extract_payloads
+from playwright_scraper import (
+    UnderstatPlaywrightScraper,
+    build_understat_fixtures,
+    build_understat_match
+)
+from utils import ScraperException, get_pacing_metrics
+
+logger = logging.getLogger(__name__)
+
+TIER_HTTP = 'http'
+TIER_BROWSER = 'browser'
+
+# Markers of bot-protection / challenge pages served instead of content
+BLOCKED_PAGE_MARKERS = (
+    'cf-browser-verification',
+    'challenge-platform',
+    'Just a moment...',
+    'Attention Required!',
+    'captcha',
+)
+
+# Challenge pages show their markers near the top; only this much is checked
+BLOCK_SNIFF_BYTES = 5000
+
+
+def url_pattern(url: str) -> str:
+    """
+    Reduce a URL to a pattern shared by pages of the same kind
+
+    Numeric path segments are replaced, e.g. /match/26602 -> /match/{n}
+    and /team/Arsenal/2024 -> /team/Arsenal/{n}.
+    """
+    parsed = urlparse(url)
+    path = re.sub(r'/\d+(?=/|$)', '/{n}', parsed.path)
+    return f"{parsed.netloc}{path}"
+
+
+def looks_blocked(html: str) -> bool:
+    """Return True if the HTML looks like a bot-protection page"""
+    head = html[:BLOCK_SNIFF_BYTES]
+    return any(marker in head for marker in BLOCKED_PAGE_MARKERS)
+
+
+class TieredUnderstatFetcher:
+    """
+    Fetch Understat fixtures and shots via HTTP, falling back to Playwright
+
+    Usage:
+        with TieredUnderstatFetcher() as fetcher:
+            fixtures = fetcher.scrape_season_fixtures("2025")
+            match = fetcher.scrape_match_shots(fixtures[0]['match_url'])
+    """
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self.base_url = config.UNDERSTAT_BASE_URL
+        self.http = UnderstatScraper()
+        self._browser_scraper: Optional[UnderstatPlaywrightScraper] = None
+
+        # URL pattern -> tier that last served it successfully
+        self.tiers: Dict[str, str] = {}
+        # URL pattern -> browser fetches since HTTP was last tried
+        self._browser_streak: Dict[str, int] = {}
+
+        self.stats = {'http': 0, 'browser': 0, 'fallbacks': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Close the Playwright fallback if it was started"""
+        if self._browser_scraper is not None:
+            self._browser_scraper.close()
+            self._browser_scraper = None
+
+        logger.info(f"Tiered fetcher stats: {self.stats}")
+        for host, metrics in get_pacing_metrics().items():
+            logger.info(f"Pacing {host}: {metrics}")
+
+    @property
+    def browser(self) -> UnderstatPlaywrightScraper:
+        """Playwright scraper, launched on first use"""
+        if self._browser_scraper is None:
+            self._browser_scraper = UnderstatPlaywrightScraper(headless=self.headless)
+            self._browser_scraper.open()
+        return self._browser_scraper
+
+    def scrape_season_fixtures(self, season: str = "2024") -> List[Dict[str, Any]]:
+        """
+        Scrape all Arsenal fixtures from Understat for a season
+
+        Args:
+            season: Season year (e.g., "2024" for 2024-2025)
+
+        Returns:
+            List of fixture dictionaries with match URLs
+        """
+        arsenal_url = f"{self.base_url}/team/Arsenal/{season}"
+
+        if self._should_try_http(arsenal_url):
+            payloads = self._fetch_http(arsenal_url, ['datesData'])
+            if payloads is not None:
+                fixtures = build_understat_fixtures(payloads['datesData'], self.base_url)
+                logger.info(f"Scraped {len(fixtures)} fixtures from Understat (http)")
+                return fixtures
+
+        fixtures = self.browser.scrape_season_fixtures(season)
+        self._record_browser(arsenal_url)
+        return fixtures
+
+    def scrape_match_shots(
+        self,
+        match_url: str,
+        home_team: str = None,
+        away_team: str = None,
+        match_date: str = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape shot-level data for a specific match
+
+        Args:
+            match_url: Full URL to the match page
+            home_team: Optional home team name (from fixture list)
+            away_team: Optional away team name (from fixture list)
+            match_date: Optional match date (from fixture list)
+
+        Returns:
+            Dictionary containing match info and shot data
+        """
+        if self._should_try_http(match_url):
+            payloads = self._fetch_http(match_url, ['shotsData', 'match_info'])
+            if payloads is not None:
+                match_info = payloads.get('match_info') or {}
+                match_data = build_understat_match(
+                    payloads['shotsData'],
+                    match_url,
+                    home_team or match_info.get('team_h'),
+                    away_team or match_info.get('team_a'),
+                    match_date or (match_info.get('date') or '')[:10] or None
+                )
+                logger.info(
+                    f"Scraped {len(match_data['shots'])} shots for "
+                    f"{match_data['home_team']} vs {match_data['away_team']} (http)"
+                )
+                return match_data
+
+        match_data = self.browser.scrape_match_shots(
+            match_url,
+            home_team=home_team,
+            away_team=away_team,
+            match_date=match_date
+        )
+        self._record_browser(match_url)
+        return match_data
+
+    def _should_try_http(self, url: str) -> bool:
+        """Decide whether to try the HTTP tier for a URL"""
+        pattern = url_pattern(url)
+        if self.tiers.get(pattern) != TIER_BROWSER:
+            return True
+
+        # Periodically re-probe HTTP in case the block was temporary
+        return self._browser_streak.get(pattern, 0) >= config.TIERED_HTTP_REPROBE_INTERVAL
+
+    def _fetch_http(self, url: str, var_names: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a page over HTTP and extract its embedded JSON variables
+
+        The first name in var_names is required; the others are optional.
+
+        Returns:
+            Dict of variable name -> parsed payload, or None if the HTTP tier
+            could not serve the page (blocked, failed or payload missing)
+        """
+        pattern = url_pattern(url)
+
+        try:
+            response = self.http._make_request(url)
+            body = response.content
+        except ScraperException as e:
+            if self.http.cache.replay:
+                # Replay mode must never reach the network, browser included
+                raise
+            logger.warning(f"HTTP tier failed for {url}, falling back to browser: {e}")
+            return self._record_fallback(pattern)
+
+        if looks_blocked(body[:BLOCK_SNIFF_BYTES].decode('utf-8', errors='replace')):
+            if self.http.cache.replay:
+                raise ScraperException(f"Cached page is a block page (replay mode): {url}")
+            logger.warning(f"HTTP tier looks blocked for {url}, falling back to browser")
+            return self._record_fallback(pattern)
+
+        payloads = extract_payloads(body, var_names)
+        if payloads.get(var_names[0]) is None:
+            if self.http.cache.replay:
+                raise ScraperException(f"{var_names[0]} missing from cached page (replay mode): {url}")
+            logger.warning(f"{var_names[0]} missing from HTTP response for {url}, falling back to browser")
+            return self._record_fallback(pattern)
+
+        self.tiers[pattern] = TIER_HTTP
+        self._browser_streak.pop(pattern, None)
+        self.stats['http'] += 1
+        return payloads
+
+    def _record_fallback(self, pattern: str) -> None:
+        """Remember that the HTTP tier did not work for a URL pattern"""
+        self.tiers[pattern] = TIER_BROWSER
+        self._browser_streak[pattern] = 0
+        self.stats['fallbacks'] += 1
+        return None
+
+    def _record_browser(self, url: str) -> None:
+        """Count a page served by the browser tier"""
+        pattern = url_pattern(url)
+        self.tiers.setdefault(pattern, TIER_BROWSER)
+        self._browser_streak[pattern] = self._browser_streak.get(pattern, 0) + 1
+        self.stats['browser'] += 1
@@ -0,0 +1,146 @@
+"""
+Fast extraction of Understat's embedded JSON payloads
+
+Understat pages carry their data as JavaScript string literals:
+
+    var shotsData = JSON.parse('\\x7B\\x22h\\x22\\x3A...');
+
+This module finds those literals with one regex pass over the raw response
+bytes (no HTML parse) and decodes them with JavaScript string semantics:
+
+- the page bytes are UTF-8, so raw non-ASCII characters (player names such
+  as "Ødegaard") come out intact - unlike .encode().decode('unicode_escape'),
+  which reads them as Latin-1 and mangles them
+- \\xNN, \\uNNNN, \\u{...} and the single-character escapes map to the
+  characters JavaScript would produce
+
+The common case - every escape is an ASCII \\xNN - takes a split/join fast
+path; anything else goes through a general (slower) decoder.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# var <name> = JSON.parse('<literal>') - the literal may contain escaped quotes
+PAYLOAD_PATTERN = re.compile(
+    rb"var\s+([A-Za-z_$][\w$]*)\s*=\s*JSON\.parse\(\s*'([^'\\]*(?:\\.[^'\\]*)*)'\s*\)"
+)
+
+# Payload variables found on Understat team, match and player pages
+UNDERSTAT_PAYLOADS = (
+    'datesData', 'shotsData', 'rostersData', 'match_info',
+    'teamsData', 'playersData', 'statisticsData', 'groupsData', 'minMaxPlayerStats'
+)
+
+# Two hex digits (any case) -> the ASCII byte they escape
+_ASCII_HEX = {
+    (hi + lo).encode('ascii'): bytes([code])
+    for code in range(128)
+    for hi in {f'{code:02x}'[0], f'{code:02X}'[0]}
+    for lo in {f'{code:02x}'[1], f'{code:02X}'[1]}
+}
+
+_SIMPLE_ESCAPES = {
+    'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+    '\n': '', '\r\n': '', '\r': '', '\u2028': '', '\u2029': '',  # Line continuations
+}
+
+_JS_ESCAPE = re.compile(
+    r"\\(?:x([0-9A-Fa-f]{2})|u([0-9A-Fa-f]{4})|u\{([0-9A-Fa-f]{1,6})\}|(\r\n|[\s\S]))"
+)
+
+
+def _replace_escape(match) -> str:
+    hex2, hex4, code_point, char = match.groups()
+    if hex2 is not None:
+        return chr(int(hex2, 16))
+    if hex4 is not None:
+        return chr(int(hex4, 16))
+    if code_point is not None:
+        return chr(int(code_point, 16))
+    return _SIMPLE_ESCAPES.get(char, char)
+
+
+def decode_js_string(literal: Union[bytes, str]) -> str:
+    """
+    Decode the body of a single-quoted JavaScript string literal
+
+    Args:
+        literal: Literal body as it appears in the page (UTF-8 bytes or str)
+
+    Returns:
+        The string value JavaScript would produce
+    """
+    if isinstance(literal, bytes):
+        if b'\\' not in literal:
+            return literal.decode('utf-8')
+
+        # Fast path: every backslash starts an ASCII \xNN escape
+        parts = literal.split(b'\\x')
+        if literal.count(b'\\') == len(parts) - 1:
+            try:
+                decoded = [parts[0]]
+                for part in parts[1:]:
+                    decoded.append(_ASCII_HEX[part[:2]])
+                    decoded.append(part[2:])
+                return b''.join(decoded).decode('utf-8')
+            except KeyError:
+                pass  # \x80-\xFF or a malformed escape: use the general decoder
+
+        literal = literal.decode('utf-8')
+
+    text = _JS_ESCAPE.sub(_replace_escape, literal)
+
+    # \uD83D\uDE00-style surrogate pairs -> one character
+    if any('\ud800' <= c <= '\udfff' for c in text):
+        text = text.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+    return text
+
+
+def extract_payloads(
+    html: Union[bytes, str],
+    names: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Extract and parse every JSON.parse('...') payload on an Understat page
+
+    Args:
+        html: Raw page (bytes preferred - nothing is decoded but the payloads)
+        names: Variable names to keep (defaults to all found)
+
+    Returns:
+        Dict of variable name -> parsed payload. Variables that are missing
+        or fail to decode are left out.
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+
+    wanted = set(names) if names is not None else None
+    payloads = {}
+
+    for match in PAYLOAD_PATTERN.finditer(html):
+        name = match.group(1).decode('ascii')
+        if (wanted is not None and name not in wanted) or name in payloads:
+            continue
+
+        try:
+            payloads[name] = json.loads(decode_js_string(match.group(2)))
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.error(f"Error decoding {name}: {e}")
+
+    return payloads
+
+
+def extract_payload(html: Union[bytes, str], name: str) -> Optional[Any]:
+    """
+    Extract one payload variable from an Understat page
+
+    Returns:
+        Parsed payload, or None if the variable is not present or invalid
+    """
+    return extract_payloads(html, (name,)).get(name)
@@ -8,19 +8,17 @@ This module scrapes:
 """
 
 import logging
-import re
-import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup
 
 from config import config
+from http_cache import ResponseCache
+from understat_payload import extract_payload, extract_payloads
+from shot_batch import ShotBatch, UNDERSTAT_SHOT_FIELDS
 from utils import (
     get_session_with_retries,
-    rate_limit,
-    safe_extract_int,
-    safe_extract_float,
+    get_pacer,
     ScraperException,
     DataValidationException
 )
@@ -28,18 +26,39 @@ from utils import (
 logger = logging.getLogger(__name__)
 
 
+def extract_json_var(html: Union[bytes, str], var_name: str) -> Optional[Any]:
+    """
+    Extract a JSON.parse('...') payload assigned to a JavaScript variable
+
+    Understat embeds its data as e.g. var shotsData = JSON.parse('...').
+    See understat_payload.py for the extraction and decoding.
+
+    Args:
+        html: Raw page (bytes or decoded HTML)
+        var_name: JavaScript variable name (e.g. 'datesData', 'shotsData')
+
+    Returns:
+        Parsed payload, or None if the variable is not present or invalid
+    """
+    return extract_payload(html, var_name)
+
+
 class UnderstatScraper:
     """Scraper for Understat shot-level xG data"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         self.session = get_session_with_retries()
+        self.cache = cache or ResponseCache()
         self.base_url = config.UNDERSTAT_BASE_URL
 
-    @rate_limit(config.UNDERSTAT_REQUEST_DELAY)
     def _make_request(self, url: str) -> requests.Response:
         """
         Make HTTP request with rate limiting
 
+        Pages are served through the on-disk response cache; in replay mode
+        they come straight from the cache without touching the network (or
+        the rate limiter).
+
         Args:
             url: URL to fetch
 
@@ -49,9 +68,21 @@ class UnderstatScraper:
         Raises:
             ScraperException: If request fails
         """
+        if self.cache.replay:
+            return self.cache.get(self.session, url, timeout=config.REQUEST_TIMEOUT)
+
+        return self._fetch(url)
+
+    def _fetch(self, url: str) -> requests.Response:
+        """Fetch a URL from the network (adaptively paced, conditional if cached)"""
+        pacer = get_pacer(
+            config.understat_host, config.UNDERSTAT_REQUEST_DELAY, config.UNDERSTAT_MIN_REQUEST_DELAY
+        )
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=config.REQUEST_TIMEOUT)
+            response = pacer.request(
+                lambda: self.cache.get(self.session, url, timeout=config.REQUEST_TIMEOUT)
+            )
             response.raise_for_status()
             return response
         except requests.RequestException as e:
@@ -84,39 +115,22 @@ class UnderstatScraper:
 
         try:
             response = self._make_request(arsenal_url)
-            soup = BeautifulSoup(response.content, 'lxml')
-
-            # Understat embeds match data in JavaScript
-            # Find the script containing match data
-            scripts = soup.find_all('script')
-
-            for script in scripts:
-                script_text = script.string
-                if not script_text or 'datesData' not in script_text:
-                    continue
-
-                # Extract JSON data from JavaScript
-                # Pattern: var datesData = JSON.parse('...')
-                match = re.search(r"var datesData\s*=\s*JSON\.parse\('(.+?)'\)", script_text)
-                if not match:
-                    continue
-
-                # Decode escaped JSON string
-                json_str = match.group(1).encode().decode('unicode_escape')
-                matches_data = json.loads(json_str)
-
-                # Search for matching fixture
-                for match_data in matches_data:
-                    match_home = match_data.get('h', {}).get('title', '')
-                    match_away = match_data.get('a', {}).get('title', '')
-                    match_id = match_data.get('id')
-
-                    # Check if teams match (case-insensitive, flexible matching)
-                    if (self._teams_match(match_home, home_team) and
-                        self._teams_match(match_away, away_team)):
-                        match_url = f"{self.base_url}/match/{match_id}"
-                        logger.info(f"Found Understat match: {match_url}")
-                        return match_url
+
+            # Understat embeds match data as var datesData = JSON.parse('...')
+            matches_data = extract_payload(response.content, 'datesData') or []
+
+            # Search for matching fixture
+            for match_data in matches_data:
+                match_home = match_data.get('h', {}).get('title', '')
+                match_away = match_data.get('a', {}).get('title', '')
+                match_id = match_data.get('id')
+
+                # Check if teams match (case-insensitive, flexible matching)
+                if (self._teams_match(match_home, home_team) and
+                    self._teams_match(match_away, away_team)):
+                    match_url = f"{self.base_url}/match/{match_id}"
+                    logger.info(f"Found Understat match: {match_url}")
+                    return match_url
 
             logger.warning(f"Could not find Understat match for {home_team} vs {away_team}")
             return None
@@ -150,7 +164,7 @@ class UnderstatScraper:
             ScraperException: If scraping fails
         """
         response = self._make_request(match_url)
-        soup = BeautifulSoup(response.content, 'lxml')
+        payloads = extract_payloads(response.content, ('shotsData', 'match_info'))
 
         match_data = {
             'match_url': match_url,
@@ -160,11 +174,11 @@ class UnderstatScraper:
         }
 
         # Extract match info
-        match_info = self._extract_match_info(soup)
+        match_info = self._extract_match_info(payloads.get('match_info'))
         match_data.update(match_info)
 
         # Extract shot data from JavaScript
-        shot_data = self._extract_shot_data(soup)
+        shot_data = self._extract_shot_data(payloads.get('shotsData'))
         match_data['home_shots'] = shot_data.get('home', [])
         match_data['away_shots'] = shot_data.get('away', [])
 
@@ -177,100 +191,37 @@ class UnderstatScraper:
 
         return match_data
 
-    def _extract_match_info(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Extract basic match information"""
+    def _extract_match_info(self, match_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extract basic match information from the match_info payload"""
         info = {}
 
-        # Find team names and scores
-        # Understat structure: div.header with team names
-        header = soup.find('div', {'class': 'header-wrapper'})
-        if header:
-            teams = header.find_all('div', {'class': 'team-name'})
-            if len(teams) >= 2:
-                info['home_team'] = teams[0].get_text(strip=True)
-                info['away_team'] = teams[1].get_text(strip=True)
+        if match_info and match_info.get('team_h') and match_info.get('team_a'):
+            info['home_team'] = match_info['team_h']
+            info['away_team'] = match_info['team_a']
 
         return info
 
-    def _extract_shot_data(self, soup: BeautifulSoup) -> Dict[str, List[Dict]]:
+    def _extract_shot_data(self, shots: Optional[Dict[str, List[Dict]]]) -> Dict[str, List[Dict]]:
         """
-        Extract shot data from JavaScript embedded in page
+        Parse the shotsData payload embedded in the match page
 
-        Understat embeds shot data in JavaScript variables
+        Args:
+            shots: {'h': [...], 'a': [...]} as extracted from the page
         """
         shot_data = {'home': [], 'away': []}
 
-        scripts = soup.find_all('script')
-
-        for script in scripts:
-            script_text = script.string
-            if not script_text or 'shotsData' not in script_text:
-                continue
+        if not shots:
+            return shot_data
 
-            # Extract home shots
-            home_match = re.search(r"var shotsData\s*=\s*JSON\.parse\('(.+?)'\)", script_text)
-            if home_match:
-                try:
-                    json_str = home_match.group(1).encode().decode('unicode_escape')
-                    shots = json.loads(json_str)
-
-                    # Parse shots
-                    home_shots = shots.get('h', [])
-                    away_shots = shots.get('a', [])
-
-                    shot_data['home'] = self._parse_shots(home_shots)
-                    shot_data['away'] = self._parse_shots(away_shots)
-
-                except Exception as e:
-                    logger.error(f"Error parsing shot data: {e}")
+        try:
+            batch = ShotBatch.from_payload(shots)
+            shot_data['home'] = batch.side('h').to_dicts(UNDERSTAT_SHOT_FIELDS)
+            shot_data['away'] = batch.side('a').to_dicts(UNDERSTAT_SHOT_FIELDS)
+        except Exception as e:
+            logger.error(f"Error parsing shot data: {e}")
 
         return shot_data
 
-    def _parse_shots(self, shots: List[Dict]) -> List[Dict[str, Any]]:
-        """
-        Parse and normalize shot data
-
-        Args:
-            shots: List of raw shot dictionaries from Understat
-
-        Returns:
-            List of normalized shot dictionaries
-        """
-        parsed_shots = []
-
-        for shot in shots:
-            try:
-                parsed_shot = {
-                    'shot_id': shot.get('id'),
-                    'minute': safe_extract_int(shot.get('minute')),
-                    'player_name': shot.get('player', ''),
-                    'player_id': shot.get('player_id'),
-
-                    # Shot coordinates (0-1 normalized)
-                    'x_coord': safe_extract_float(shot.get('X')),
-                    'y_coord': safe_extract_float(shot.get('Y')),
-
-                    # xG value
-                    'xg': safe_extract_float(shot.get('xG')),
-
-                    # Shot details
-                    'result': shot.get('result', ''),  # Goal, SavedShot, MissedShots, BlockedShot, ShotOnPost
-                    'situation': shot.get('situation', ''),  # OpenPlay, FromCorner, SetPiece, DirectFreekick
-                    'shot_type': shot.get('shotType', ''),  # RightFoot, LeftFoot, Head, OtherBodyPart
-
-                    # Assist information
-                    'assisted_by': shot.get('player_assisted', ''),
-                    'last_action': shot.get('lastAction', '')  # Pass, Throughball, Cross, Chipped, etc.
-                }
-
-                parsed_shots.append(parsed_shot)
-
-            except Exception as e:
-                logger.warning(f"Error parsing shot: {e}")
-                continue
-
-        return parsed_shots
-
     def scrape_season_fixtures(self, season: str = "2024") -> List[Dict[str, Any]]:
         """
         Scrape all Arsenal fixtures from Understat for a season
@@ -284,41 +235,23 @@ class UnderstatScraper:
         arsenal_url = f"{self.base_url}/team/Arsenal/{season}"
 
         response = self._make_request(arsenal_url)
-        soup = BeautifulSoup(response.content, 'lxml')
 
         fixtures = []
 
-        scripts = soup.find_all('script')
-
-        for script in scripts:
-            script_text = script.string
-            if not script_text or 'datesData' not in script_text:
-                continue
-
-            try:
-                # Extract fixtures data
-                match = re.search(r"var datesData\s*=\s*JSON\.parse\('(.+?)'\)", script_text)
-                if not match:
-                    continue
-
-                json_str = match.group(1).encode().decode('unicode_escape')
-                matches_data = json.loads(json_str)
-
-                for match_data in matches_data:
-                    fixture = {
-                        'match_id': match_data.get('id'),
-                        'match_url': f"{self.base_url}/match/{match_data.get('id')}",
-                        'home_team': match_data.get('h', {}).get('title', ''),
-                        'away_team': match_data.get('a', {}).get('title', ''),
-                        'date': match_data.get('datetime', ''),
-                        'is_result': match_data.get('isResult', False)
-                    }
-                    fixtures.append(fixture)
-
-                break
-
-            except Exception as e:
-                logger.error(f"Error parsing fixtures: {e}")
+        try:
+            for match_data in extract_payload(response.content, 'datesData') or []:
+                fixture = {
+                    'match_id': match_data.get('id'),
+                    'match_url': f"{self.base_url}/match/{match_data.get('id')}",
+                    'home_team': match_data.get('h', {}).get('title', ''),
+                    'away_team': match_data.get('a', {}).get('title', ''),
+                    'date': match_data.get('datetime', ''),
+                    'is_result': match_data.get('isResult', False)
+                }
+                fixtures.append(fixture)
+
+        except Exception as e:
+            logger.error(f"Error parsing fixtures: {e}")
 
         logger.info(f"Scraped {len(fixtures)} fixtures from Understat")
         return fixtures
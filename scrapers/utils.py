@@ -2,9 +2,16 @@
 Utility functions for web scraping
 """
 
+import asyncio
+import json
+import os
+import re
+import threading
 import time
 import logging
-from typing import Optional, Callable, Any
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Callable, Any
 from functools import wraps
 import requests
 from requests.adapters import HTTPAdapter
@@ -12,6 +19,11 @@ from urllib3.util.retry import Retry
 
 from config import config
 
+try:
+    import fcntl
+except ImportError:  # Non-POSIX: limiter is only shared within the process
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +40,9 @@ def get_session_with_retries() -> requests.Session:
     retry_strategy = Retry(
         total=config.MAX_RETRIES,
         backoff_factor=config.RETRY_BACKOFF_FACTOR,
-        status_forcelist=[429, 500, 502, 503, 504],
+        # 429/503 are handled by AdaptivePacer so it can slow down and
+        # honour Retry-After instead of retrying blindly
+        status_forcelist=[500, 502, 504],
         allowed_methods=["HEAD", "GET", "OPTIONS"]
     )
 
@@ -50,35 +64,454 @@ def get_session_with_retries() -> requests.Session:
     return session
 
 
-def rate_limit(delay: float):
+class HostRateLimiter:
+    """
+    Token-bucket rate limiter shared by everything that talks to one host
+
+    Bucket state lives in a small JSON file guarded by an exclusive flock, so
+    the budget is shared across scraper instances, threads, asyncio tasks and
+    separate processes (e.g. concurrent Airflow tasks on the same worker).
+    With the default burst of 1 token, request starts to the host are spaced
+    at least `delay` seconds apart.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        delay: float,
+        burst: Optional[float] = None,
+        state_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            host: Host (or other key) whose budget this limiter guards
+            delay: Seconds per token, i.e. minimum spacing between requests
+            burst: Bucket capacity in tokens (defaults to config.RATE_LIMIT_BURST)
+            state_dir: Directory for the shared state files
+                       (defaults to config.RATE_LIMIT_STATE_DIR)
+        """
+        self.host = host
+        self.delay = delay
+        self.burst = burst or config.RATE_LIMIT_BURST
+        self.state_dir = state_dir or config.RATE_LIMIT_STATE_DIR
+        self._thread_lock = threading.Lock()
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', host)
+        self.state_path = os.path.join(self.state_dir, f"{safe_name}.json")
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available and take it
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return waited
+            logger.debug(f"Rate limiting {self.host}: sleeping for {wait:.2f}s")
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self) -> float:
+        """
+        Async version of acquire() that yields to the event loop while waiting
+
+        The state-file transaction (thread lock + flock) runs in a worker
+        thread, so a lock held by another scraper or process never stalls
+        the event loop's other coroutines.
+        """
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._try_take)
+            if wait <= 0:
+                return waited
+            logger.debug(f"Rate limiting {self.host}: sleeping for {wait:.2f}s")
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def current_delay(self, default: Optional[float] = None) -> float:
+        """Return the spacing currently in force for the host (see adjust_delay)"""
+        return self._transact(lambda state, now: self._delay(state, now, default))
+
+    def adjust_delay(self, adjust: Callable[[float], float], default: Optional[float] = None) -> float:
+        """
+        Atomically replace the shared delay with adjust(current_delay)
+
+        The adapted delay is stored with its update time. One not updated
+        for config.PACING_STATE_TTL_MINUTES is dropped, so a throttled run
+        does not slow every later run down, and it never goes below the
+        delay this limiter was built with.
+
+        Args:
+            adjust: Maps the current delay to the new one
+            default: Delay to start from when there is no recent adapted
+                     delay (defaults to the limiter's delay)
+
+        Returns:
+            The new delay
+        """
+        def update(state: Dict[str, float], now: float) -> float:
+            state['delay'] = max(self.delay, adjust(self._delay(state, now, default)))
+            state['delay_at'] = now
+            return state['delay']
+
+        return self._transact(update)
+
+    def _delay(self, state: Dict[str, float], now: float, default: Optional[float] = None) -> float:
+        """Adapted delay from the state if recent, else the default; never below self.delay"""
+        if 'delay' not in state or now - state.get('delay_at', 0.0) > config.PACING_STATE_TTL_MINUTES * 60:
+            state.pop('delay', None)
+            state.pop('delay_at', None)
+            return max(self.delay, default or self.delay)
+        return max(self.delay, state['delay'])
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every caller for the host for at least `seconds`"""
+        def update(state: Dict[str, float], now: float) -> None:
+            state['blocked_until'] = max(state.get('blocked_until', 0.0), now + seconds)
+
+        self._transact(update)
+
+    def _try_take(self) -> float:
+        """
+        Refill the bucket and take one token if available
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one will be
+        """
+        def take(state: Dict[str, float], now: float) -> float:
+            delay = self._delay(state, now)
+            tokens = state.get('tokens', self.burst)
+            updated = state.get('updated', now)
+            tokens = min(self.burst, tokens + max(0.0, now - updated) / delay)
+            state['updated'] = now
+
+            blocked = state.get('blocked_until', 0.0) - now
+            if blocked > 0:
+                state['tokens'] = tokens
+                return blocked
+
+            if tokens >= 1.0:
+                state['tokens'] = tokens - 1.0
+                return 0.0
+
+            state['tokens'] = tokens
+            return (1.0 - tokens) * delay
+
+        return self._transact(take)
+
+    def _transact(self, update: Callable[[Dict[str, float], float], Any]) -> Any:
+        """
+        Apply update(state, now) to the shared state file under the lock
+
+        The update function mutates the state dict in place; the result is
+        written back before the lock is released.
+        """
+        with self._thread_lock:
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+
+                raw = os.read(fd, 4096)
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+
+                result = update(state, time.time())
+
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, json.dumps(state).encode())
+                return result
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+_limiters: Dict[str, HostRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(host: str, delay: float) -> HostRateLimiter:
+    """
+    Get the process-wide limiter for a host
+
+    Callers may ask for different delays for one host (e.g. @rate_limit
+    decorators and AsyncHostThrottle); the stricter (larger) one wins.
+
+    Args:
+        host: Host whose request budget is shared (e.g. 'fbref.com')
+        delay: Minimum seconds between requests to the host
+
+    Returns:
+        HostRateLimiter shared by all callers in this process
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostRateLimiter(host, delay)
+        elif delay > limiter.delay:
+            logger.info(f"Raising {host} rate-limit delay from {limiter.delay:.2f}s to {delay:.2f}s")
+            limiter.delay = delay
+        return limiter
+
+
+def rate_limit(delay: float, host: Optional[str] = None):
     """
     Decorator to enforce rate limiting between function calls
 
+    All functions decorated with the same host draw from one shared token
+    bucket (see HostRateLimiter), regardless of scraper instance, thread or
+    process.
+
     Args:
         delay: Minimum seconds to wait between calls
+        host: Host whose budget the call consumes (defaults to a bucket
+              private to the decorated function)
     """
     def decorator(func: Callable) -> Callable:
-        last_called = [0.0]
+        key = host or f"{func.__module__}.{func.__qualname__}"
 
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            # Calculate time since last call
-            elapsed = time.time() - last_called[0]
-            if elapsed < delay:
-                sleep_time = delay - elapsed
-                logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-                time.sleep(sleep_time)
+            get_host_limiter(key, delay).acquire()
+            return func(*args, **kwargs)
 
-            # Execute function
-            result = func(*args, **kwargs)
+        return wrapper
+    return decorator
 
-            # Update last called time
-            last_called[0] = time.time()
 
-            return result
+# Responses that mean "slow down" - left to the pacer rather than urllib3
+THROTTLE_STATUS_CODES = (429, 503)
 
-        return wrapper
-    return decorator
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP-date
+
+    Returns:
+        Seconds to wait (never negative), or None if missing or unparseable
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptivePacer:
+    """
+    AIMD controller for the request rate to one host
+
+    The rate is nudged up additively (config.PACING_INCREASE_STEP requests/s)
+    after every healthy response and cut multiplicatively
+    (config.PACING_DECREASE_FACTOR) on a 429/503 or when latency jumps above
+    config.PACING_LATENCY_RATIO times its moving average. Retry-After is
+    honoured by holding the host's limiter for the requested time.
+
+    The resulting delay is stored in the host's HostRateLimiter state, so
+    every scraper and process drawing on that host (including the Playwright
+    scrapers via @rate_limit) runs at the adapted pace. A pace no response
+    has updated for config.PACING_STATE_TTL_MINUTES reverts to initial_delay.
+    """
+
+    LATENCY_EWMA_ALPHA = 0.2
+    MIN_LATENCY_SAMPLES = 5
+
+    def __init__(
+        self,
+        host: str,
+        initial_delay: float,
+        min_delay: float,
+        max_delay: Optional[float] = None
+    ):
+        """
+        Args:
+            host: Host whose pace is controlled
+            initial_delay: Starting seconds between requests
+            min_delay: Fastest allowed spacing (the politeness floor)
+            max_delay: Slowest spacing backoff may reach
+                       (defaults to config.PACING_MAX_DELAY)
+        """
+        self.host = host
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay or config.PACING_MAX_DELAY
+        # The limiter's own delay is the floor; the pace starts at initial_delay
+        self.limiter = get_host_limiter(host, min_delay)
+
+        self.latency_ewma: Optional[float] = None
+        self.stats = {'responses': 0, 'throttled': 0, 'slowdowns': 0, 'retry_after_seconds': 0.0}
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def request(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Send a request at the host's current pace, retrying throttled responses
+
+        Args:
+            send: Callable performing the request
+
+        Returns:
+            The first non-throttled response, or the last throttled one after
+            config.MAX_RETRIES retries
+        """
+        for attempt in range(config.MAX_RETRIES + 1):
+            self.limiter.acquire()
+
+            started = time.monotonic()
+            response = send()
+            self.record(
+                response.status_code,
+                time.monotonic() - started,
+                response.headers.get('Retry-After')
+            )
+
+            if response.status_code not in THROTTLE_STATUS_CODES or attempt == config.MAX_RETRIES:
+                return response
+
+            logger.warning(
+                f"{self.host} returned {response.status_code}, "
+                f"retrying ({attempt + 1}/{config.MAX_RETRIES})"
+            )
+
+        return response
+
+    def record(
+        self,
+        status_code: int,
+        latency: float,
+        retry_after: Optional[str] = None
+    ) -> float:
+        """
+        Feed one response into the controller
+
+        Args:
+            status_code: HTTP status of the response
+            latency: Seconds from request start to response
+            retry_after: Raw Retry-After header, if any
+
+        Returns:
+            The host's new delay in seconds
+        """
+        with self._lock:
+            self.stats['responses'] += 1
+            throttled = status_code in THROTTLE_STATUS_CODES
+            slow = (
+                not throttled
+                and self._samples >= self.MIN_LATENCY_SAMPLES
+                and latency > self.latency_ewma * config.PACING_LATENCY_RATIO
+            )
+
+            if not throttled:
+                # Throttle responses come back fast and would drag the baseline down
+                self._samples += 1
+                self.latency_ewma = latency if self.latency_ewma is None else (
+                    self.LATENCY_EWMA_ALPHA * latency
+                    + (1 - self.LATENCY_EWMA_ALPHA) * self.latency_ewma
+                )
+
+            if throttled:
+                self.stats['throttled'] += 1
+            elif slow:
+                self.stats['slowdowns'] += 1
+
+        if throttled or slow:
+            delay = self.limiter.adjust_delay(self._decrease, self.initial_delay)
+            reason = f"HTTP {status_code}" if throttled else f"latency {latency:.2f}s"
+            logger.info(f"Backing off {self.host} ({reason}): {60.0 / delay:.1f} req/min")
+        else:
+            delay = self.limiter.adjust_delay(self._increase, self.initial_delay)
+            logger.debug(f"Pacing {self.host}: {60.0 / delay:.1f} req/min")
+
+        wait = parse_retry_after(retry_after)
+        if wait:
+            wait = min(wait, self.max_delay)
+            logger.info(f"{self.host} asked to retry after {wait:.0f}s")
+            self.limiter.block_for(wait)
+            with self._lock:
+                self.stats['retry_after_seconds'] += wait
+
+        return delay
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current pace and counters for the host"""
+        delay = self.limiter.current_delay(self.initial_delay)
+        with self._lock:
+            return {
+                'host': self.host,
+                'delay_seconds': round(delay, 3),
+                'requests_per_minute': round(60.0 / delay, 2),
+                'min_delay_seconds': self.min_delay,
+                'latency_ewma_seconds': (
+                    round(self.latency_ewma, 3) if self.latency_ewma is not None else None
+                ),
+                **self.stats
+            }
+
+    def _increase(self, delay: float) -> float:
+        """Additive increase of the request rate"""
+        return max(self.min_delay, 1.0 / (1.0 / delay + config.PACING_INCREASE_STEP))
+
+    def _decrease(self, delay: float) -> float:
+        """Multiplicative decrease of the request rate"""
+        return min(self.max_delay, delay / config.PACING_DECREASE_FACTOR)
+
+
+_pacers: Dict[str, AdaptivePacer] = {}
+
+
+def get_pacer(host: str, initial_delay: float, min_delay: float) -> AdaptivePacer:
+    """
+    Get the process-wide pacing controller for a host
+
+    Args:
+        host: Host being paced (e.g. 'fbref.com')
+        initial_delay: Starting seconds between requests
+        min_delay: Fastest allowed spacing
+
+    Returns:
+        AdaptivePacer shared by all callers in this process
+    """
+    with _limiters_lock:
+        pacer = _pacers.get(host)
+    if pacer is None:
+        pacer = AdaptivePacer(host, initial_delay, min_delay)
+        with _limiters_lock:
+            pacer = _pacers.setdefault(host, pacer)
+    return pacer
+
+
+def get_pacing_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Current request rate and pacing counters for every paced host
+
+    Returns:
+        Dict of host -> metrics (see AdaptivePacer.metrics)
+    """
+    with _limiters_lock:
+        pacers = list(_pacers.values())
+    return {pacer.host: pacer.metrics() for pacer in pacers}
 
 
 def safe_extract_text(element, selector: str, default: str = "") -> str:
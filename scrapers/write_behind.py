@@ -0,0 +1,235 @@
+"""
+Write-behind queue between scrape loops and the bronze layer
+
+Scrape loops used to block on every database write before fetching the
+next match, so fetching and loading alternated. WriteBehindLoader accepts
+writes into a bounded in-memory queue and a background thread drains it
+through DatabaseLoader, so the next fetch overlaps the previous write:
+
+- writes are grouped by target (match scrapes, or a BULK_TABLES key) and
+  flushed as one transaction per group once config.WRITE_BEHIND_BATCH_SIZE
+  writes are pending or config.WRITE_BEHIND_FLUSH_SECONDS have passed
+- the queue holds at most config.WRITE_BEHIND_QUEUE_SIZE writes; when the
+  database falls behind, submitting blocks until the writer catches up
+- flush() waits until everything submitted so far is written; close() (or
+  leaving a with-block, or interpreter exit) flushes and stops the writer
+- a failed batch is logged and its writes are kept in .failures (batches
+  the database could not take at all go to the loader's spool instead, see
+  write_spool.py)
+
+Usage:
+    with WriteBehindLoader(loader) as writer:
+        for match in matches:
+            writer.record_match_scrape(run_id, match_id, 'understat', data, url)
+    print(writer.summary())
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import config
+from db_loader import DatabaseLoader, BULK_TABLES, MATCH_SCRAPE
+from utils import ScraperException
+
+logger = logging.getLogger(__name__)
+
+# Control markers passed through the queue
+_FLUSH = object()
+_STOP = object()
+
+
+class WriteBehindLoader:
+    """Queue bronze writes and apply them in batches on a background thread"""
+
+    def __init__(
+        self,
+        loader: Optional[DatabaseLoader] = None,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            loader: DatabaseLoader the writer thread writes through
+            max_queue: Pending writes before submitters block (defaults to config)
+            batch_size: Writes per flushed batch (defaults to config)
+            flush_interval: Seconds before a partial batch is flushed (defaults to config)
+        """
+        self.loader = loader or DatabaseLoader()
+        self.batch_size = batch_size or config.WRITE_BEHIND_BATCH_SIZE
+        self.flush_interval = (
+            config.WRITE_BEHIND_FLUSH_SECONDS if flush_interval is None else flush_interval
+        )
+        self.failures: List[Dict[str, Any]] = []
+        self.stats = {'submitted': 0, 'written': 0, 'failed': 0, 'batches': 0, 'waits': 0}
+
+        self._queue = queue.Queue(maxsize=max_queue or config.WRITE_BEHIND_QUEUE_SIZE)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> 'WriteBehindLoader':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def record_match_scrape(
+        self,
+        run_id: str,
+        match_id: str,
+        scrape_type: str,
+        payload: Dict[str, Any],
+        match_url: str,
+        records_scraped: Optional[int] = None,
+        dag_run_id: Optional[str] = None,
+        started_at: Optional[Any] = None,
+        status: str = 'success'
+    ) -> None:
+        """Queue a DatabaseLoader.record_match_scrape write (same arguments)"""
+        self._submit(MATCH_SCRAPE, {
+            'run_id': run_id,
+            'match_id': match_id,
+            'scrape_type': scrape_type,
+            'payload': payload,
+            'match_url': match_url,
+            'records_scraped': records_scraped,
+            'dag_run_id': dag_run_id,
+            'started_at': started_at,
+            'status': status,
+        })
+
+    def save_raw(
+        self,
+        table_key: str,
+        match_id: Optional[str],
+        payload: Dict[str, Any],
+        match_url: str,
+        scrape_run_id: Optional[str] = None
+    ) -> None:
+        """
+        Queue a payload upsert into a bronze table (see DatabaseLoader.bulk_save)
+
+        Args:
+            table_key: 'understat_raw', 'fbref_raw' or 'fbref_lineups'
+            match_id: Unique match identifier
+            payload: Raw scraped data dictionary
+            match_url: URL of the scraped page
+            scrape_run_id: Associated scrape run ID
+        """
+        if table_key not in BULK_TABLES:
+            raise ValueError(f"Unknown bulk table: {table_key} (expected one of {sorted(BULK_TABLES)})")
+
+        self._submit(table_key, {
+            'match_id': match_id,
+            'match_url': match_url,
+            'payload': payload,
+            'scrape_run_id': scrape_run_id,
+        })
+
+    def _submit(self, target: str, item: Dict[str, Any]) -> None:
+        if self._closed:
+            raise ScraperException("Write-behind loader is closed")
+
+        self.stats['submitted'] += 1
+        try:
+            self._queue.put_nowait((target, item))
+        except queue.Full:
+            # Backpressure: the database is behind, wait for the writer
+            self.stats['waits'] += 1
+            logger.debug(f"Write-behind queue full ({self._queue.maxsize}), waiting for the writer")
+            self._queue.put((target, item))
+
+    def flush(self) -> None:
+        """Block until every write submitted so far has been applied"""
+        if self._closed:
+            return
+        self._queue.put((_FLUSH, None))
+        self._queue.join()
+
+    def close(self) -> Dict[str, int]:
+        """
+        Flush pending writes and stop the writer thread
+
+        Safe to call more than once.
+
+        Returns:
+            summary() counters
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put((_STOP, None))
+            self._thread.join()
+            atexit.unregister(self.close)
+
+            summary = self.summary()
+            log = logger.warning if summary['failed'] else logger.info
+            log(f"Write-behind loader closed: {summary['written']} written, "
+                f"{summary['failed']} failed in {summary['batches']} batches "
+                f"({summary['waits']} backpressure waits)")
+
+        return self.summary()
+
+    def summary(self) -> Dict[str, int]:
+        """Counters: submitted, written, failed, batches, waits"""
+        return dict(self.stats)
+
+    def _run(self) -> None:
+        """Writer thread: collect writes per target and flush on size, time or marker"""
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        taken = 0  # Queue items taken but not yet marked done
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                target, item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                target = _FLUSH
+            else:
+                taken += 1
+
+            if target is _FLUSH or target is _STOP:
+                self._write(pending)
+            else:
+                pending.setdefault(target, []).append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if sum(map(len, pending.values())) >= self.batch_size:
+                    self._write(pending)
+
+            if not pending:
+                deadline = None
+                for _ in range(taken):
+                    self._queue.task_done()
+                taken = 0
+
+            if target is _STOP:
+                return
+
+    def _write(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Apply and clear pending writes, one transaction per target"""
+        for target, items in pending.items():
+            try:
+                if target == MATCH_SCRAPE:
+                    ok = self.loader.record_match_scrapes(items)
+                else:
+                    ok = self.loader.bulk_save(target, items)
+            except Exception as e:
+                logger.error(f"Write-behind batch for {target} raised: {e}")
+                ok = False
+
+            self.stats['batches'] += 1
+            if ok:
+                self.stats['written'] += len(items)
+            else:
+                self.stats['failed'] += len(items)
+                self.failures.extend(items)
+                logger.error(f"Write-behind batch of {len(items)} {target} writes failed")
+
+        pending.clear()
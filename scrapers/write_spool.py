@@ -0,0 +1,236 @@
+"""
+Local spool for bronze writes when Postgres is slow or down
+
+A scraped page is expensive (rate limits, browser time); losing it because
+the database hiccuped means fetching it again later. DatabaseLoader can
+append such writes to a local journal instead and replay them into bronze
+once the database is back.
+
+Modes (config.SPOOL_MODE / SCRAPER_SPOOL_MODE):
+- off:        failed writes are logged and dropped
+- on_failure: writes that fail because the database is unreachable
+              (connection errors, pool timeouts) go to the journal and the
+              save reports success, so the scrape loop keeps going
+- always:     every bronze write goes to the journal; nothing touches the
+              database until replay (e.g. during maintenance, or to load a
+              large backfill with COPY afterwards)
+
+The journal is gzip-compressed JSON lines under config.SPOOL_DIR. Each
+record is its own gzip member, appended and fsynced under an exclusive
+flock, so concurrent scraper processes can share it and a crash loses at
+most the record being written.
+
+Replay is idempotent: every bronze write is an upsert keyed by match (and
+unchanged payloads are skipped by content hash), and records keep their
+original scraped_at. A journal is deleted only after all of it loaded:
+
+    python write_spool.py status
+    python write_spool.py replay
+    python write_spool.py replay --method values
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import config
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX: appends are only serialized within the process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SPOOL_OFF = 'off'
+SPOOL_ON_FAILURE = 'on_failure'
+SPOOL_ALWAYS = 'always'
+SPOOL_MODES = (SPOOL_OFF, SPOOL_ON_FAILURE, SPOOL_ALWAYS)
+
+JOURNAL_NAME = 'journal.jsonl.gz'
+CLAIMED_PREFIX = 'replay-'  # Journals taken by a replay (kept if it fails)
+
+# Item fields stored as ISO strings and restored to datetimes on read
+_DATETIME_FIELDS = ('started_at', 'scraped_at')
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class WriteSpool:
+    """Append-only, compressed journal of deferred bronze writes"""
+
+    def __init__(self, spool_dir: Optional[str] = None):
+        """
+        Args:
+            spool_dir: Journal directory (defaults to config.SPOOL_DIR)
+        """
+        self.spool_dir = spool_dir or config.SPOOL_DIR
+        self.journal_path = os.path.join(self.spool_dir, JOURNAL_NAME)
+        self._lock = threading.Lock()
+
+    def append(self, target: str, item: Dict[str, Any]) -> None:
+        """
+        Durably append one write to the journal
+
+        Args:
+            target: 'match_scrape' or a DatabaseLoader BULK_TABLES key
+            item: The write's fields (as passed to record_match_scrapes /
+                  bulk_save)
+
+        Raises:
+            OSError: If the journal cannot be written
+        """
+        line = json.dumps(
+            {'target': target, 'spooled_at': datetime.utcnow(), 'item': item},
+            default=_json_default, ensure_ascii=False
+        )
+        member = gzip.compress(line.encode('utf-8') + b'\n')
+
+        with self._lock:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            while True:
+                fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+
+                    # A replay may have claimed (renamed) the journal while we
+                    # waited for the lock; start a new one instead
+                    try:
+                        current = os.stat(self.journal_path).st_ino
+                    except FileNotFoundError:
+                        current = None
+                    if current != os.fstat(fd).st_ino:
+                        continue
+
+                    os.write(fd, member)
+                    os.fsync(fd)
+                    return
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+
+    def claim(self) -> List[str]:
+        """
+        Take the current journal for replay
+
+        The journal is renamed under its lock, so new writes start a fresh
+        one. Journals claimed by earlier replays that did not finish are
+        returned too.
+
+        Returns:
+            Claimed journal paths, oldest first
+        """
+        claimed = os.path.join(
+            self.spool_dir, f"{CLAIMED_PREFIX}{time.time_ns()}-{os.getpid()}.jsonl.gz"
+        )
+        with self._lock:
+            try:
+                fd = os.open(self.journal_path, os.O_RDONLY)
+            except FileNotFoundError:
+                fd = None
+
+            if fd is not None:
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_EX)
+                    os.replace(self.journal_path, claimed)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+
+        if not os.path.isdir(self.spool_dir):
+            return []
+
+        return sorted(
+            os.path.join(self.spool_dir, name)
+            for name in os.listdir(self.spool_dir)
+            if name.startswith(CLAIMED_PREFIX) and name.endswith('.jsonl.gz')
+        )
+
+    @staticmethod
+    def read(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over a journal's writes
+
+        A record cut short by a crash ends the journal (everything before
+        it is returned).
+
+        Yields:
+            (target, item) with datetime fields restored
+        """
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    item = record['item']
+                    for field in _DATETIME_FIELDS:
+                        if isinstance(item.get(field), str):
+                            item[field] = datetime.fromisoformat(item[field])
+                    yield record['target'], item
+        except (EOFError, zlib.error, gzip.BadGzipFile, ValueError) as e:
+            logger.warning(f"Journal {path} ends with a truncated record, skipping it: {e}")
+
+    def pending(self) -> Dict[str, int]:
+        """Count spooled writes per target (current and claimed journals)"""
+        paths = [self.journal_path] if os.path.exists(self.journal_path) else []
+        if os.path.isdir(self.spool_dir):
+            paths += [
+                os.path.join(self.spool_dir, name)
+                for name in os.listdir(self.spool_dir)
+                if name.startswith(CLAIMED_PREFIX)
+            ]
+
+        counts: Dict[str, int] = {}
+        for path in paths:
+            for target, _ in self.read(path):
+                counts[target] = counts.get(target, 0) + 1
+        return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('status', 'replay'))
+    parser.add_argument('--spool-dir', default=None, help='Journal directory (defaults to config.SPOOL_DIR)')
+    parser.add_argument('--method', default='copy', choices=('values', 'copy'), help='Bulk load method for replay')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    spool = WriteSpool(args.spool_dir)
+
+    if args.command == 'status':
+        counts = spool.pending()
+        print(f"{sum(counts.values())} spooled writes in {spool.spool_dir}")
+        for target, count in sorted(counts.items()):
+            print(f"  {target:<14} {count}")
+        return 0
+
+    from db_loader import DatabaseLoader
+
+    loader = DatabaseLoader(spool_mode=SPOOL_OFF)
+    try:
+        summary = loader.replay_spool(spool, method=args.method)
+    finally:
+        loader.close()
+
+    print(f"Replayed {summary['records']} writes from {summary['files']} journals "
+          f"({summary['failed']} journals kept for retry)")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
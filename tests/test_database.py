@@ -75,7 +75,10 @@ class TestBronzeLayer:
         """)
         tables = [row[0] for row in cur.fetchall()]
 
-        required_tables = ['understat_raw', 'fbref_raw', 'match_reference', 'scrape_runs']
+        required_tables = [
+            'understat_raw', 'fbref_raw', 'fbref_lineups', 'fbref_lineups_history',
+            'match_reference', 'scrape_runs', 'fixture_lists'
+        ]
 
         for table in required_tables:
             assert table in tables, f"Bronze table {table} not found"
@@ -101,7 +104,8 @@ class TestBronzeLayer:
             'match_url': 'text',
             'raw_shots': 'jsonb',
             'scrape_run_id': 'character varying',
-            'scraped_at': 'timestamp without time zone'
+            'scraped_at': 'timestamp without time zone',
+            'content_hash': 'character'
         }
 
         for col_name, col_type in required_columns.items():
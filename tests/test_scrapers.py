@@ -3,13 +3,44 @@ Test Scrapers - Validate scraper output format and data quality
 """
 
 import pytest
+import json
+import logging
+import asyncio
 import sys
 import os
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from datetime import datetime, timedelta
 
 # Add scrapers to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scrapers'))
 
-from playwright_scraper import UnderstatPlaywrightScraper
+from playwright_scraper import UnderstatPlaywrightScraper, PageLoadStats, should_block_request
+from async_playwright_scraper import AsyncUnderstatPlaywrightScraper, AsyncHostThrottle
+from tiered_fetcher import TieredUnderstatFetcher, url_pattern, looks_blocked
+from http_cache import ResponseCache
+from understat_scraper import UnderstatScraper
+from understat_payload import decode_js_string, extract_payloads
+from shot_batch import ShotBatch, UNDERSTAT_SHOT_FIELDS
+from records import Fixture, PlayerMatchStats
+from fbref_scraper import FBrefScraper
+from html_parsers import parse_document
+from fbref_schema import typed_frame, frame_to_columnar, columnar_to_frame
+from fixture_cache import FixtureCache, is_stale, fixture_list_hash
+from db_pool import ConnectionPool
+import db_loader
+from db_loader import DatabaseLoader, content_hash
+from write_behind import WriteBehindLoader
+from scrape_planner import plan_scrapes, fixture_match_id
+from backfill_historical import HistoricalDataBackfill
+from write_spool import WriteSpool
+from utils import HostRateLimiter, AdaptivePacer, ScraperException, get_host_limiter
+import multiprocessing
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+import requests
 
 
 class TestUnderstatScraper:
@@ -18,7 +49,8 @@ class TestUnderstatScraper:
     @pytest.fixture
     def scraper(self):
         """Create scraper instance"""
-        return UnderstatPlaywrightScraper(headless=True)
+        with UnderstatPlaywrightScraper(headless=True) as scraper:
+            yield scraper
 
     def test_scraper_initialization(self, scraper):
         """Test scraper can be initialized"""
@@ -26,6 +58,71 @@ class TestUnderstatScraper:
         assert hasattr(scraper, 'scrape_match_shots')
         assert hasattr(scraper, 'scrape_season_fixtures')
 
+    def test_browser_pool_reused(self, scraper):
+        """Test repeated scrapes share one browser launch and reuse the page"""
+        scraper.scrape_season_fixtures('2024')
+        scraper.scrape_season_fixtures('2024')
+
+        assert scraper.stats.browser_launches == 1
+        assert scraper.stats.contexts_created == 1
+        assert scraper.stats.page_reuses >= 1
+
+    def test_failed_launch_stops_driver(self, monkeypatch):
+        """Test a browser that fails to launch does not leave the driver running"""
+        stopped = []
+
+        class FakeDriver:
+            class chromium:
+                @staticmethod
+                def launch(headless=True):
+                    raise RuntimeError('Executable does not exist')
+
+            def stop(self):
+                stopped.append(True)
+
+        class FakeManager:
+            def start(self):
+                return FakeDriver()
+
+        monkeypatch.setattr('playwright_scraper.sync_playwright', FakeManager)
+        scraper = UnderstatPlaywrightScraper(headless=True)
+
+        with pytest.raises(RuntimeError):
+            scraper.open()
+
+        assert stopped == [True]
+        assert scraper._playwright is None and not scraper.is_open
+
+    def test_probe_timeout_is_not_an_empty_match(self, monkeypatch):
+        """Test a match page whose data never loaded fails instead of returning no shots"""
+        scraper = UnderstatPlaywrightScraper(headless=True)
+
+        @contextmanager
+        def fake_page():
+            yield object()
+
+        monkeypatch.setattr(scraper, 'get_page', fake_page)
+        monkeypatch.setattr(scraper, 'load_page', lambda page, url, ready: PageLoadStats(url, 15.0, 0, 0, ready=False))
+
+        with pytest.raises(ScraperException, match='readiness probe timed out'):
+            scraper.scrape_match_shots('https://understat.com/match/1')
+
+    def test_should_block_request(self):
+        """Test only non-essential resources are blocked"""
+        assert should_block_request('image', 'https://understat.com/images/logo.png')
+        assert should_block_request('font', 'https://fonts.gstatic.com/x.woff2')
+        assert should_block_request('script', 'https://www.googletagmanager.com/gtag/js')
+        assert not should_block_request('document', 'https://understat.com/match/1')
+        assert not should_block_request('script', 'https://understat.com/js/match.min.js')
+
+    def test_page_load_uses_readiness_probe(self, scraper):
+        """Test page loads resolve on the data probe with blocked resources"""
+        scraper.scrape_season_fixtures('2024')
+
+        assert scraper.stats.pages_loaded == 1
+        assert scraper.stats.requests_blocked > 0
+        assert scraper.stats.total_bytes_transferred > 0
+
     def test_fixture_data_structure(self, scraper):
         """Test fixture scraping returns correct structure"""
         # Scrape Arsenal 2024 season
@@ -125,7 +222,8 @@ class TestDataQuality:
 
     @pytest.fixture
     def scraper(self):
-        return UnderstatPlaywrightScraper(headless=True)
+        with UnderstatPlaywrightScraper(headless=True) as scraper:
+            yield scraper
 
     def test_goals_match_result_shots(self, scraper):
         """Test that goals in metadata match Goal results in shots"""
@@ -158,3 +256,1069 @@ class TestDataQuality:
         for shot in match_data['shots']:
             assert shot['player_name'], "Player name should not be empty"
             assert len(shot['player_name']) > 1, "Player name should be valid"
+
+
+class TestAsyncUnderstatScraper:
+    """Test the concurrent Understat scraper"""
+
+    def test_host_throttle_spaces_request_starts(self):
+        """Test request starts to one host are spaced by the configured delay"""
+        throttle = AsyncHostThrottle(
+            max_concurrency={'throttle-test.local': 4},
+            delays={'throttle-test.local': 0.2}
+        )
+        starts = []
+
+        async def fetch():
+            async with throttle.slot('https://throttle-test.local/match/1'):
+                starts.append(time.monotonic())
+                await asyncio.sleep(0.5)
+
+        async def run():
+            await asyncio.gather(*(fetch() for _ in range(3)))
+
+        asyncio.run(run())
+
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.19 for gap in gaps), f"Request starts too close: {gaps}"
+        # Pages overlap: total time is bounded by spacing, not serial page loads
+        assert starts[-1] - starts[0] < 0.5
+
+    def test_failed_launch_stops_driver(self, monkeypatch):
+        """Test a browser that fails to launch does not leave the driver running"""
+        stopped = []
+
+        class FakeDriver:
+            class chromium:
+                @staticmethod
+                async def launch(headless=True):
+                    raise RuntimeError('Executable does not exist')
+
+            async def stop(self):
+                stopped.append(True)
+
+        class FakeManager:
+            async def start(self):
+                return FakeDriver()
+
+        monkeypatch.setattr('async_playwright_scraper.async_playwright', FakeManager)
+        scraper = AsyncUnderstatPlaywrightScraper(headless=True)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(scraper.open())
+
+        assert stopped == [True]
+        assert scraper._playwright is None and scraper._browser is None
+
+    def test_probe_timeout_is_not_an_empty_match(self, monkeypatch):
+        """Test a match page whose data never loaded fails instead of returning no shots"""
+        scraper = AsyncUnderstatPlaywrightScraper(headless=True)
+
+        @asynccontextmanager
+        async def fake_page():
+            yield object()
+
+        async def fake_load(page, url, ready):
+            return PageLoadStats(url, 15.0, 0, 0, ready=False)
+
+        monkeypatch.setattr(scraper, 'get_page', fake_page)
+        monkeypatch.setattr(scraper, 'load_page', fake_load)
+
+        with pytest.raises(ScraperException, match='readiness probe timed out'):
+            asyncio.run(scraper.scrape_match_shots('https://understat.com/match/1'))
+
+    def test_scrape_matches_preserves_order(self):
+        """Test concurrent match scraping returns one result per fixture in order"""
+        async def run():
+            async with AsyncUnderstatPlaywrightScraper(headless=True) as scraper:
+                fixtures = await scraper.scrape_season_fixtures('2024')
+                played = [f for f in fixtures if f['is_result']][:3]
+                return played, await scraper.scrape_matches(played)
+
+        played, results = asyncio.run(run())
+
+        assert len(results) == len(played)
+        for fixture, match_data in zip(played, results):
+            assert not isinstance(match_data, Exception), str(match_data)
+            assert match_data['match_url'] == fixture['match_url']
+
+
+class TestTieredUnderstatFetcher:
+    """Test the HTTP-first fetcher with Playwright fallback"""
+
+    def test_url_pattern(self):
+        """Test URLs of the same page kind share a pattern"""
+        assert url_pattern('https://understat.com/match/26602') == 'understat.com/match/{n}'
+        assert url_pattern('https://understat.com/match/1') == url_pattern('https://understat.com/match/99')
+        assert url_pattern('https://understat.com/team/Arsenal/2024') == 'understat.com/team/Arsenal/{n}'
+
+    def test_looks_blocked(self):
+        """Test challenge pages are detected"""
+        assert looks_blocked('<html><title>Just a moment...</title></html>')
+        assert not looks_blocked("<script>var datesData = JSON.parse('[]')</script>")
+
+    def test_replay_never_falls_back_to_browser(self, tmp_path):
+        """Test a cached block page fails in replay mode instead of launching Playwright"""
+        url = 'https://understat.com/match/26602'
+        blocked = requests.Response()
+        blocked.status_code = 200
+        blocked._content = b'<html><title>Just a moment...</title></html>'
+        ResponseCache(cache_dir=str(tmp_path), mode='revalidate').store(url, blocked)
+
+        fetcher = TieredUnderstatFetcher()
+        fetcher.http = UnderstatScraper(cache=ResponseCache(cache_dir=str(tmp_path), mode='replay'))
+
+        with pytest.raises(ScraperException, match='replay mode'):
+            fetcher.scrape_match_shots(url)
+        assert fetcher._browser_scraper is None
+
+    def test_http_tier_matches_browser_output(self):
+        """Test both tiers return the same fixture dictionaries"""
+        with TieredUnderstatFetcher() as fetcher:
+            http_fixtures = fetcher.scrape_season_fixtures('2024')
+            browser_fixtures = fetcher.browser.scrape_season_fixtures('2024')
+
+        assert fetcher.stats['http'] == 1
+        assert http_fixtures == browser_fixtures
+
+
+class TestUnderstatPayload:
+    """Test the byte-level Understat payload extractor"""
+
+    def test_non_ascii_names_survive(self):
+        """Test raw UTF-8 names are not mangled like unicode_escape does"""
+        page = "<script>var shotsData = JSON.parse('\\x7B\\x22player\\x22\\x3A\\x22Martin Ødegaard\\x22\\x7D');</script>"
+        assert extract_payloads(page.encode('utf-8')) == {'shotsData': {'player': 'Martin Ødegaard'}}
+
+    def test_general_escapes(self):
+        """Test escapes outside the \\xNN fast path decode like JavaScript"""
+        assert decode_js_string(rb'\x22\u00d8\x22') == '"Ø"'
+        assert decode_js_string(rb"it\'s\n\\") == "it's\n\\"
+        assert decode_js_string(rb'\uD83D\uDE00') == '\U0001F600'
+
+    def test_selects_named_payloads(self):
+        """Test only requested variables are decoded, escaped quotes included"""
+        page = (
+            b"var datesData = JSON.parse('\\x5B1\\x5D'); "
+            b"var match_info = JSON.parse('\\x7B\\x22team_h\\x22\\x3A\\x22O\\'Neil\\x22\\x7D');"
+        )
+        assert extract_payloads(page, ['match_info']) == {'match_info': {'team_h': "O'Neil"}}
+
+
+def understat_shot(shot_id, minute, xg, result, **extra):
+    """A shotsData entry as Understat serves it (every value a string)"""
+    shot = {
+        'id': shot_id, 'minute': minute, 'player': 'Martin Ødegaard', 'player_id': '7808',
+        'X': '0.885', 'Y': '0.5', 'xG': xg, 'result': result, 'situation': 'OpenPlay',
+        'shotType': 'LeftFoot', 'player_assisted': 'Bukayo Saka', 'lastAction': 'Pass'
+    }
+    shot.update(extra)
+    return shot
+
+
+class TestShotBatch:
+    """Test the columnar Understat shot representation"""
+
+    SHOTS = {
+        'h': [
+            understat_shot('1', '12', '0.76', 'Goal'),
+            understat_shot('2', '40', '0.05', 'SavedShot', shotType='Bicycle'),
+        ],
+        'a': [understat_shot('3', '', '0.3', 'Goal', X='bad')],
+    }
+
+    def test_totals(self):
+        """Test goals and xG are summed per side"""
+        batch = ShotBatch.from_payload(self.SHOTS, 'Arsenal', 'Chelsea')
+        assert len(batch) == 3
+        assert batch.totals() == {'home_goals': 1, 'away_goals': 1, 'home_xg': 0.81, 'away_xg': 0.3}
+
+    def test_to_dicts_round_trip(self):
+        """Test the dict form keeps unknown categories and defaults bad numbers to 0"""
+        batch = ShotBatch.from_payload(self.SHOTS, 'Arsenal', 'Chelsea')
+        shots = batch.to_dicts()
+
+        assert shots[0]['player_name'] == 'Martin Ødegaard'
+        assert shots[1]['shot_type'] == 'Bicycle'
+        assert (shots[2]['minute'], shots[2]['x_coord'], shots[2]['h_a']) == (0, 0.0, 'a')
+        assert shots[2]['h_team'] == 'Arsenal' and shots[2]['a_team'] == 'Chelsea'
+        assert type(shots[0]['minute']) is int
+
+        away = batch.side('a').to_dicts(UNDERSTAT_SHOT_FIELDS)
+        assert list(away[0]) == list(UNDERSTAT_SHOT_FIELDS)
+        assert away[0]['shot_id'] == '3'
+
+
+class TestRecords:
+    """Test the slotted record types keep the dict form"""
+
+    def test_fixture_round_trip(self):
+        """Test a Fixture converts to the same dict as before and is immutable"""
+        fixture = Fixture.from_understat(
+            {'id': '26602', 'datetime': '2025-10-04 16:30:00', 'isResult': False,
+             'h': {'title': 'Arsenal'}, 'a': {'title': 'Chelsea'}},
+            'https://understat.com'
+        )
+        assert fixture.to_dict() == {
+            'match_id': '26602', 'match_url': 'https://understat.com/match/26602',
+            'home_team': 'Arsenal', 'away_team': 'Chelsea', 'match_date': '2025-10-04',
+            'kickoff_at': '2025-10-04 16:30:00', 'is_result': False
+        }
+        assert Fixture.from_dict(fixture.to_dict()) == fixture
+        assert not hasattr(fixture, '__dict__')
+        with pytest.raises(AttributeError):
+            fixture.is_result = True
+
+    def test_player_stats_from_columnar(self):
+        """Test columnar player stats become one record per player"""
+        records = PlayerMatchStats.from_columnar({
+            'columns': ['player_name', 'team', 'goals'],
+            'data': {'player_name': ['Saka', 'Rice'], 'team': ['home', 'home'], 'goals': [1, None]}
+        })
+        assert [r.get('goals') for r in records] == [1, None]
+        assert records[0].to_dict() == {'player_name': 'Saka', 'team': 'home', 'goals': 1}
+
+
+class TestResponseCache:
+    """Test the on-disk HTTP response cache"""
+
+    class FakeSession:
+        """Session returning a fixed page and honouring If-None-Match"""
+
+        def __init__(self):
+            self.requests = []
+
+        def get(self, url, timeout=None, headers=None):
+            self.requests.append(headers or {})
+            response = requests.Response()
+            response.url = url
+            if headers and headers.get('If-None-Match') == '"v1"':
+                response.status_code = 304
+                response._content = b''
+            else:
+                response.status_code = 200
+                response._content = b"<script>var datesData = JSON.parse('[]')</script>"
+                response.headers['ETag'] = '"v1"'
+            return response
+
+    def test_revalidation_serves_cached_body(self, tmp_path):
+        """Test a 304 is answered from the cache without a new blob"""
+        cache = ResponseCache(cache_dir=str(tmp_path), mode='revalidate')
+        session = self.FakeSession()
+
+        first = cache.get(session, 'https://understat.com/team/Arsenal/2024', timeout=30)
+        second = cache.get(session, 'https://understat.com/team/Arsenal/2024', timeout=30)
+
+        assert session.requests[1] == {'If-None-Match': '"v1"'}
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert cache.stats['revalidated'] == 1
+        assert len(cache.history('https://understat.com/team/Arsenal/2024')) == 1
+
+    def test_old_versions_are_dropped_and_swept(self, tmp_path):
+        """Test each URL keeps max_versions and only unreferenced blobs are deleted"""
+        cache = ResponseCache(cache_dir=str(tmp_path), mode='revalidate', max_versions=2)
+
+        def store(url, body):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = body
+            return cache.store(url, response)
+
+        for body in (b'v1', b'v2', b'v3', b'v4'):
+            store('https://fbref.com/a', body)
+        shared = store('https://fbref.com/b', b'v1')  # Same blob as a dropped version of /a
+
+        assert [cache.load(e) for e in cache.history('https://fbref.com/a')] == [b'v3', b'v4']
+        assert cache.stats['dropped'] == 2
+
+        blobs = [os.path.join(d, n) for d, _, names in os.walk(tmp_path / 'blobs') for n in names]
+        for path in blobs:
+            os.utime(path, (time.time() - 7200,) * 2)
+
+        assert cache.sweep() == 1  # v2 only; v1 is still /b's
+        assert cache.load(shared) == b'v1'
+
+    def test_replay_mode_never_hits_network(self, tmp_path):
+        """Test replay serves cached pages and fails on a miss"""
+        url = 'https://understat.com/team/Arsenal/2024'
+        ResponseCache(cache_dir=str(tmp_path), mode='revalidate').get(self.FakeSession(), url, timeout=30)
+
+        replay = ResponseCache(cache_dir=str(tmp_path), mode='replay')
+        session = self.FakeSession()
+
+        assert b'datesData' in replay.get(session, url, timeout=30).content
+        with pytest.raises(ScraperException):
+            replay.get(session, 'https://understat.com/match/1', timeout=30)
+        assert session.requests == []
+
+
+def _take_tokens(state_dir, count):
+    """Worker for the cross-process limiter test"""
+    limiter = HostRateLimiter('limiter-test.local', delay=0.2, state_dir=state_dir)
+    for _ in range(count):
+        limiter.acquire()
+
+
+class TestHostRateLimiter:
+    """Test the shared token-bucket rate limiter"""
+
+    def test_budget_shared_across_processes(self, tmp_path):
+        """Test two processes hitting one host share a single request budget"""
+        started = time.monotonic()
+        workers = [
+            multiprocessing.Process(target=_take_tokens, args=(str(tmp_path), 2))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # 4 tokens at 0.2s each with a burst of 1: at least 3 waits
+        assert time.monotonic() - started >= 0.55
+
+    def test_shared_limiter_keeps_stricter_delay(self):
+        """Test a later caller asking for a larger delay is not ignored"""
+        assert get_host_limiter('limiter-max-test.local', 1.0).delay == 1.0
+        assert get_host_limiter('limiter-max-test.local', 3.0).delay == 3.0
+        assert get_host_limiter('limiter-max-test.local', 2.0).delay == 3.0
+
+
+class TestAdaptivePacer:
+    """Test AIMD pacing of requests to a host"""
+
+    @pytest.fixture
+    def pacer(self, tmp_path):
+        pacer = AdaptivePacer('pacer-test.local', initial_delay=2.0, min_delay=0.5, max_delay=8.0)
+        pacer.limiter = HostRateLimiter('pacer-test.local', 0.5, state_dir=str(tmp_path))
+        return pacer
+
+    def test_speeds_up_while_healthy(self, pacer):
+        """Test healthy responses raise the rate additively down to the floor"""
+        first = pacer.record(200, 0.1)
+        assert first < 2.0
+
+        for _ in range(500):
+            delay = pacer.record(200, 0.1)
+        assert delay == pytest.approx(0.5)
+
+    def test_backs_off_on_throttle_and_latency(self, pacer):
+        """Test 429s and latency spikes cut the rate multiplicatively"""
+        assert pacer.record(429, 0.05) == pytest.approx(4.0)
+
+        for _ in range(AdaptivePacer.MIN_LATENCY_SAMPLES):
+            pacer.record(200, 0.1)
+        before = pacer.limiter.current_delay()
+        assert pacer.record(200, 1.0) == pytest.approx(min(8.0, before * 2))
+
+        metrics = pacer.metrics()
+        assert metrics['throttled'] == 1
+        assert metrics['slowdowns'] == 1
+
+    def test_stale_adapted_delay_is_not_inherited(self, pacer):
+        """Test a backed-off pace from an earlier run expires and never undercuts the floor"""
+        with open(pacer.limiter.state_path, 'w') as f:
+            json.dump({'delay': 60.0, 'delay_at': time.time() - 7200}, f)
+        assert pacer.limiter.current_delay(pacer.initial_delay) == 2.0
+
+        with open(pacer.limiter.state_path, 'w') as f:
+            json.dump({'delay': 0.1, 'delay_at': time.time()}, f)
+        assert pacer.limiter.current_delay() == 0.5
+
+    def test_honours_retry_after(self, pacer):
+        """Test Retry-After holds the host back before the next request"""
+        pacer.record(503, 0.05, retry_after='1')
+
+        started = time.monotonic()
+        pacer.limiter.acquire()
+        assert time.monotonic() - started >= 0.9
+
+
+MATCH_REPORT_HTML = """
+<div class="scorebox">
+  <div><strong>Arsenal</strong><div class="score">2</div></div>
+  <div><strong>Chelsea</strong><div class="score">1</div></div>
+  <div class="scorebox_meta"><div>Venue: Emirates Stadium</div></div>
+</div>
+<div id="team_stats"><table>
+  <tr><th>Possession</th></tr>
+  <tr><th>Possession</th><td>61%</td><td>39%</td></tr>
+</table></div>
+<table id="stats_home_summary"><tbody>
+  <tr><th data-stat="player">Bukayo Saka</th><td data-stat="goals">1</td></tr>
+</tbody></table>
+<table class="lineup"><tbody>
+  <tr><th data-stat="jersey_number">7</th><th data-stat="player">Bukayo Saka</th><td data-stat="position">RW</td></tr>
+</tbody></table>
+<table class="lineup"><tbody>
+  <tr><th data-stat="jersey_number">20</th><th data-stat="player">Cole Palmer</th><td data-stat="position">AM</td></tr>
+</tbody></table>
+"""
+
+
+class TestFBrefMatchReport:
+    """Test the single-fetch FBref match report parse"""
+
+    def _counting_scraper(self, tmp_path, fetched):
+        scraper = FBrefScraper(cache=ResponseCache(str(tmp_path), mode='off'))
+
+        def fake_request(url):
+            fetched.append(url)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = MATCH_REPORT_HTML.encode('utf-8')
+            return response
+
+        scraper._make_request = fake_request
+        return scraper
+
+    def test_report_has_stats_and_lineups_from_one_fetch(self, tmp_path):
+        """Test one scrape_match_report call returns stats and lineups for a single request"""
+        fetched = []
+        scraper = self._counting_scraper(tmp_path, fetched)
+        url = 'https://fbref.com/en/matches/abc123/Arsenal-Chelsea'
+
+        report = scraper.scrape_match_report(url)
+
+        assert fetched == [url]
+        assert report['match_metadata']['home_score'] == 2
+        assert report['team_stats']['home']['possession'] == 61.0
+        assert report['player_stats']['data']['goals'] == [1]
+        assert report['home_team'] == 'Arsenal'
+        assert report['away_lineup'][0]['player_name'] == 'Cole Palmer'
+        assert report['home_lineup'][0]['position_category'] == 'FWD'
+
+    def test_partial_scrapes_do_not_depend_on_call_order(self, tmp_path):
+        """Test stats and lineups scrapes each fetch and share no state"""
+        fetched = []
+        scraper = self._counting_scraper(tmp_path, fetched)
+        url = 'https://fbref.com/en/matches/abc123/Arsenal-Chelsea'
+
+        lineups = scraper.scrape_match_lineups(url)
+        stats = scraper.scrape_match_stats(url)
+        scraper.scrape_match_stats(url)
+
+        assert fetched == [url] * 3
+        assert set(stats) == {'match_url', 'scraped_at', 'match_metadata', 'team_stats', 'player_stats'}
+        assert lineups['away_lineup'][0]['player_name'] == 'Cole Palmer'
+
+    def test_parser_backends_agree(self, tmp_path):
+        """Test the bs4 and lxml backends build identical reports"""
+        reports = []
+        for backend in ('bs4', 'lxml'):
+            scraper = FBrefScraper(cache=ResponseCache(str(tmp_path), mode='off'), parser_backend=backend)
+            report = scraper.parse_match_report(MATCH_REPORT_HTML.encode('utf-8'), 'report')
+            report.pop('scraped_at')
+            reports.append(report)
+
+        assert reports[0] == reports[1]
+        assert reports[1]['player_stats']['data']['player_name'] == ['Bukayo Saka']
+
+    def test_empty_stats_table(self, tmp_path):
+        """Test a stats table with headers but no rows (unplayed match) parses to no players"""
+        html = MATCH_REPORT_HTML.replace(
+            '<tr><th data-stat="player">Bukayo Saka</th><td data-stat="goals">1</td></tr>', ''
+        ).replace(
+            '<table id="stats_home_summary"><tbody>',
+            '<table id="stats_home_summary"><thead><tr><th data-stat="player">Player</th>'
+            '<th data-stat="goals">Gls</th></tr></thead><tbody>'
+        )
+        scraper = FBrefScraper(cache=ResponseCache(str(tmp_path), mode='off'))
+        report = scraper.parse_match_report(html.encode('utf-8'), 'report')
+
+        assert report['home_lineup'][0]['player_name'] == 'Bukayo Saka'
+        assert report['player_stats']['data']['player_name'] == []
+
+        frame = typed_frame([], columns=['player', 'goals', 'xg'])
+        assert len(frame) == 0
+        assert [str(t) for t in frame.dtypes] == ['object', 'Int64', 'float64']
+
+    def test_table_index_finds_commented_tables_lazily(self):
+        """Test tables inside HTML comments are indexed and parsed on demand"""
+        html = MATCH_REPORT_HTML + """
+        <div class="placeholder"></div>
+        <!--
+        <table id="matchlogs_passing"><thead><tr>
+          <th data-stat="date">Date</th><th data-stat="opponent">Opponent</th><th data-stat="passes_completed">Cmp</th>
+        </tr></thead><tbody>
+          <tr><th data-stat="date"><a href="/en/matches/abc123/Arsenal-Chelsea">2025-08-17</a></th>
+              <td data-stat="opponent">Chelsea</td><td data-stat="passes_completed">512</td></tr>
+        </tbody></table>
+        -->
+        """
+        doc = parse_document(html, 'lxml')
+
+        assert 'matchlogs_passing' in doc.tables
+        assert doc.tables.materialized == 0
+
+        table = doc.tables.get('matchlogs_passing')
+        assert doc.tables.materialized == 1
+        assert table.columns == ['date', 'opponent', 'passes_completed']
+        assert table.rows[0]['passes_completed'] == '512'
+        assert table.links[0]['date'] == '/en/matches/abc123/Arsenal-Chelsea'
+
+
+def match_log_page(log_type, stat, values):
+    """Minimal FBref match-log page with the table inside a comment"""
+    rows = ''.join(
+        f'<tr><th data-stat="date"><a href="/en/matches/m{i}">2025-08-{17 + i}</a></th>'
+        f'<td data-stat="opponent">Team {i}</td><td data-stat="{stat}">{value}</td></tr>'
+        for i, value in enumerate(values)
+    )
+    return (
+        f'<!--<table id="matchlogs_for"><thead><tr><th data-stat="date">Date</th>'
+        f'<th data-stat="opponent">Opponent</th><th data-stat="{stat}">X</th></tr></thead>'
+        f'<tbody>{rows}</tbody></table>-->'
+    )
+
+
+class TestFBrefMatchLogsBatch:
+    """Test the multi-log-type match-log scraper"""
+
+    def test_wide_frame_joins_log_types(self, tmp_path):
+        """Test each log type becomes prefixed typed columns on one row per match"""
+        pages = {
+            'passing': match_log_page('passing', 'passes_completed', ['512', '430']),
+            'shooting': match_log_page('shooting', 'xg', ['1.8', '0.6']),
+        }
+        scraper = FBrefScraper(cache=ResponseCache(str(tmp_path), mode='off'))
+
+        def fake_request(url):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = next(page for t, page in pages.items() if f'/{t}/' in url).encode('utf-8')
+            return response
+
+        scraper._make_request = fake_request
+        wide = scraper.scrape_match_logs_batch('2025-2026', ['passing', 'shooting'])
+
+        assert len(wide) == 2
+        assert wide['match_url'].tolist() == ['https://fbref.com/en/matches/m0', 'https://fbref.com/en/matches/m1']
+        assert wide['passing_passes_completed'].tolist() == [512, 430]
+        assert wide['shooting_xg'].tolist() == [1.8, 0.6]
+        assert wide['opponent'].tolist() == ['Team 0', 'Team 1']
+
+
+class TestFBrefSchema:
+    """Test typed columnar extraction of FBref tables"""
+
+    def test_typed_columns_round_trip(self):
+        """Test registered and inferred columns are cast and survive JSON"""
+        rows = [
+            {'player': 'Bukayo Saka', 'minutes': '1,080', 'xg': '0.4', 'passes_pct': '85.7%', 'new_stat': '3'},
+            {'player': 'Declan Rice', 'minutes': '', 'xg': '0.1', 'passes_pct': '91.0%', 'new_stat': '5'},
+        ]
+        frame = typed_frame(rows)
+
+        assert str(frame['minutes'].dtype) == 'Int64'
+        assert frame['minutes'].tolist()[0] == 1080
+        assert frame['passes_pct'].tolist() == [85.7, 91.0]
+        assert str(frame['new_stat'].dtype) == 'Int64'
+
+        payload = frame_to_columnar(frame)
+        assert payload['data']['minutes'] == [1080, None]
+        assert json.loads(json.dumps(payload)) == payload
+
+        restored = columnar_to_frame(payload)
+        assert restored['minutes'].isna().tolist() == [False, True]
+        assert restored['xg'].tolist() == [0.4, 0.1]
+
+    def test_lossy_casts_are_reported(self, caplog):
+        """Test unparseable and decimal values in registered columns are logged, not silently dropped"""
+        rows = [
+            {'player': 'Bukayo Saka', 'minutes': '90', 'touches': '61.5', 'xg': '0.4'},
+            {'player': 'Declan Rice', 'minutes': '', 'touches': '70', 'xg': 'n/a'},
+        ]
+
+        with caplog.at_level(logging.WARNING, logger='fbref_schema'):
+            frame = typed_frame(rows)
+
+        assert str(frame['minutes'].dtype) == 'Int64'
+        assert frame['touches'].tolist() == [61.5, 70.0]
+        assert frame['xg'].isna().tolist() == [False, True]
+        assert "Column 'touches'" in caplog.text
+        assert "Column 'xg': 1 non-empty value(s)" in caplog.text
+        assert "'minutes'" not in caplog.text
+
+
+class FakeFixtureLoader:
+    """In-memory stand-in for the DatabaseLoader fixture cache methods"""
+
+    def __init__(self):
+        self.cached = None
+        self.saves = []
+
+    def get_cached_fixtures(self, season):
+        return self.cached
+
+    def save_fixtures(self, season, fixtures, list_hash, changed=True):
+        self.saves.append(changed)
+        self.cached = {'fixtures': fixtures, 'list_hash': list_hash, 'fetched_at': datetime.utcnow()}
+        return True
+
+
+class FakeFixtureFetcher:
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.calls = 0
+
+    def scrape_season_fixtures(self, season):
+        self.calls += 1
+        return [dict(f) for f in self.fixtures]
+
+
+class TestFixtureCache:
+    """Test the Postgres-backed fixture-list cache"""
+
+    FIXTURES = [{
+        'match_id': '26602',
+        'match_url': 'https://understat.com/match/26602',
+        'home_team': 'Arsenal',
+        'away_team': 'Chelsea',
+        'match_date': '2025-08-17',
+        'kickoff_at': '2025-08-17 16:30:00',
+        'is_result': False
+    }]
+
+    def test_fresh_cache_skips_upstream(self):
+        """Test a fresh cached list is served without fetching"""
+        loader, fetcher = FakeFixtureLoader(), FakeFixtureFetcher(self.FIXTURES)
+        cache = FixtureCache(loader, fetcher)
+
+        cache.get_season_fixtures('2025')
+        cache.get_season_fixtures('2025')
+        cache.get_season_fixtures('2025', force_refresh=True)
+
+        assert fetcher.calls == 2
+        assert loader.saves == [True, False]
+
+    def test_staleness_rules(self):
+        """Test TTL expiry and the near-kickoff window"""
+        kickoff = datetime(2025, 8, 17, 16, 30)
+        fixtures = self.FIXTURES
+        played = [dict(self.FIXTURES[0], is_result=True)]
+
+        # Far from kickoff: only the long TTL applies
+        far = kickoff - timedelta(days=3)
+        assert not is_stale(fixtures, far - timedelta(hours=1), now=far)
+        assert is_stale(fixtures, far - timedelta(hours=13), now=far)
+
+        # Just after kickoff without a result: short matchday TTL
+        live = kickoff + timedelta(hours=1)
+        assert is_stale(fixtures, live - timedelta(minutes=45), now=live)
+        assert not is_stale(played, live - timedelta(minutes=45), now=live)
+
+    def test_list_hash_ignores_order(self):
+        """Test the change check does not depend on fixture order"""
+        other = dict(self.FIXTURES[0], match_url='https://understat.com/match/26603')
+        assert fixture_list_hash([self.FIXTURES[0], other]) == fixture_list_hash([other, self.FIXTURES[0]])
+        assert fixture_list_hash([other]) != fixture_list_hash([dict(other, is_result=True)])
+
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection for the pool"""
+
+    class _Info:
+        transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    class _Cursor:
+        rowcount = 0
+
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, query, params=None):
+            if self.conn.dead:
+                raise psycopg2.OperationalError('server closed the connection unexpectedly')
+            self.conn.executed.append(query)
+
+        def fetchone(self):
+            return (1,)
+
+        def fetchall(self):
+            return self.conn.rows
+
+        def copy_expert(self, sql, buffer):
+            self.conn.copied.append(buffer.read())
+
+    def __init__(self, dsn):
+        self.closed = 0
+        self.dead = False
+        self.info = self._Info()
+        self.executed = []
+        self.commits = 0
+        self.copied = []
+        self.rows = []
+
+    def cursor(self):
+        return self._Cursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class TestConnectionPool:
+    """Test the pooled connections behind DatabaseLoader"""
+
+    def test_reuses_connections(self):
+        """Test sequential units of work share one connection"""
+        pool = ConnectionPool('postgresql://test', max_connections=2, connect=FakeConnection)
+
+        seen = set()
+        for _ in range(3):
+            with pool.connection() as conn:
+                seen.add(id(conn))
+
+        assert len(seen) == 1
+        assert pool.stats['connects'] == 1 and pool.stats['checkouts'] == 3
+
+    def test_replaces_dead_and_broken_connections(self):
+        """Test idle connections are pinged and broken ones discarded"""
+        pool = ConnectionPool('postgresql://test', max_connections=1, health_check_seconds=0,
+                              connect=FakeConnection)
+
+        with pool.connection() as first:
+            pass
+        first.dead = True
+
+        with pool.connection() as second:
+            assert second is not first
+        assert first.closed
+
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.connection() as conn:
+                raise psycopg2.OperationalError('lost')
+        assert conn.closed
+        assert pool.stats['discarded'] == 2
+
+    def test_times_out_when_exhausted(self):
+        """Test checkout blocks up to the timeout, and a closed pool refuses"""
+        pool = ConnectionPool('postgresql://test', max_connections=1, timeout=0.05, connect=FakeConnection)
+
+        with pool.connection():
+            with pytest.raises(PoolError):
+                with pool.connection():
+                    pass
+
+        pool.close()
+        with pytest.raises(PoolError):
+            with pool.connection():
+                pass
+
+
+class TestBronzeWrites:
+    """Test the one-transaction and bulk bronze write paths"""
+
+    def test_single_statement_and_commit(self, monkeypatch):
+        """Test ledger row and payload go out as one statement in one commit"""
+        pool = ConnectionPool('postgresql://test', max_connections=1, connect=FakeConnection)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: pool)
+
+        loader = DatabaseLoader('postgresql://test')
+        assert loader.record_match_scrape('run-1', 'm1', 'understat', {'shots': []}, 'https://understat.com/match/1', 0)
+
+        with pool.connection() as conn:
+            assert len(conn.executed) == 1 and conn.commits == 1
+            assert 'bronze.scrape_runs' in conn.executed[0] and 'bronze.understat_raw' in conn.executed[0]
+
+    def test_bulk_copy_stages_and_merges(self, monkeypatch):
+        """Test COPY mode escapes payloads, keeps the last duplicate and merges once"""
+        pool = ConnectionPool('postgresql://test', max_connections=1, connect=FakeConnection)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: pool)
+
+        payloads = [
+            {'match_id': 'm1', 'match_url': 'u1', 'payload': {'note': 'first'}},
+            {'match_id': 'm1', 'match_url': 'u1', 'payload': {'note': 'tab\there'}},
+            {'match_id': 'm2', 'match_url': 'u2', 'payload': {'note': 'x'}},
+        ]
+        assert DatabaseLoader('postgresql://test').bulk_save_understat_raw(payloads, method='copy')
+
+        with pool.connection() as conn:
+            lines = conn.copied[0].splitlines()
+            assert len(lines) == 2
+            assert lines[0].split('\t')[:2] == ['m1', 'u1']
+            assert '"tab\\\\there"' in lines[0] and lines[0].split('\t')[4] == '\\N'
+            assert lines[0].split('\t')[3] == content_hash({'note': 'tab\there'})
+            assert 'CREATE TEMP TABLE bulk_stage' in conn.executed[0]
+            assert 'ON CONFLICT (match_id)' in conn.executed[1]
+            assert 'content_hash IS DISTINCT FROM EXCLUDED.content_hash' in conn.executed[1]
+
+    def test_lineups_keep_one_version_per_match(self, monkeypatch):
+        """Test re-scraped lineups replace the match's row after archiving the old one"""
+        pool = ConnectionPool('postgresql://test', max_connections=1, connect=FakeConnection)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: pool)
+
+        payloads = [
+            {'match_id': 'm1', 'match_url': 'u1', 'payload': {'home_lineup': []},
+             'scraped_at': datetime(2025, 8, 17, 18, 0)},
+            {'match_id': 'm1', 'match_url': 'u1', 'payload': {'home_lineup': [{'player_name': 'Saka'}]},
+             'scraped_at': datetime(2025, 8, 18, 9, 0)},
+        ]
+        assert DatabaseLoader('postgresql://test').bulk_save_fbref_lineups(payloads, method='copy')
+
+        with pool.connection() as conn:
+            assert len(conn.copied[0].splitlines()) == 1
+            assert 'INSERT INTO bronze.fbref_lineups_history' in conn.executed[1]
+            assert 'content_hash IS DISTINCT FROM incoming.content_hash' in conn.executed[1]
+            assert 'ON CONFLICT (match_url)' in conn.executed[2]
+
+    def test_content_hash_ignores_key_order_and_scrape_time(self):
+        """Test a byte-identical re-scrape hashes the same and a real change does not"""
+        first = {'match_id': '1', 'shots': [{'xg': 0.1}], 'scraped_at': '2025-01-01T10:00:00'}
+        again = {'scraped_at': '2025-02-01T10:00:00', 'shots': [{'xg': 0.1}], 'match_id': '1'}
+
+        assert content_hash(first) == content_hash(again)
+        assert content_hash(first) != content_hash({**first, 'shots': [{'xg': 0.2}]})
+
+    def test_diff_fixtures_is_one_array_lookup(self, monkeypatch):
+        """Test candidate fixtures go out in one query and come back in order"""
+        pool = ConnectionPool('postgresql://test', max_connections=1, connect=FakeConnection)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: pool)
+        with pool.connection() as conn:
+            conn.rows = [('u3',), ('u1',)]
+
+        fixtures = [
+            {'match_url': f'u{i}', 'match_date': '2025-08-17', 'kickoff_at': '2025-08-17 16:30:00'}
+            for i in (1, 2, 3)
+        ]
+        missing = DatabaseLoader('postgresql://test').diff_fixtures(fixtures)
+
+        assert [f['match_url'] for f in missing] == ['u1', 'u3']
+        with pool.connection() as conn:
+            assert len(conn.executed) == 1 and 'unnest' in conn.executed[0]
+
+    def test_unknown_scrape_type(self):
+        """Test only types with a bronze payload table are accepted"""
+        with pytest.raises(ValueError):
+            DatabaseLoader('postgresql://test').record_match_scrape('run-1', 'm1', 'fixture', {}, 'url')
+
+
+class FakeWriteLoader:
+    """Records the batches a WriteBehindLoader hands to DatabaseLoader"""
+
+    def __init__(self, ok=True, gate=None):
+        self.ok = ok
+        self.gate = gate
+        self.batches = []
+
+    def record_match_scrapes(self, scrapes):
+        if self.gate:
+            self.gate.wait(5)
+        self.batches.append(('match_scrape', [s['match_id'] for s in scrapes]))
+        return self.ok
+
+    def bulk_save(self, table_key, payloads):
+        self.batches.append((table_key, [p['match_id'] for p in payloads]))
+        return self.ok
+
+
+class TestWriteBehindLoader:
+    """Test the background write queue used by the scrape loops"""
+
+    def test_batches_by_target_and_flushes_on_close(self):
+        """Test pending writes are grouped per target and written on close"""
+        loader = FakeWriteLoader()
+        with WriteBehindLoader(loader, batch_size=100, flush_interval=60) as writer:
+            for match_id in ('m1', 'm2', 'm3'):
+                writer.record_match_scrape(f'run-{match_id}', match_id, 'understat', {}, 'url')
+            writer.save_raw('fbref_lineups', 'm1', {}, 'url')
+            assert loader.batches == []
+
+        assert sorted(loader.batches) == [('fbref_lineups', ['m1']), ('match_scrape', ['m1', 'm2', 'm3'])]
+        assert writer.summary()['written'] == 4
+
+        with pytest.raises(ScraperException):
+            writer.save_raw('understat_raw', 'm4', {}, 'url')
+
+    def test_flushes_on_size_and_time(self):
+        """Test a full batch is written at once and a partial one after the interval"""
+        loader = FakeWriteLoader()
+        writer = WriteBehindLoader(loader, batch_size=2, flush_interval=0.05)
+        for match_id in ('m1', 'm2', 'm3'):
+            writer.save_raw('understat_raw', match_id, {}, 'url')
+
+        deadline = time.monotonic() + 2
+        while len(loader.batches) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert loader.batches == [('understat_raw', ['m1', 'm2']), ('understat_raw', ['m3'])]
+        writer.close()
+
+    def test_backpressure_when_database_is_slow(self):
+        """Test submitters wait once the queue is full and nothing is dropped"""
+        gate = threading.Event()
+        loader = FakeWriteLoader(gate=gate)
+        writer = WriteBehindLoader(loader, max_queue=1, batch_size=1)
+
+        threading.Timer(0.1, gate.set).start()
+        for match_id in ('m1', 'm2', 'm3', 'm4'):
+            writer.record_match_scrape(f'run-{match_id}', match_id, 'understat', {}, 'url')
+        writer.close()
+
+        assert writer.summary()['waits'] >= 1
+        assert [ids for _, ids in loader.batches] == [['m1'], ['m2'], ['m3'], ['m4']]
+
+    def test_failed_batches_are_kept(self):
+        """Test writes from a failed batch are reported, not lost silently"""
+        writer = WriteBehindLoader(FakeWriteLoader(ok=False), batch_size=10)
+        writer.save_raw('understat_raw', 'm1', {}, 'url')
+        summary = writer.close()
+
+        assert summary['failed'] == 1 and summary['written'] == 0
+        assert [item['match_id'] for item in writer.failures] == ['m1']
+
+
+def planner_fixture(home, kickoff, is_result=True):
+    return {
+        'match_url': f'https://understat.com/match/{home}', 'home_team': home, 'away_team': 'Arsenal',
+        'match_date': kickoff[:10], 'kickoff_at': kickoff, 'is_result': is_result,
+    }
+
+
+class TestScrapePlanner:
+    """Test the ledger-driven scrape plan"""
+
+    NOW = datetime(2025, 10, 20, 12, 0)
+
+    def test_missing_first_then_refresh_and_settled_skipped(self):
+        """Test priorities and that old, successfully scraped matches are left alone"""
+        old = planner_fixture('Chelsea', '2025-08-17 16:30:00')
+        recent = planner_fixture('Fulham', '2025-10-18 15:00:00')
+        missing = planner_fixture('Leeds', '2025-10-04 15:00:00')
+        unplayed = planner_fixture('Spurs', '2025-10-26 15:00:00', is_result=False)
+        ledger = {
+            fixture_match_id(old): {'last_success': datetime(2025, 8, 17, 20, 0), 'failures': 0},
+            fixture_match_id(recent): {'last_success': datetime(2025, 10, 18, 19, 0), 'failures': 0},
+        }
+
+        plan = plan_scrapes([old, recent, missing, unplayed], ledger, self.NOW)
+
+        assert [(t.fixture['home_team'], t.reason) for t in plan] == [('Leeds', 'missing'), ('Fulham', 'refresh')]
+
+    def test_retry_backoff_and_give_up(self):
+        """Test failed matches wait out a doubling delay and stop after too many failures"""
+        fixture = planner_fixture('Leeds', '2025-10-18 15:00:00')
+        match_id = fixture_match_id(fixture)
+
+        def plan(failures, minutes_ago):
+            ledger = {match_id: {'failures': failures, 'last_failure': self.NOW - timedelta(minutes=minutes_ago)}}
+            return [t.reason for t in plan_scrapes([fixture], ledger, self.NOW)]
+
+        assert plan(2, 30) == []  # 60 minute delay after two failures
+        assert plan(2, 90) == ['retry']
+        assert plan(5, 24 * 60) == []
+
+    def test_payload_scraped_before_kickoff_is_missing(self):
+        """Test a pre-match payload does not count as the result"""
+        fixture = planner_fixture('Leeds', '2025-10-18 15:00:00')
+        ledger = {fixture_match_id(fixture): {'payload_scraped_at': datetime(2025, 10, 18, 9, 0), 'failures': 0}}
+
+        assert [t.reason for t in plan_scrapes([fixture], ledger, self.NOW)] == ['missing']
+
+
+class FailingDiffLoader:
+    """Loader whose existence lookup always fails"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def diff_fixtures(self, fixtures):
+        self.calls += 1
+        raise psycopg2.OperationalError('server closed the connection unexpectedly')
+
+
+class TestHistoricalBackfill:
+    """Test the historical backfill's existing-match check"""
+
+    FIXTURE = {
+        'match_url': 'https://understat.com/match/26602',
+        'home_team': 'Arsenal',
+        'away_team': 'Chelsea',
+        'date': '2025-08-17 16:30:00'
+    }
+
+    def test_failed_lookup_treats_fixtures_as_pending(self):
+        """Test a DB error during the lookup does not fail the backfill"""
+        backfill = HistoricalDataBackfill.__new__(HistoricalDataBackfill)
+        backfill.loader = FailingDiffLoader()
+
+        assert backfill.pending_match_urls([self.FIXTURE]) is None
+
+        result = backfill.backfill_single_match(self.FIXTURE, dry_run=True)
+        assert result['status'] == 'dry_run'
+        assert backfill.loader.calls == 2
+
+
+class TestWriteSpool:
+    """Test the local journal for writes the database could not take"""
+
+    def test_journal_round_trip_and_truncated_tail(self, tmp_path):
+        """Test records survive compression, datetimes come back and a torn record is dropped"""
+        spool = WriteSpool(str(tmp_path))
+        scraped_at = datetime(2025, 10, 18, 19, 0)
+        spool.append('understat_raw', {'match_id': 'm1', 'payload': {'xg': 1.2}, 'scraped_at': scraped_at})
+        spool.append('match_scrape', {'match_id': 'm2', 'payload': {}})
+
+        with open(spool.journal_path, 'ab') as f:
+            f.write(b'\x1f\x8b\x08\x00')  # Crash mid-append
+
+        paths = spool.claim()
+        assert len(paths) == 1 and not os.path.exists(spool.journal_path)
+
+        records = list(WriteSpool.read(paths[0]))
+        assert [target for target, _ in records] == ['understat_raw', 'match_scrape']
+        assert records[0][1]['scraped_at'] == scraped_at
+
+    def test_unreachable_database_spools_then_replays(self, tmp_path, monkeypatch):
+        """Test a save during an outage is spooled and later loaded, keeping its scrape time"""
+        def refuse(dsn):
+            raise psycopg2.OperationalError('could not connect to server')
+
+        down = ConnectionPool('postgresql://test', max_connections=1, connect=refuse)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: down)
+
+        loader = DatabaseLoader('postgresql://test', spool_mode='on_failure')
+        loader.spool = WriteSpool(str(tmp_path))
+        assert loader.save_understat_raw('m1', {'shots': []}, 'https://understat.com/match/1')
+        assert loader.spool.pending() == {'understat_raw': 1}
+        _, spooled = next(WriteSpool.read(loader.spool.journal_path))
+
+        up = ConnectionPool('postgresql://test', max_connections=1, connect=FakeConnection)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: up)
+        summary = loader.replay_spool(method='copy')
+
+        assert summary == {'files': 1, 'records': 1, 'failed': 0}
+        assert loader.spool.pending() == {}
+        with up.connection() as conn:
+            staged = conn.copied[0].split('\t')
+            assert staged[0] == 'm1' and staged[5] == spooled['scraped_at'].isoformat()
+
+    def test_stale_journal_does_not_overwrite_newer_rows(self, tmp_path, monkeypatch):
+        """Test replayed writes only replace (and archive) rows scraped before them"""
+        spool = WriteSpool(str(tmp_path))
+        stale = datetime(2025, 10, 18, 19, 0)
+        spool.append('fbref_lineups', {'match_id': 'm1', 'match_url': 'u1',
+                                       'payload': {'home_lineup': []}, 'scraped_at': stale})
+
+        pool = ConnectionPool('postgresql://test', max_connections=1, connect=FakeConnection)
+        monkeypatch.setattr(db_loader, 'get_pool', lambda dsn: pool)
+        summary = DatabaseLoader('postgresql://test').replay_spool(spool, method='copy')
+
+        assert summary == {'files': 1, 'records': 1, 'failed': 0}
+        with pool.connection() as conn:
+            assert conn.copied[0].split('\t')[5] == stale.isoformat()
+            assert 'AND incoming.scraped_at >= t.scraped_at' in conn.executed[1]
+            assert 'AND EXCLUDED.scraped_at >= bronze.fbref_lineups.scraped_at' in conn.executed[2]